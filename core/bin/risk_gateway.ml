@@ -52,62 +52,79 @@ let handle_health_check () =
   ] in
   ok_json (Yojson.Safe.to_string response)
 
-let handle_check_order body =
-  try
-    let json = Yojson.Safe.from_string body in
-    let symbol = Yojson.Safe.Util.(json |> member "symbol" |> to_string) in
-    let side_str = Yojson.Safe.Util.(json |> member "side" |> to_string) in
-    let quantity = Yojson.Safe.Util.(json |> member "quantity" |> to_float) in
+(** Check a single order request, returning the JSON verdict.
+    Shared by the single and batch endpoints. *)
+let check_order_json json =
+  let symbol = Yojson.Safe.Util.(json |> member "symbol" |> to_string) in
+  let side_str = Yojson.Safe.Util.(json |> member "side" |> to_string) in
+  let quantity = Yojson.Safe.Util.(json |> member "quantity" |> to_float) in
+
+  let side = if side_str = "buy" then Buy else Sell in
+  let order = {
+    id = OrderId.generate ();
+    symbol = Symbol.of_string symbol;
+    side;
+    order_type = Market;
+    quantity = Decimal.of_float quantity;
+    time_in_force = GTC;
+    status = Pending;
+    created_at = Unix.gettimeofday ();
+    updated_at = Unix.gettimeofday ();
+  } in
+
+  let current_pos = match Hashtbl.find_opt positions symbol with
+    | Some p -> p.quantity
+    | None -> Decimal.zero
+  in
 
-    let side = if side_str = "buy" then Buy else Sell in
-    let order = {
-      id = OrderId.generate ();
-      symbol = Symbol.of_string symbol;
-      side;
-      order_type = Market;
-      quantity = Decimal.of_float quantity;
-      time_in_force = GTC;
-      status = Pending;
-      created_at = Unix.gettimeofday ();
-      updated_at = Unix.gettimeofday ();
-    } in
+  let result = Risk.check_order
+    ~order
+    ~account:!account
+    ~positions:!account.positions
+    ~current_position:current_pos
+    !risk_engine
+  in
 
-    let current_pos = match Hashtbl.find_opt positions symbol with
-      | Some p -> p.quantity
-      | None -> Decimal.zero
-    in
+  match result with
+  | Approved ->
+    risk_engine := Risk.update_rate_limit !risk_engine;
+    `Assoc [
+      ("approved", `Bool true);
+      ("order_id", `String order.id);
+    ]
+  | Rejected reason ->
+    `Assoc [
+      ("approved", `Bool false);
+      ("reason", `String reason);
+    ]
+  | RequiresAdjustment { original; adjusted; reason } ->
+    `Assoc [
+      ("approved", `Bool true);
+      ("adjusted", `Bool true);
+      ("original_qty", `Float (Decimal.to_float original));
+      ("adjusted_qty", `Float (Decimal.to_float adjusted));
+      ("reason", `String reason);
+      ("order_id", `String order.id);
+    ]
 
-    let result = Risk.check_order
-      ~order
-      ~account:!account
-      ~positions:!account.positions
-      ~current_position:current_pos
-      !risk_engine
-    in
+let handle_check_order body =
+  try
+    let json = Yojson.Safe.from_string body in
+    ok_json (Yojson.Safe.to_string (check_order_json json))
+  with e ->
+    bad_request_json (Printf.sprintf {|{"error": "%s"}|} (Printexc.to_string e))
 
-    let response = match result with
-      | Approved ->
-        risk_engine := Risk.update_rate_limit !risk_engine;
-        `Assoc [
-          ("approved", `Bool true);
-          ("order_id", `String order.id);
-        ]
-      | Rejected reason ->
-        `Assoc [
-          ("approved", `Bool false);
-          ("reason", `String reason);
-        ]
-      | RequiresAdjustment { original; adjusted; reason } ->
-        `Assoc [
-          ("approved", `Bool true);
-          ("adjusted", `Bool true);
-          ("original_qty", `Float (Decimal.to_float original));
-          ("adjusted_qty", `Float (Decimal.to_float adjusted));
-          ("reason", `String reason);
-          ("order_id", `String order.id);
-        ]
-    in
-    ok_json (Yojson.Safe.to_string response)
+(** Check several orders in one request: {"orders": [...]} -> {"results": [...]}.
+    A malformed order yields an "error" entry without failing the others. *)
+let handle_check_orders_batch body =
+  try
+    let json = Yojson.Safe.from_string body in
+    let orders = Yojson.Safe.Util.(json |> member "orders" |> to_list) in
+    let results = List.map (fun order ->
+      try check_order_json order
+      with e -> `Assoc [("error", `String (Printexc.to_string e))]
+    ) orders in
+    ok_json (Yojson.Safe.to_string (`Assoc [("results", `List results)]))
   with e ->
     bad_request_json (Printf.sprintf {|{"error": "%s"}|} (Printexc.to_string e))
 
@@ -200,6 +217,7 @@ let router req body =
   match (meth, path) with
   | `GET, "/health" -> handle_health_check ()
   | `POST, "/check-order" -> handle_check_order body
+  | `POST, "/check-orders-batch" -> handle_check_orders_batch body
   | `POST, "/update-account" -> handle_update_account body
   | `POST, "/update-position" -> handle_update_position body
   | `POST, "/circuit-breaker" -> handle_circuit_breaker body
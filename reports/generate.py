@@ -5,18 +5,26 @@ Generates performance charts and updates the README with latest metrics.
 Designed to run daily via GitHub Actions.
 """
 
+import hashlib
 import os
+import re
 import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Optional
 
-import matplotlib.pyplot as plt
+import matplotlib
 import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
 import numpy as np
 import pandas as pd
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template, TemplateError
+from numba import njit
 
 
 # Configuration
@@ -24,37 +32,136 @@ DB_PATH = os.environ.get("DATABASE_URL", "sqlite:///data/trades.db").replace("sq
 OUTPUT_DIR = Path(__file__).parent / "assets"
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 README_PATH = Path(__file__).parent.parent / "README.md"
+CHART_CACHE_FILE = ".cache_key"
+
+# README section rewritten on every run
+METRICS_START_MARKER = "<!-- METRICS_START -->"
+METRICS_END_MARKER = "<!-- METRICS_END -->"
+METRICS_BLOCK_PATTERN = re.compile(
+    re.escape(METRICS_START_MARKER) + r".*?" + re.escape(METRICS_END_MARKER), re.DOTALL
+)
+
+# Trade columns loaded for reporting, with the dtype of the numeric ones
+TRADE_COLUMNS = ("id", "order_id", "symbol", "side", "price", "quantity", "fee", "pnl", "timestamp")
+TRADE_COLUMN_DTYPES = {
+    "price": np.float64,
+    "quantity": np.float64,
+    "fee": np.float64,
+    "pnl": np.float64,
+}
+LOAD_CHUNK_SIZE = 50_000
+
+# Per-connection read tuning. The database's WAL mode and its
+# idx_trades_timestamp index (which serves ORDER BY timestamp) are set up by
+# the strategy's schema; the report only ever reads.
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+)
 
 
 def load_trades(db_path: str) -> pd.DataFrame:
-    """Load trades from SQLite database."""
+    """Load trades from SQLite database.
+
+    Rows are streamed in chunks into preallocated, typed column arrays so the
+    full result set is never held twice in memory.
+    """
     if not Path(db_path).exists():
         print(f"Database not found: {db_path}")
         return pd.DataFrame()
 
-    conn = sqlite3.connect(db_path)
-    query = """
-        SELECT
-            id, order_id, symbol, side, price, quantity,
-            fee, pnl, timestamp
-        FROM trades
-        ORDER BY timestamp ASC
-    """
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        # mmap serves the scan from the page cache
+        for pragma in SQLITE_READ_PRAGMAS:
+            conn.execute(pragma)
+
+        count = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+        columns = {
+            name: np.empty(count, dtype=TRADE_COLUMN_DTYPES.get(name, object))
+            for name in TRADE_COLUMNS
+        }
+
+        query = """
+            SELECT
+                id, order_id, symbol, side,
+                CAST(price AS REAL), CAST(quantity AS REAL),
+                CAST(fee AS REAL), COALESCE(CAST(pnl AS REAL), 0.0), timestamp
+            FROM trades
+            ORDER BY timestamp ASC
+        """
+        cursor = conn.execute(query)
+        offset = 0
+        while offset < count:
+            rows = cursor.fetchmany(LOAD_CHUNK_SIZE)
+            if not rows:
+                break
+            end = offset + len(rows)
+            for name, values in zip(TRADE_COLUMNS, zip(*rows)):
+                columns[name][offset:end] = values
+            offset = end
+    finally:
+        conn.close()
+
+    df = pd.DataFrame({name: values[:offset] for name, values in columns.items()})
 
     if not df.empty:
         df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df["price"] = pd.to_numeric(df["price"])
-        df["quantity"] = pd.to_numeric(df["quantity"])
-        df["fee"] = pd.to_numeric(df["fee"])
-        df["pnl"] = pd.to_numeric(df["pnl"].fillna(0))
 
     return df
 
 
+@njit(cache=True)
+def _equity_drawdown_kernel(pnl: np.ndarray, initial_balance: float) -> tuple:
+    """Single pass over P&L producing cumulative P&L, equity, peak and drawdown."""
+    n = pnl.shape[0]
+    cumulative_pnl = np.empty(n)
+    equity = np.empty(n)
+    peak = np.empty(n)
+    drawdown = np.empty(n)
+    drawdown_pct = np.empty(n)
+
+    running_pnl = 0.0
+    running_peak = -np.inf
+    for i in range(n):
+        running_pnl += pnl[i]
+        value = initial_balance + running_pnl
+        if value > running_peak:
+            running_peak = value
+
+        cumulative_pnl[i] = running_pnl
+        equity[i] = value
+        peak[i] = running_peak
+        drawdown[i] = value - running_peak
+        drawdown_pct[i] = drawdown[i] * 100 / running_peak if running_peak > 0 else 0.0
+
+    return cumulative_pnl, equity, peak, drawdown, drawdown_pct
+
+
+def enrich_trades(trades: pd.DataFrame, initial_balance: float = 10000.0) -> pd.DataFrame:
+    """Add equity and drawdown columns used by the metrics and chart functions.
+
+    Computed once so the downstream functions only read the prepared columns.
+    """
+    if trades.empty:
+        return trades
+
+    cumulative_pnl, equity, peak, drawdown, drawdown_pct = _equity_drawdown_kernel(
+        trades["pnl"].to_numpy(dtype=np.float64), float(initial_balance)
+    )
+
+    trades["cumulative_pnl"] = cumulative_pnl
+    trades["equity"] = equity
+    trades["peak"] = peak
+    trades["drawdown"] = drawdown
+    trades["drawdown_pct"] = drawdown_pct
+
+    return trades
+
+
 def calculate_metrics(trades: pd.DataFrame, initial_balance: float = 10000.0) -> dict[str, Any]:
-    """Calculate performance metrics from trades."""
+    """Calculate performance metrics from trades prepared by `enrich_trades`."""
     if trades.empty:
         return {
             "total_trades": 0,
@@ -80,44 +187,41 @@ def calculate_metrics(trades: pd.DataFrame, initial_balance: float = 10000.0) ->
         }
 
     total_trades = len(trades)
-    winning = trades[trades["pnl"] > 0]
-    losing = trades[trades["pnl"] < 0]
+    pnl = trades["pnl"].to_numpy(dtype=np.float64)
+    winning = pnl[pnl > 0]
+    losing = pnl[pnl < 0]
 
-    total_pnl = trades["pnl"].sum()
+    total_pnl = pnl.sum()
     total_fees = trades["fee"].sum()
 
-    # Equity curve
-    trades["cumulative_pnl"] = trades["pnl"].cumsum()
-    trades["equity"] = initial_balance + trades["cumulative_pnl"]
-
-    # Drawdown calculation
-    trades["peak"] = trades["equity"].cummax()
-    trades["drawdown"] = trades["equity"] - trades["peak"]
-    trades["drawdown_pct"] = trades["drawdown"] / trades["peak"] * 100
-
     max_drawdown = trades["drawdown"].min()
     max_drawdown_pct = trades["drawdown_pct"].min()
 
-    # Sharpe ratio (daily returns)
-    daily_pnl = trades.groupby(trades["timestamp"].dt.date)["pnl"].sum()
+    # Sharpe ratio (daily returns), bucketed by integer day number
+    days = trades["timestamp"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    day_idx = days - days.min()
+    trades_per_bucket = np.bincount(day_idx)
+    daily_pnl = np.bincount(day_idx, weights=pnl)
+    daily_pnl = daily_pnl[trades_per_bucket > 0]
     if len(daily_pnl) > 1:
-        sharpe = (daily_pnl.mean() / daily_pnl.std()) * np.sqrt(252) if daily_pnl.std() > 0 else 0
+        daily_std = daily_pnl.std(ddof=1)
+        sharpe = (daily_pnl.mean() / daily_std) * np.sqrt(252) if daily_std > 0 else 0
     else:
         sharpe = 0
 
     # Profit factor
-    gross_profit = winning["pnl"].sum() if not winning.empty else 0
-    gross_loss = abs(losing["pnl"].sum()) if not losing.empty else 0
+    gross_profit = winning.sum() if winning.size else 0
+    gross_loss = abs(losing.sum()) if losing.size else 0
     profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
 
     # Trading days
-    trading_days = trades["timestamp"].dt.date.nunique()
+    trading_days = len(daily_pnl)
 
     return {
         "total_trades": total_trades,
-        "winning_trades": len(winning),
-        "losing_trades": len(losing),
-        "win_rate": len(winning) / total_trades * 100 if total_trades > 0 else 0,
+        "winning_trades": winning.size,
+        "losing_trades": losing.size,
+        "win_rate": winning.size / total_trades * 100 if total_trades > 0 else 0,
         "total_pnl": total_pnl,
         "total_pnl_pct": total_pnl / initial_balance * 100,
         "total_fees": total_fees,
@@ -125,11 +229,11 @@ def calculate_metrics(trades: pd.DataFrame, initial_balance: float = 10000.0) ->
         "max_drawdown": max_drawdown,
         "max_drawdown_pct": max_drawdown_pct,
         "profit_factor": profit_factor,
-        "avg_win": winning["pnl"].mean() if not winning.empty else 0,
-        "avg_loss": losing["pnl"].mean() if not losing.empty else 0,
-        "largest_win": winning["pnl"].max() if not winning.empty else 0,
-        "largest_loss": losing["pnl"].min() if not losing.empty else 0,
-        "avg_trade_pnl": trades["pnl"].mean(),
+        "avg_win": winning.mean() if winning.size else 0,
+        "avg_loss": losing.mean() if losing.size else 0,
+        "largest_win": winning.max() if winning.size else 0,
+        "largest_loss": losing.min() if losing.size else 0,
+        "avg_trade_pnl": pnl.mean(),
         "trading_days": trading_days,
         "trades_per_day": total_trades / trading_days if trading_days > 0 else 0,
         "equity_curve": trades[["timestamp", "equity"]].to_dict("records"),
@@ -137,15 +241,25 @@ def calculate_metrics(trades: pd.DataFrame, initial_balance: float = 10000.0) ->
     }
 
 
+def _new_figure(figsize: tuple[float, float]) -> tuple[Figure, Any]:
+    """Create a standalone Agg-backed figure, bypassing pyplot's global state."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
+def _save_figure(fig: Figure, output_path: Path) -> None:
+    """Lay out and write a chart to disk."""
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches="tight", facecolor="white")
+
+
 def generate_equity_curve(trades: pd.DataFrame, output_path: Path, initial_balance: float = 10000.0) -> None:
     """Generate equity curve chart."""
     if trades.empty:
         return
 
-    trades["cumulative_pnl"] = trades["pnl"].cumsum()
-    trades["equity"] = initial_balance + trades["cumulative_pnl"]
-
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure(figsize=(12, 6))
 
     ax.plot(trades["timestamp"], trades["equity"], color="#2ecc71", linewidth=2)
     ax.axhline(y=initial_balance, color="#7f8c8d", linestyle="--", alpha=0.7, label="Initial Balance")
@@ -176,26 +290,19 @@ def generate_equity_curve(trades: pd.DataFrame, output_path: Path, initial_balan
 
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
     ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-    plt.xticks(rotation=45)
+    ax.tick_params(axis="x", labelrotation=45)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight", facecolor="white")
-    plt.close()
+    _save_figure(fig, output_path)
 
     print(f"Generated: {output_path}")
 
 
-def generate_drawdown_chart(trades: pd.DataFrame, output_path: Path, initial_balance: float = 10000.0) -> None:
+def generate_drawdown_chart(trades: pd.DataFrame, output_path: Path) -> None:
     """Generate drawdown chart."""
     if trades.empty:
         return
 
-    trades["cumulative_pnl"] = trades["pnl"].cumsum()
-    trades["equity"] = initial_balance + trades["cumulative_pnl"]
-    trades["peak"] = trades["equity"].cummax()
-    trades["drawdown_pct"] = (trades["equity"] - trades["peak"]) / trades["peak"] * 100
-
-    fig, ax = plt.subplots(figsize=(12, 4))
+    fig, ax = _new_figure(figsize=(12, 4))
 
     ax.fill_between(
         trades["timestamp"],
@@ -212,11 +319,9 @@ def generate_drawdown_chart(trades: pd.DataFrame, output_path: Path, initial_bal
 
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
     ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-    plt.xticks(rotation=45)
+    ax.tick_params(axis="x", labelrotation=45)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight", facecolor="white")
-    plt.close()
+    _save_figure(fig, output_path)
 
     print(f"Generated: {output_path}")
 
@@ -228,7 +333,7 @@ def generate_pnl_distribution(trades: pd.DataFrame, output_path: Path) -> None:
 
     pnl_values = trades["pnl"].dropna()
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure(figsize=(10, 6))
 
     # Color bins by positive/negative
     n, bins, patches = ax.hist(pnl_values, bins=50, edgecolor="black", alpha=0.7)
@@ -248,9 +353,7 @@ def generate_pnl_distribution(trades: pd.DataFrame, output_path: Path) -> None:
     ax.legend(loc="upper right")
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight", facecolor="white")
-    plt.close()
+    _save_figure(fig, output_path)
 
     print(f"Generated: {output_path}")
 
@@ -260,26 +363,22 @@ def generate_hourly_heatmap(trades: pd.DataFrame, output_path: Path) -> None:
     if trades.empty:
         return
 
-    trades["hour"] = trades["timestamp"].dt.hour
-    trades["dayofweek"] = trades["timestamp"].dt.dayofweek
-
-    pivot = trades.pivot_table(
-        values="pnl",
-        index="hour",
-        columns="dayofweek",
-        aggfunc="sum",
-        fill_value=0,
-    )
-
-    # Ensure all hours and days are present
-    all_hours = range(24)
-    all_days = range(7)
-    pivot = pivot.reindex(index=all_hours, columns=all_days, fill_value=0)
+    # Sum P&L into a fixed 24x7 (hour x day of week) grid
+    hour = trades["timestamp"].dt.hour.to_numpy()
+    dayofweek = trades["timestamp"].dt.dayofweek.to_numpy()
+    grid = np.bincount(
+        hour * 7 + dayofweek,
+        weights=trades["pnl"].to_numpy(dtype=np.float64),
+        minlength=24 * 7,
+    ).reshape(24, 7)
 
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig, ax = _new_figure(figsize=(10, 8))
 
-    cmap = plt.cm.RdYlGn
-    im = ax.imshow(pivot.values, cmap=cmap, aspect="auto")
+    # Map the grid to RGBA once and draw it directly, skipping imshow's colormapping
+    cmap = matplotlib.colormaps["RdYlGn"]
+    norm = Normalize(vmin=grid.min(), vmax=grid.max())
+    rgba = (cmap(norm(grid)) * 255).astype(np.uint8)
+    ax.imshow(rgba, aspect="auto")
 
     ax.set_xticks(range(7))
     ax.set_xticklabels(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"])
@@ -290,29 +389,55 @@ def generate_hourly_heatmap(trades: pd.DataFrame, output_path: Path) -> None:
     ax.set_ylabel("Hour (UTC)", fontsize=12)
     ax.set_title("P&L Heatmap by Time", fontsize=14, fontweight="bold")
 
-    cbar = plt.colorbar(im, ax=ax)
+    cbar = fig.colorbar(ScalarMappable(norm=norm, cmap=cmap), ax=ax)
     cbar.set_label("P&L ($)", fontsize=12)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight", facecolor="white")
-    plt.close()
+    _save_figure(fig, output_path)
 
     print(f"Generated: {output_path}")
 
 
-def update_readme(metrics: dict[str, Any], readme_path: Path) -> None:
-    """Update README with latest metrics."""
-    # Load template
-    env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
+def chart_cache_key(trades: pd.DataFrame) -> str:
+    """Fingerprint of the inputs the charts are rendered from.
+
+    Combines the trade count, the largest trade id and the latest timestamp
+    with the contents of this script and the metrics template, so a code or
+    template change also invalidates the cached charts.
+    """
+    hasher = hashlib.sha1()
+    hasher.update(f"{len(trades)}-{trades['id'].max()}-{trades['timestamp'].max()}".encode())
+    hasher.update(Path(__file__).read_bytes())
+    hasher.update((TEMPLATE_DIR / "metrics_section.md.j2").read_bytes())
+    return hasher.hexdigest()
+
 
+def _load_metrics_template() -> Optional[Template]:
+    """Compile the README metrics template, or None if it cannot be loaded."""
+    env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)), auto_reload=False)
     try:
-        template = env.get_template("metrics_section.md.j2")
-        metrics_section = template.render(
-            metrics=metrics,
-            updated_at=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
-        )
-    except Exception as e:
+        return env.get_template("metrics_section.md.j2")
+    except TemplateError as e:
         print(f"Template error: {e}")
+        return None
+
+
+# Compiled once at import; update_readme falls back to a plain table without it
+METRICS_TEMPLATE = _load_metrics_template()
+
+
+def update_readme(metrics: dict[str, Any], readme_path: Path) -> None:
+    """Update README with latest metrics."""
+    metrics_section = None
+    if METRICS_TEMPLATE is not None:
+        try:
+            metrics_section = METRICS_TEMPLATE.render(
+                metrics=metrics,
+                updated_at=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+            )
+        except Exception as e:
+            print(f"Template error: {e}")
+
+    if metrics_section is None:
         # Fallback to simple format
         metrics_section = f"""
 ## Live Performance
@@ -346,16 +471,13 @@ def update_readme(metrics: dict[str, Any], readme_path: Path) -> None:
         readme_content = readme_path.read_text()
 
         # Replace between markers
-        start_marker = "<!-- METRICS_START -->"
-        end_marker = "<!-- METRICS_END -->"
-
-        if start_marker in readme_content and end_marker in readme_content:
-            before = readme_content.split(start_marker)[0]
-            after = readme_content.split(end_marker)[1]
-            readme_content = f"{before}{start_marker}\n{metrics_section}\n{end_marker}{after}"
-        else:
+        block = f"{METRICS_START_MARKER}\n{metrics_section}\n{METRICS_END_MARKER}"
+        readme_content, replaced = METRICS_BLOCK_PATTERN.subn(
+            lambda _: block, readme_content, count=1
+        )
+        if not replaced:
             # Append if markers don't exist
-            readme_content += f"\n{start_marker}\n{metrics_section}\n{end_marker}\n"
+            readme_content += f"\n{block}\n"
 
         readme_path.write_text(readme_content)
         print(f"Updated: {readme_path}")
@@ -371,7 +493,7 @@ def main() -> int:
 
     # Load trades
     print(f"Loading trades from: {DB_PATH}")
-    trades = load_trades(DB_PATH)
+    trades = enrich_trades(load_trades(DB_PATH))
 
     if trades.empty:
         print("No trades found. Generating placeholder report.")
@@ -381,12 +503,26 @@ def main() -> int:
     print(f"Total trades: {metrics['total_trades']}")
     print(f"Total P&L: ${metrics['total_pnl']:.2f}")
 
-    # Generate charts
+    # Generate charts (independent and CPU-bound, so render them in parallel)
     if not trades.empty:
-        generate_equity_curve(trades, OUTPUT_DIR / "equity_curve.png")
-        generate_drawdown_chart(trades, OUTPUT_DIR / "drawdown.png")
-        generate_pnl_distribution(trades, OUTPUT_DIR / "pnl_distribution.png")
-        generate_hourly_heatmap(trades, OUTPUT_DIR / "hourly_heatmap.png")
+        chart_jobs = [
+            (generate_equity_curve, OUTPUT_DIR / "equity_curve.png"),
+            (generate_drawdown_chart, OUTPUT_DIR / "drawdown.png"),
+            (generate_pnl_distribution, OUTPUT_DIR / "pnl_distribution.png"),
+            (generate_hourly_heatmap, OUTPUT_DIR / "hourly_heatmap.png"),
+        ]
+        cache_key = chart_cache_key(trades)
+        cache_path = OUTPUT_DIR / CHART_CACHE_FILE
+        charts_exist = all(path.exists() for _, path in chart_jobs)
+
+        if charts_exist and cache_path.exists() and cache_path.read_text().strip() == cache_key:
+            print("Trades unchanged since last run, reusing existing charts.")
+        else:
+            with ProcessPoolExecutor(max_workers=len(chart_jobs)) as pool:
+                futures = [pool.submit(func, trades, path) for func, path in chart_jobs]
+                for future in futures:
+                    future.result()
+            cache_path.write_text(cache_key)
 
     # Update README
     update_readme(metrics, README_PATH)
@@ -5,12 +5,56 @@ import argparse
 import gzip
 import os
 import sys
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "https://data.binance.vision/data/spot/daily/klines"
+MAX_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 2 << 20
+
+
+def create_session() -> requests.Session:
+    """Create an HTTP session with connection pooling and retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_one(session: requests.Session, filename: str, url: str, output_dir: Path) -> None:
+    """Download and extract a single daily kline file."""
+    output_path = output_dir / filename
+
+    try:
+        with session.get(url, stream=True, timeout=30) as response:
+            if response.status_code == 200:
+                # Spool the archive (in memory up to 2 MiB, then on disk) and unzip it
+                with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as archive:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        archive.write(chunk)
+                    archive.seek(0)
+                    with zipfile.ZipFile(archive) as z:
+                        z.extractall(output_dir)
+                print(f"{filename}: saved to {output_path}")
+            elif response.status_code == 404:
+                print(f"{filename}: not available (possibly weekend or future date)")
+            else:
+                print(f"{filename}: failed with status {response.status_code}")
+    except Exception as e:
+        print(f"{filename}: error: {e}")
 
 
 def download_klines(
@@ -23,39 +67,33 @@ def download_klines(
     """Download kline data for a date range."""
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    tasks = []
     current_date = start_date
     while current_date <= end_date:
         date_str = current_date.strftime("%Y-%m-%d")
         filename = f"{symbol}-{interval}-{date_str}.csv"
         url = f"{BASE_URL}/{symbol}/{interval}/{filename}.zip"
 
-        output_path = output_dir / filename
-
-        if output_path.exists():
+        if (output_dir / filename).exists():
             print(f"Skipping {filename} (already exists)")
-            current_date += timedelta(days=1)
-            continue
+        else:
+            tasks.append((filename, url))
 
-        print(f"Downloading {filename}...")
+        current_date += timedelta(days=1)
 
-        try:
-            response = requests.get(url, timeout=30)
-            if response.status_code == 200:
-                # Save as CSV (unzip if needed)
-                import zipfile
-                import io
+    if not tasks:
+        return
 
-                with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-                    z.extractall(output_dir)
-                print(f"  Saved to {output_path}")
-            elif response.status_code == 404:
-                print(f"  Not available (possibly weekend or future date)")
-            else:
-                print(f"  Failed with status {response.status_code}")
-        except Exception as e:
-            print(f"  Error: {e}")
+    print(f"Downloading {len(tasks)} files...")
 
-        current_date += timedelta(days=1)
+    # Network-bound: share pooled keep-alive connections across worker threads
+    with create_session() as session, ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = [
+            pool.submit(fetch_one, session, filename, url, output_dir)
+            for filename, url in tasks
+        ]
+        for future in futures:
+            future.result()
 
 
 def main():
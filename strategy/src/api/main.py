@@ -3,7 +3,11 @@
 Provides REST API for health checks, account status, and manual controls.
 """
 
+import logging
+import math
+import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from collections.abc import AsyncIterator
@@ -12,6 +16,7 @@ from typing import Any, Optional
 import structlog
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from ..broker import PaperBroker
@@ -32,6 +37,39 @@ strategy: Optional[ImbalanceStrategy] = None
 scheduler: Optional[ShabbatScheduler] = None
 
 
+@dataclass
+class TTLCache:
+    """Cached endpoint response with a monotonic expiry time."""
+
+    value: dict[str, Any]
+    expiry: float
+
+
+# Short-lived response cache for polled endpoints, keyed by endpoint
+STATUS_CACHE_TTL_SECONDS = 0.5
+METRICS_CACHE_TTL_SECONDS = 2.0
+_response_cache: dict[str, TTLCache] = {}
+
+
+def _get_cached(key: str) -> Optional[dict[str, Any]]:
+    """Return a cached response if it has not expired."""
+    entry = _response_cache.get(key)
+    if entry is not None and time.monotonic() < entry.expiry:
+        return entry.value
+    return None
+
+
+def _set_cached(key: str, value: dict[str, Any], ttl: float) -> dict[str, Any]:
+    """Store a response in the cache and return it."""
+    _response_cache[key] = TTLCache(value=value, expiry=time.monotonic() + ttl)
+    return value
+
+
+def invalidate_response_cache() -> None:
+    """Drop all cached responses after a state change."""
+    _response_cache.clear()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan manager."""
@@ -39,6 +77,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     settings = get_settings()
 
+    # Apply LOG_LEVEL; filtered-out log methods become no-ops. An unknown
+    # level falls back to INFO rather than failing startup.
+    log_level = logging.getLevelNamesMapping().get(settings.log_level.upper())
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.INFO if log_level is None else log_level
+        )
+    )
+    if log_level is None:
+        logger.warning("invalid_log_level", log_level=settings.log_level, using="INFO")
+
     # Initialize database
     db_path = settings.database_url.replace("sqlite:///", "")
     db = Database(db_path)
@@ -77,6 +126,7 @@ app = FastAPI(
     description="HFT Paper Trading Strategy Engine API",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -116,10 +166,14 @@ async def get_status() -> dict[str, Any]:
     if not broker:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
+    cached = _get_cached("status")
+    if cached is not None:
+        return cached
+
     account = broker.get_account()
     is_paused = scheduler.is_shabbat() if scheduler else False
 
-    return {
+    return _set_cached("status", {
         "status": "paused" if is_paused else "active",
         "account": {
             "balance": str(account.balance),
@@ -141,10 +195,10 @@ async def get_status() -> dict[str, Any]:
         ],
         "scheduler": {
             "shabbat_pause": is_paused,
-            "next_event": scheduler.next_event().isoformat() if scheduler else None,
+            "next_event": scheduler.next_event() if scheduler else None,
         },
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+        "timestamp": datetime.utcnow(),
+    }, STATUS_CACHE_TTL_SECONDS)
 
 
 # ===========================================================================
@@ -232,12 +286,14 @@ async def place_manual_order(request: ManualOrderRequest) -> dict[str, Any]:
             order=order,
             current_price=Decimal(str(request.price or 50000)),  # Placeholder
         )
+        invalidate_response_cache()
         return {
             "order_id": order.id,
             "trade_id": trade.id if trade else None,
             "status": "filled" if trade else "pending",
         }
 
+    invalidate_response_cache()
     return {"order_id": order.id, "status": "pending"}
 
 
@@ -268,6 +324,7 @@ async def reset_strategy() -> dict[str, str]:
         strategy.reset()
     if features:
         features.reset()
+    invalidate_response_cache()
     logger.info("strategy_reset")
     return {"status": "reset"}
 
@@ -315,40 +372,43 @@ async def get_metrics() -> dict[str, Any]:
     if not db or not broker:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
-    trades = await db.get_trades(limit=1000)
+    cached = _get_cached("metrics")
+    if cached is not None:
+        return cached
+
+    stats = await db.get_metrics_aggregates(limit=1000)
     account = broker.get_account()
+    count = stats["count"]
 
-    if not trades:
-        return {
+    if not count:
+        return _set_cached("metrics", {
             "total_trades": 0,
             "win_rate": 0,
             "total_pnl": "0",
             "sharpe_ratio": None,
             "max_drawdown": "0",
-        }
+        }, METRICS_CACHE_TTL_SECONDS)
 
-    winning = sum(1 for t in trades if t.pnl and t.pnl > 0)
-    total_pnl = sum(float(t.pnl or 0) for t in trades)
+    winning = stats["winning"]
+    total_pnl = stats["pnl_sum"]
 
     # Calculate simple Sharpe (would need daily returns for proper calculation)
-    returns = [float(t.pnl or 0) for t in trades]
-    if returns:
-        import numpy as np
-        avg_return = np.mean(returns)
-        std_return = np.std(returns) if len(returns) > 1 else 1
-        sharpe = (avg_return / std_return) * np.sqrt(252) if std_return > 0 else 0
+    avg_return = total_pnl / count
+    if count > 1:
+        std_return = math.sqrt(max(stats["pnl_sq_sum"] / count - avg_return**2, 0.0))
     else:
-        sharpe = 0
+        std_return = 1
+    sharpe = (avg_return / std_return) * math.sqrt(252) if std_return > 0 else 0
 
-    return {
-        "total_trades": len(trades),
+    return _set_cached("metrics", {
+        "total_trades": count,
         "winning_trades": winning,
-        "losing_trades": len(trades) - winning,
-        "win_rate": winning / len(trades) if trades else 0,
+        "losing_trades": count - winning,
+        "win_rate": winning / count,
         "total_pnl": str(account.total_pnl),
         "pnl_pct": float((account.equity - account.initial_balance) / account.initial_balance * 100),
         "sharpe_ratio": sharpe,
-        "avg_trade_pnl": str(Decimal(str(total_pnl / len(trades)))) if trades else "0",
-        "largest_win": str(max((t.pnl for t in trades if t.pnl), default=Decimal("0"))),
-        "largest_loss": str(min((t.pnl for t in trades if t.pnl), default=Decimal("0"))),
-    }
+        "avg_trade_pnl": str(avg_return),
+        "largest_win": str(stats["largest_win"]),
+        "largest_loss": str(stats["largest_loss"]),
+    }, METRICS_CACHE_TTL_SECONDS)
@@ -0,0 +1,80 @@
+"""Compiled kernels for execution simulation.
+
+The kernels operate on flat float64 buffers so that both the single-order
+path and the batch path share one implementation of the book walk.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True)
+def walk_book_kernel(
+    prices: np.ndarray,
+    qtys: np.ndarray,
+    order_qty: float,
+    level_prob: float,
+    rnd: np.ndarray,
+    fill_ratios: np.ndarray,
+    fills: np.ndarray,
+) -> tuple:
+    """Walk book levels for one order, writing the fill per level into ``fills``.
+
+    Returns:
+        Tuple of (filled_qty, weighted_price_sum, completed, n_levels)
+    """
+    remaining = order_qty
+    weighted = 0.0
+    filled = 0.0
+    n_levels = 0
+
+    for i in range(prices.shape[0]):
+        fills[i] = 0.0
+        if remaining <= 0 or rnd[i] > level_prob:
+            continue
+
+        available = qtys[i] * fill_ratios[i]
+        if available <= 0:
+            continue
+
+        fill = min(remaining, available)
+        fills[i] = fill
+        weighted += prices[i] * fill
+        filled += fill
+        remaining -= fill
+        n_levels += 1
+
+    return filled, weighted, remaining <= 0, n_levels
+
+
+@njit(cache=True, parallel=True)
+def walk_books_batch_kernel(
+    prices: np.ndarray,
+    qtys: np.ndarray,
+    order_qtys: np.ndarray,
+    level_prob: float,
+    rnd: np.ndarray,
+    fill_ratios: np.ndarray,
+) -> tuple:
+    """Walk one (padded) book row per order in parallel.
+
+    Returns:
+        Tuple of (filled_qty, weighted_price_sum, total_volume, n_levels) arrays
+    """
+    n_orders, max_levels = prices.shape
+    filled = np.zeros(n_orders)
+    weighted = np.zeros(n_orders)
+    total_volume = np.zeros(n_orders)
+    n_levels = np.zeros(n_orders, dtype=np.int64)
+
+    for j in prange(n_orders):
+        fills = np.empty(max_levels)
+        f, w, _, n = walk_book_kernel(
+            prices[j], qtys[j], order_qtys[j], level_prob, rnd[j], fill_ratios[j], fills
+        )
+        filled[j] = f
+        weighted[j] = w
+        total_volume[j] = qtys[j].sum()
+        n_levels[j] = n
+
+    return filled, weighted, total_volume, n_levels
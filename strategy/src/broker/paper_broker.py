@@ -1,8 +1,10 @@
 """Paper broker for simulated order execution."""
 
+import itertools
+import time
 import uuid
 from datetime import datetime
-from decimal import Decimal
+from decimal import ROUND_HALF_EVEN, Decimal
 from typing import Optional
 
 import httpx
@@ -19,9 +21,39 @@ from ..models import (
     Trade,
 )
 from ..storage import Database
+from .risk_client import RiskClient
 
 logger = structlog.get_logger()
 
+# Prices, quantities and cash are handled as integers scaled by 1e8
+# (Binance's finest precision) on the execution path
+SCALE = 10**8
+
+_DEC_ZERO = Decimal("0")
+
+
+def to_fx(value: Decimal) -> int:
+    """Convert a Decimal to a fixed-point integer scaled by SCALE (half-even)."""
+    return int(value.scaleb(8).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def from_fx(value: int) -> Decimal:
+    """Convert a fixed-point integer back to a Decimal."""
+    return Decimal(value).scaleb(-8) if value else _DEC_ZERO
+
+
+def _div_fx(numerator: int, denominator: int) -> int:
+    """Divide integers rounding half to even, like Decimal's default context.
+
+    Floor division would bias every rounded result, negative P&L included,
+    towards minus infinity. ``denominator`` must be positive.
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
 
 class PaperBroker:
     """Simulated broker for paper trading."""
@@ -36,6 +68,13 @@ class PaperBroker:
         self.settings = get_settings()
         self._order_counter = 0
 
+        # Order IDs reuse the formatted UTC second until the clock moves on;
+        # trade IDs are a per-process random prefix plus a sequence number
+        self._id_prefix = ""
+        self._id_prefix_ts = 0
+        self._trade_id_prefix = uuid.uuid4().hex[:6]
+        self._trade_seq = itertools.count()
+
         # Account state (loaded from DB on startup)
         self.account = Account(
             balance=Decimal(str(self.settings.initial_balance)),
@@ -43,17 +82,33 @@ class PaperBroker:
             initial_balance=Decimal(str(self.settings.initial_balance)),
         )
 
-        # Position cache
+        # Settings-derived Decimals, converted once
+        self._max_position = Decimal(str(self.settings.max_position_size))
+
+        # Fee rates in fixed point, read from the class attributes once
+        self._maker_fee_fx = to_fx(self.MAKER_FEE)
+        self._taker_fee_fx = to_fx(self.TAKER_FEE)
+
+        # Fixed-point mirror of account.balance, updated on every fill
+        self._balance_fx = to_fx(self.account.balance)
+
+        # Position cache, with a fixed-point (quantity, entry price) mirror
+        # that the fill path updates; Position models are rebuilt from it
         self.positions: dict[str, Position] = {}
+        self._position_fx: dict[str, tuple[int, int]] = {}
 
-        # HTTP client for risk gateway
+        # HTTP client for risk gateway; order checks go through the batching client
         self._http_client: Optional[httpx.AsyncClient] = None
+        self._risk_client: Optional[RiskClient] = None
 
     async def initialize(self) -> None:
         """Initialize broker state from database."""
         # Load positions from database
         positions = await self.db.get_all_positions()
         self.positions = {p.symbol: p for p in positions}
+        self._position_fx = {
+            p.symbol: (to_fx(p.quantity), to_fx(p.entry_price)) for p in positions
+        }
 
         # Calculate account equity
         self._update_account_equity()
@@ -62,6 +117,8 @@ class PaperBroker:
             base_url=self.settings.core_api_url,
             timeout=5.0,
         )
+        self._risk_client = RiskClient(self._http_client)
+        self._risk_client.start()
 
         logger.info(
             "broker_initialized",
@@ -71,22 +128,32 @@ class PaperBroker:
 
     async def close(self) -> None:
         """Close the broker."""
+        if self._risk_client:
+            await self._risk_client.close()
         if self._http_client:
             await self._http_client.aclose()
 
     def _generate_order_id(self) -> str:
         """Generate a unique order ID."""
+        ts = int(time.time())
+        if ts != self._id_prefix_ts:
+            self._id_prefix = time.strftime("%Y%m%d%H%M%S", time.gmtime(ts))
+            self._id_prefix_ts = ts
         self._order_counter += 1
-        return f"ORD-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{self._order_counter}"
+        return f"ORD-{self._id_prefix}-{self._order_counter}"
 
     def _generate_trade_id(self) -> str:
         """Generate a unique trade ID."""
-        return f"TRD-{uuid.uuid4().hex[:12]}"
+        return f"TRD-{self._trade_id_prefix}{next(self._trade_seq):06x}"
 
     def _calculate_fee(self, price: Decimal, quantity: Decimal, is_maker: bool = False) -> Decimal:
         """Calculate trading fee."""
-        fee_rate = self.MAKER_FEE if is_maker else self.TAKER_FEE
-        return price * quantity * fee_rate
+        return from_fx(self._calculate_fee_fx(to_fx(price), to_fx(quantity), is_maker))
+
+    def _calculate_fee_fx(self, price_fx: int, qty_fx: int, is_maker: bool = False) -> int:
+        """Calculate trading fee on fixed-point price and quantity."""
+        fee_rate_fx = self._maker_fee_fx if is_maker else self._taker_fee_fx
+        return _div_fx(price_fx * qty_fx * fee_rate_fx, SCALE * SCALE)
 
     def _update_account_equity(self) -> None:
         """Update account equity based on positions."""
@@ -99,21 +166,12 @@ class PaperBroker:
 
     async def check_risk(self, symbol: str, side: Side, quantity: Decimal) -> tuple[bool, Optional[str], Optional[Decimal]]:
         """Check order against risk rules via core API."""
-        if not self._http_client:
+        if not self._risk_client:
             logger.warning("risk_gateway_not_available")
             return True, None, None
 
         try:
-            response = await self._http_client.post(
-                "/check-order",
-                json={
-                    "symbol": symbol,
-                    "side": side.value,
-                    "quantity": float(quantity),
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = await self._risk_client.check_order(symbol, side.value, float(quantity))
 
             if not data.get("approved"):
                 return False, data.get("reason"), None
@@ -130,9 +188,9 @@ class PaperBroker:
 
     def _local_risk_check(self, symbol: str, side: Side, quantity: Decimal) -> tuple[bool, Optional[str], Optional[Decimal]]:
         """Basic local risk checks as fallback."""
-        max_pos = Decimal(str(self.settings.max_position_size))
+        max_pos = self._max_position
         current_pos = self.positions.get(symbol)
-        current_qty = current_pos.quantity if current_pos else Decimal("0")
+        current_qty = current_pos.quantity if current_pos else _DEC_ZERO
 
         new_qty = current_qty + quantity if side == Side.BUY else current_qty - quantity
 
@@ -191,32 +249,38 @@ class PaperBroker:
         slippage_bps: Decimal = Decimal("5"),
     ) -> Optional[Trade]:
         """Execute a market order with simulated slippage."""
+        price_fx = to_fx(current_price)
+        qty_fx = to_fx(order.quantity)
+
         # Apply slippage
-        slippage = current_price * slippage_bps / Decimal("10000")
+        slippage_fx = _div_fx(price_fx * to_fx(slippage_bps), SCALE * 10000)
         if order.side == Side.BUY:
-            fill_price = current_price + slippage
+            fill_fx = price_fx + slippage_fx
         else:
-            fill_price = current_price - slippage
+            fill_fx = price_fx - slippage_fx
+        fill_price = from_fx(fill_fx)
 
         # Calculate fee
-        fee = self._calculate_fee(fill_price, order.quantity)
+        fee_fx = self._calculate_fee_fx(fill_fx, qty_fx)
+        fee = from_fx(fee_fx)
 
         # Calculate P&L if closing position
         pnl: Optional[Decimal] = None
-        position = self.positions.get(order.symbol)
+        position_qty_fx, entry_fx = self._position_fx.get(order.symbol, (0, 0))
 
-        if position and position.quantity != 0:
+        if position_qty_fx != 0:
             # Check if this is a closing trade
             is_closing = (
-                (position.quantity > 0 and order.side == Side.SELL) or
-                (position.quantity < 0 and order.side == Side.BUY)
+                (position_qty_fx > 0 and order.side == Side.SELL) or
+                (position_qty_fx < 0 and order.side == Side.BUY)
             )
             if is_closing:
-                close_qty = min(abs(position.quantity), order.quantity)
-                if position.quantity > 0:
-                    pnl = (fill_price - position.entry_price) * close_qty - fee
+                close_qty_fx = min(abs(position_qty_fx), qty_fx)
+                if position_qty_fx > 0:
+                    pnl_fx = _div_fx((fill_fx - entry_fx) * close_qty_fx, SCALE) - fee_fx
                 else:
-                    pnl = (position.entry_price - fill_price) * close_qty - fee
+                    pnl_fx = _div_fx((entry_fx - fill_fx) * close_qty_fx, SCALE) - fee_fx
+                pnl = from_fx(pnl_fx)
 
         # Create trade
         trade = Trade(
@@ -237,14 +301,15 @@ class PaperBroker:
         order.updated_at = datetime.utcnow()
 
         # Update position
-        await self._update_position(order.symbol, order.side, order.quantity, fill_price, pnl)
+        position = await self._update_position(order.symbol, order.side, qty_fx, fill_fx, pnl)
 
         # Update account balance
-        cost = fill_price * order.quantity + fee
+        cost_fx = _div_fx(fill_fx * qty_fx, SCALE) + fee_fx
         if order.side == Side.BUY:
-            self.account.balance -= cost
+            self._balance_fx -= cost_fx
         else:
-            self.account.balance += cost - (fee * 2)  # fee already deducted
+            self._balance_fx += cost_fx - (fee_fx * 2)  # fee already deducted
+        self.account.balance = from_fx(self._balance_fx)
 
         if pnl:
             self.account.total_pnl += pnl
@@ -252,9 +317,8 @@ class PaperBroker:
 
         self._update_account_equity()
 
-        # Persist
-        await self.db.save_trade(trade)
-        await self.db.save_order(order)
+        # Persist trade, order and position in one transaction
+        await self.db.save_trade_bundle(trade, order, position)
 
         logger.info(
             "trade_executed",
@@ -272,47 +336,49 @@ class PaperBroker:
         self,
         symbol: str,
         side: Side,
-        quantity: Decimal,
-        price: Decimal,
+        quantity_fx: int,
+        price_fx: int,
         pnl: Optional[Decimal],
-    ) -> None:
-        """Update position after a trade."""
+    ) -> Position:
+        """Update position after a trade; the caller persists it.
+
+        Quantity and price are fixed-point; the Position model is refreshed
+        from the integer state.
+        """
+        trade_fx = quantity_fx if side == Side.BUY else -quantity_fx
         position = self.positions.get(symbol)
 
         if position is None:
             # New position
-            qty = quantity if side == Side.BUY else -quantity
+            new_fx, entry_fx = trade_fx, price_fx
             position = Position(
                 symbol=symbol,
-                quantity=qty,
-                entry_price=price,
+                quantity=from_fx(new_fx),
+                entry_price=from_fx(entry_fx),
             )
         else:
-            current_qty = position.quantity
-            trade_qty = quantity if side == Side.BUY else -quantity
-            new_qty = current_qty + trade_qty
+            current_fx, entry_fx = self._position_fx.get(symbol, (0, 0))
+            new_fx = current_fx + trade_fx
 
-            if new_qty == 0:
+            if new_fx == 0:
                 # Position closed
-                position.quantity = Decimal("0")
-                position.realized_pnl += pnl or Decimal("0")
-            elif (current_qty > 0 and new_qty > 0) or (current_qty < 0 and new_qty < 0):
+                position.realized_pnl += pnl or _DEC_ZERO
+            elif (current_fx > 0 and new_fx > 0) or (current_fx < 0 and new_fx < 0):
                 # Adding to position - calculate new average price
-                if current_qty != 0:
-                    total_cost = position.entry_price * abs(current_qty) + price * quantity
-                    position.entry_price = total_cost / abs(new_qty)
-                position.quantity = new_qty
+                total_cost_fx = entry_fx * abs(current_fx) + price_fx * quantity_fx
+                entry_fx = _div_fx(total_cost_fx, abs(new_fx))
             else:
                 # Position flipped
-                position.quantity = new_qty
-                position.entry_price = price
+                entry_fx = price_fx
                 if pnl:
                     position.realized_pnl += pnl
 
+            position.quantity = from_fx(new_fx)
+            position.entry_price = from_fx(entry_fx)
             position.updated_at = datetime.utcnow()
 
         self.positions[symbol] = position
-        await self.db.save_position(position)
+        self._position_fx[symbol] = (new_fx, entry_fx)
 
         # Update risk gateway
         if self._http_client:
@@ -328,6 +394,8 @@ class PaperBroker:
             except Exception as e:
                 logger.warning("failed_to_update_risk_position", error=str(e))
 
+        return position
+
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get current position for a symbol."""
         return self.positions.get(symbol)
@@ -0,0 +1,102 @@
+"""Batched client for the risk gateway's order checks."""
+
+import asyncio
+from typing import Any, Optional
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+# Upper bound on orders sent in one /check-orders-batch request
+MAX_BATCH_SIZE = 64
+
+
+class RiskClient:
+    """Coalesces concurrent order checks into batched gateway requests.
+
+    Callers enqueue a check and await its future. A single background task
+    sends everything queued while the previous request was in flight as one
+    /check-orders-batch call, so a lone order goes out immediately and a
+    burst of orders shares one round trip.
+    """
+
+    def __init__(self, http_client: httpx.AsyncClient, max_batch_size: int = MAX_BATCH_SIZE):
+        """Initialize the risk client."""
+        self._http_client = http_client
+        self._max_batch_size = max_batch_size
+        self._queue: asyncio.Queue[tuple[dict[str, Any], asyncio.Future]] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def start(self) -> None:
+        """Start the background batching task."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain())
+
+    async def close(self) -> None:
+        """Stop the background task and fail any checks still queued or in flight."""
+        self._closed = True
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("risk client closed"))
+
+    async def check_order(self, symbol: str, side: str, quantity: float) -> dict[str, Any]:
+        """Check one order, returning the gateway's verdict for it.
+
+        Raises:
+            RuntimeError: If the client has been closed
+            Exception: If the gateway request fails or reports an error for the order
+        """
+        if self._closed:
+            raise RuntimeError("risk client closed")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(({"symbol": symbol, "side": side, "quantity": quantity}, future))
+        return await future
+
+    async def _drain(self) -> None:
+        """Send queued checks in batches until cancelled."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                response = await self._http_client.post(
+                    "/check-orders-batch",
+                    json={"orders": [order for order, _ in batch]},
+                )
+                response.raise_for_status()
+                results = response.json()["results"]
+                if len(results) != len(batch):
+                    raise ValueError(f"expected {len(batch)} results, got {len(results)}")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            except BaseException:
+                # Cancelled by close() mid-request: don't strand the callers
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("risk client closed"))
+                raise
+
+            for (_, future), result in zip(batch, results, strict=True):
+                if future.done():
+                    continue
+                if "error" in result:
+                    future.set_exception(ValueError(result["error"]))
+                else:
+                    future.set_result(result)
+
+            logger.debug("risk_batch_checked", size=len(batch))
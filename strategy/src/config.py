@@ -1,7 +1,6 @@
 """Configuration management for the strategy engine."""
 
-from functools import lru_cache
-from typing import List
+from typing import Final, List
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -13,6 +12,7 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
+        frozen=True,
     )
 
     # Database
@@ -64,7 +64,10 @@ class Settings(BaseSettings):
         return v
 
 
-@lru_cache
+# Loaded once at import; settings are immutable for the life of the process
+SETTINGS: Final[Settings] = Settings()
+
+
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the process-wide settings instance."""
+    return SETTINGS
@@ -8,17 +8,90 @@ Provides:
 """
 
 import asyncio
+import math
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Optional, Dict, List, Deque
-from collections import deque
+from typing import Optional, Dict, List
 
 import httpx
+import numpy as np
+import orjson
 import structlog
 
 logger = structlog.get_logger()
 
+# Client-side request budget, kept well under Binance's 2400 weight/min limit
+REQUESTS_PER_MINUTE = 1200
+MAX_RETRIES = 3
+
+# In-flight request caps per polling lane, so a slow funding poll can never
+# hold the connections the faster open interest loop needs
+OI_MAX_CONCURRENCY = 8
+FUNDING_MAX_CONCURRENCY = 4
+
+# Liquidations retained for regime analysis
+LIQUIDATION_CAPACITY = 1000
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _now_ms() -> int:
+    """Current UTC time as epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def _ms_to_datetime(ts_ms: int) -> datetime:
+    """Naive UTC datetime for epoch milliseconds."""
+    return _EPOCH + timedelta(milliseconds=ts_ms)
+
+
+def _retry_after_seconds(value: Optional[str]) -> float:
+    """Seconds to wait from a Retry-After header.
+
+    Binance sends a number of seconds; anything else, including the
+    HTTP-date form, falls back to one second.
+    """
+    try:
+        seconds = float(value) if value is not None else 1.0
+    except ValueError:
+        return 1.0
+    return seconds if math.isfinite(seconds) and seconds >= 0 else 1.0
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 
 @dataclass
 class FundingRateData:
@@ -29,21 +102,19 @@ class FundingRateData:
     next_funding_time: datetime
     mark_price: Decimal
 
-    @property
-    def funding_rate_pct(self) -> float:
-        """Funding rate as percentage."""
-        return float(self.funding_rate * 100)
+    # Derived once on construction, read on every regime assessment
+    funding_rate_pct: float = field(init=False)  # Funding rate as percentage
+    is_extreme: bool = field(init=False)  # True if funding is >0.1% or <-0.1%
+
+    def __post_init__(self) -> None:
+        self.funding_rate_pct = float(self.funding_rate * 100)
+        self.is_extreme = abs(self.funding_rate_pct) > 0.1
 
     @property
     def is_positive(self) -> bool:
         """True if longs pay shorts (bullish sentiment)."""
         return self.funding_rate > 0
 
-    @property
-    def is_extreme(self) -> bool:
-        """True if funding is extreme (>0.1% or <-0.1%)."""
-        return abs(self.funding_rate_pct) > 0.1
-
 
 @dataclass
 class OpenInterestData:
@@ -51,12 +122,46 @@ class OpenInterestData:
     symbol: str
     open_interest: Decimal
     open_interest_value: Decimal  # In quote currency
-    timestamp: datetime
+    ts_ms: int  # Epoch milliseconds
 
     # Tracking changes
     change_1h: Optional[Decimal] = None
     change_24h: Optional[Decimal] = None
 
+    @property
+    def timestamp(self) -> datetime:
+        """Sample time as a naive UTC datetime."""
+        return _ms_to_datetime(self.ts_ms)
+
+
+class _OIHistory:
+    """Fixed-size ring of open interest samples with O(1) lookback."""
+
+    __slots__ = ("capacity", "count", "_slots", "_head")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty history holding at most ``capacity`` samples."""
+        self.capacity = capacity
+        self.count = 0
+        self._slots: List[Decimal] = [Decimal(0)] * capacity
+        self._head = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, open_interest: Decimal) -> None:
+        """Append a sample, overwriting the oldest one when full."""
+        self._slots[self._head] = open_interest
+        self._head = (self._head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def ago(self, samples: int) -> Optional[Decimal]:
+        """Return the sample recorded ``samples`` appends ago, if retained."""
+        if samples > self.count:
+            return None
+        return self._slots[(self._head - samples) % self.capacity]
+
 
 @dataclass
 class LiquidationEvent:
@@ -67,9 +172,15 @@ class LiquidationEvent:
     quantity: Decimal
     timestamp: datetime
 
-    @property
-    def notional(self) -> Decimal:
-        return self.price * self.quantity
+    # Derived once on construction
+    notional: Decimal = field(init=False)
+    notional_f: float = field(init=False)  # Float copy for aggregation
+    ts_ms: int = field(init=False)  # Epoch milliseconds
+
+    def __post_init__(self) -> None:
+        self.notional = self.price * self.quantity
+        self.notional_f = float(self.price) * float(self.quantity)
+        self.ts_ms = (self.timestamp - _EPOCH) // timedelta(milliseconds=1)
 
     @property
     def is_long_liquidation(self) -> bool:
@@ -77,10 +188,88 @@ class LiquidationEvent:
         return self.side == "sell"  # Long liquidated = sell order
 
 
+class _LiquidationRing:
+    """Struct-of-arrays store for the most recent liquidations.
+
+    Each row is written twice, at ``head`` and ``head + capacity``, so the
+    live rows are always one contiguous slice of every column, oldest first.
+    Reductions run on the numeric columns; the events themselves are kept in
+    an object column so callers get back the exact Decimals they recorded.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty ring holding at most ``capacity`` rows."""
+        self.capacity = capacity
+        self.count = 0
+        self._head = 0
+        self._ts_ms = np.zeros(2 * capacity, dtype=np.int64)
+        self._price = np.zeros(2 * capacity, dtype=np.float64)
+        self._qty = np.zeros(2 * capacity, dtype=np.float64)
+        self._is_long = np.zeros(2 * capacity, dtype=np.bool_)
+        self._symbol_id = np.zeros(2 * capacity, dtype=np.int16)
+        self._events = np.empty(2 * capacity, dtype=object)
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _live(self) -> slice:
+        end = self._head + self.capacity
+        return slice(end - self.count, end)
+
+    def append(self, event: LiquidationEvent) -> None:
+        """Append a row for ``event``, dropping the oldest row when full."""
+        symbol_id = self._symbol_ids.get(event.symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[event.symbol] = len(self._symbols)
+            self._symbols.append(event.symbol)
+
+        for i in (self._head, self._head + self.capacity):
+            self._ts_ms[i] = event.ts_ms
+            self._price[i] = event.price
+            self._qty[i] = event.quantity
+            self._is_long[i] = event.is_long_liquidation
+            self._symbol_id[i] = symbol_id
+            self._events[i] = event
+        self._head = (self._head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def recent(self, symbol: Optional[str], seconds: int) -> np.ndarray:
+        """Boolean mask over the live rows newer than ``seconds`` ago."""
+        live = self._live()
+        mask = self._ts_ms[live] >= _now_ms() - seconds * 1000
+        if symbol is not None:
+            symbol_id = self._symbol_ids.get(symbol)
+            if symbol_id is None:
+                return np.zeros(self.count, dtype=np.bool_)
+            mask &= self._symbol_id[live] == symbol_id
+        return mask
+
+    def notional_totals(self, mask: np.ndarray) -> tuple[float, float]:
+        """Total and long-liquidation notional of the masked live rows."""
+        live = self._live()
+        notional = self._price[live][mask] * self._qty[live][mask]
+        long_notional = notional[self._is_long[live][mask]]
+        return float(notional.sum()), float(long_notional.sum())
+
+    def oldest_ms(self, mask: np.ndarray) -> int:
+        """Earliest timestamp among the masked live rows."""
+        return int(self._ts_ms[self._live()][mask].min())
+
+    def events(self, mask: Optional[np.ndarray] = None) -> List[LiquidationEvent]:
+        """The recorded LiquidationEvent objects for the (masked) live rows."""
+        events = self._events[self._live()]
+        if mask is not None:
+            events = events[mask]
+        return events.tolist()
+
+
 @dataclass
 class MarketRegime:
     """Current market regime assessment."""
-    timestamp: datetime
+    ts_ms: int  # Epoch milliseconds
 
     # Funding based signals
     funding_sentiment: str = "neutral"  # bullish, neutral, bearish
@@ -97,6 +286,11 @@ class MarketRegime:
     # Overall regime
     regime: str = "normal"  # normal, high_risk, trending, ranging
 
+    @property
+    def timestamp(self) -> datetime:
+        """Assessment time as a naive UTC datetime."""
+        return _ms_to_datetime(self.ts_ms)
+
     def should_reduce_exposure(self) -> bool:
         """Check if exposure should be reduced."""
         return (
@@ -127,6 +321,7 @@ class ComplementaryDataProvider:
             liquidation_window: Window for liquidation analysis (seconds)
         """
         self.symbols = symbols or ["BTCUSDT", "ETHUSDT"]
+        self._symbol_set = frozenset(self.symbols)
         self.funding_interval = funding_update_interval
         self.oi_interval = oi_update_interval
         self.liquidation_window = liquidation_window
@@ -134,19 +329,45 @@ class ComplementaryDataProvider:
         # Data storage
         self.funding_rates: Dict[str, FundingRateData] = {}
         self.open_interest: Dict[str, OpenInterestData] = {}
-        self.oi_history: Dict[str, Deque[OpenInterestData]] = {
-            s: deque(maxlen=1440) for s in self.symbols  # 24h at 1min intervals
+        self.oi_history: Dict[str, _OIHistory] = {
+            s: _OIHistory(1440) for s in self.symbols  # 24h at 1min intervals
         }
-        self.liquidations: Deque[LiquidationEvent] = deque(maxlen=1000)
+        self._liquidations = _LiquidationRing(LIQUIDATION_CAPACITY)
+
+        # Update counters and the last assessment per symbol, so repeated
+        # regime assessments between data updates are a lookup
+        self._funding_seq: Dict[str, int] = {}
+        self._oi_seq: Dict[str, int] = {}
+        self._liq_seq = 0
+        self._regime_cache: Dict[str, tuple[tuple[int, int, int], float, MarketRegime]] = {}
+        self._status_cache: Optional[tuple[tuple[int, int], dict, dict]] = None
 
         # HTTP client
         self._client: Optional[httpx.AsyncClient] = None
         self._running = False
         self._tasks: List[asyncio.Task] = []
 
+        # Per-lane concurrency and a rate limit shared by both polling loops
+        self._oi_sem = asyncio.Semaphore(OI_MAX_CONCURRENCY)
+        self._fund_sem = asyncio.Semaphore(FUNDING_MAX_CONCURRENCY)
+        self._limiter = TokenBucket(
+            rate=REQUESTS_PER_MINUTE / 60,
+            capacity=OI_MAX_CONCURRENCY + FUNDING_MAX_CONCURRENCY,
+        )
+
     async def start(self) -> None:
         """Start data collection."""
-        self._client = httpx.AsyncClient(timeout=10.0)
+        # Every request goes to one host, so keep a warm pool and multiplex over HTTP/2
+        self._client = httpx.AsyncClient(
+            base_url=self.BINANCE_FUTURES_BASE,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=40,
+                max_connections=100,
+                keepalive_expiry=30,
+            ),
+            http2=True,
+        )
         self._running = True
 
         # Start background tasks
@@ -196,89 +417,144 @@ class ComplementaryDataProvider:
 
             await asyncio.sleep(self.oi_interval)
 
+    async def _get(
+        self, path: str, params: dict, lane: asyncio.Semaphore
+    ) -> httpx.Response:
+        """Send a throttled GET in ``lane``, backing off when Binance rate limits us.
+
+        Raises:
+            httpx.HTTPStatusError: If the request still fails after retries
+        """
+        assert self._client is not None  # Callers return early until start()
+        for attempt in range(MAX_RETRIES + 1):
+            async with lane:
+                await self._limiter.acquire()
+                response = await self._client.get(path, params=params)
+
+            # 429 = rate limited, 418 = IP banned after ignoring 429s
+            if response.status_code not in (429, 418) or attempt == MAX_RETRIES:
+                break
+
+            delay = _retry_after_seconds(response.headers.get("Retry-After")) * 2 ** attempt
+            logger.warning(
+                "binance_rate_limited",
+                path=path,
+                status=response.status_code,
+                retry_in=delay,
+            )
+            await asyncio.sleep(delay)
+
+        response.raise_for_status()
+        return response
+
     async def _update_funding_rates(self) -> None:
-        """Fetch current funding rates."""
+        """Fetch current funding rates for all tracked symbols in one request."""
         if not self._client:
             return
 
-        for symbol in self.symbols:
-            try:
-                response = await self._client.get(
-                    f"{self.BINANCE_FUTURES_BASE}/fapi/v1/premiumIndex",
-                    params={"symbol": symbol},
-                )
-                response.raise_for_status()
-                data = response.json()
+        # Without a symbol, premiumIndex returns every perpetual at once
+        response = await self._get("/fapi/v1/premiumIndex", params={}, lane=self._fund_sem)
+        data = orjson.loads(response.content)
 
-                self.funding_rates[symbol] = FundingRateData(
-                    symbol=symbol,
-                    funding_rate=Decimal(data["lastFundingRate"]),
-                    funding_time=datetime.fromtimestamp(data["time"] / 1000),
-                    next_funding_time=datetime.fromtimestamp(data["nextFundingTime"] / 1000),
-                    mark_price=Decimal(data["markPrice"]),
-                )
+        for item in data:
+            symbol = item.get("symbol")
+            if symbol not in self._symbol_set:
+                continue
 
-                logger.debug(
-                    "funding_rate_updated",
+            try:
+                funding = FundingRateData(
                     symbol=symbol,
-                    rate=self.funding_rates[symbol].funding_rate_pct,
+                    funding_rate=Decimal(item["lastFundingRate"]),
+                    funding_time=datetime.fromtimestamp(item["time"] / 1000),
+                    next_funding_time=datetime.fromtimestamp(item["nextFundingTime"] / 1000),
+                    mark_price=Decimal(item["markPrice"]),
                 )
-
             except Exception as e:
                 logger.warning("funding_fetch_error", symbol=symbol, error=str(e))
+                continue
+
+            self.funding_rates[symbol] = funding
+            self._funding_seq[symbol] = self._funding_seq.get(symbol, 0) + 1
+
+            logger.debug(
+                "funding_rate_updated",
+                symbol=symbol,
+                rate=funding.funding_rate_pct,
+            )
 
     async def _update_open_interest(self) -> None:
-        """Fetch current open interest."""
+        """Fetch current open interest for all symbols concurrently."""
         if not self._client:
             return
 
-        for symbol in self.symbols:
-            try:
-                response = await self._client.get(
-                    f"{self.BINANCE_FUTURES_BASE}/fapi/v1/openInterest",
-                    params={"symbol": symbol},
-                )
-                response.raise_for_status()
-                data = response.json()
+        results = await asyncio.gather(
+            *(self._fetch_open_interest(symbol) for symbol in self.symbols),
+            return_exceptions=True,
+        )
 
-                oi_data = OpenInterestData(
-                    symbol=symbol,
-                    open_interest=Decimal(data["openInterest"]),
-                    open_interest_value=Decimal("0"),  # Would need price to calculate
-                    timestamp=datetime.utcnow(),
-                )
+        for symbol, open_interest in zip(self.symbols, results, strict=True):
+            if isinstance(open_interest, Decimal):
+                self._record_open_interest(symbol, open_interest)
 
-                # Calculate changes
-                history = self.oi_history[symbol]
-                if history:
-                    # 1 hour ago (60 samples at 1 min)
-                    if len(history) >= 60:
-                        old_oi = history[-60].open_interest
-                        if old_oi > 0:
-                            oi_data.change_1h = (oi_data.open_interest - old_oi) / old_oi
-
-                    # 24 hours ago
-                    if len(history) >= 1440:
-                        old_oi = history[0].open_interest
-                        if old_oi > 0:
-                            oi_data.change_24h = (oi_data.open_interest - old_oi) / old_oi
-
-                self.open_interest[symbol] = oi_data
-                self.oi_history[symbol].append(oi_data)
-
-                logger.debug(
-                    "open_interest_updated",
-                    symbol=symbol,
-                    oi=str(oi_data.open_interest),
-                    change_1h=float(oi_data.change_1h) if oi_data.change_1h else None,
-                )
+    async def _fetch_open_interest(self, symbol: str) -> Optional[Decimal]:
+        """Fetch the open interest for one symbol.
 
-            except Exception as e:
-                logger.warning("oi_fetch_error", symbol=symbol, error=str(e))
+        Returns:
+            Open interest in contracts, or None if the request failed
+        """
+        try:
+            response = await self._get(
+                "/fapi/v1/openInterest", params={"symbol": symbol}, lane=self._oi_sem
+            )
+            data = orjson.loads(response.content)
+            return Decimal(data["openInterest"])
+
+        except Exception as e:
+            logger.warning("oi_fetch_error", symbol=symbol, error=str(e))
+            return None
+
+    def _record_open_interest(self, symbol: str, open_interest: Decimal) -> None:
+        """Store a new open interest sample and derive its changes."""
+        oi_data = OpenInterestData(
+            symbol=symbol,
+            open_interest=open_interest,
+            open_interest_value=Decimal("0"),  # Would need price to calculate
+            ts_ms=_now_ms(),
+        )
+
+        # Calculate changes
+        history = self.oi_history[symbol]
+
+        # 1 hour ago (60 samples at 1 min)
+        old_oi = history.ago(60)
+        if old_oi is not None and old_oi > 0:
+            oi_data.change_1h = (open_interest - old_oi) / old_oi
+
+        # 24 hours ago
+        old_oi = history.ago(1440)
+        if old_oi is not None and old_oi > 0:
+            oi_data.change_24h = (open_interest - old_oi) / old_oi
+
+        self.open_interest[symbol] = oi_data
+        self._oi_seq[symbol] = self._oi_seq.get(symbol, 0) + 1
+        history.append(open_interest)
+
+        logger.debug(
+            "open_interest_updated",
+            symbol=symbol,
+            oi=str(oi_data.open_interest),
+            change_1h=float(oi_data.change_1h) if oi_data.change_1h else None,
+        )
+
+    @property
+    def liquidations(self) -> List[LiquidationEvent]:
+        """Retained liquidation events, oldest first."""
+        return self._liquidations.events()
 
     def record_liquidation(self, event: LiquidationEvent) -> None:
         """Record a liquidation event from WebSocket stream."""
-        self.liquidations.append(event)
+        self._liquidations.append(event)
+        self._liq_seq += 1
 
         logger.debug(
             "liquidation_recorded",
@@ -293,18 +569,23 @@ class ComplementaryDataProvider:
         seconds: int = 60,
     ) -> List[LiquidationEvent]:
         """Get recent liquidation events."""
-        cutoff = datetime.utcnow() - timedelta(seconds=seconds)
+        return self._liquidations.events(self._liquidations.recent(symbol, seconds))
 
-        events = [
-            e for e in self.liquidations
-            if e.timestamp >= cutoff and (symbol is None or e.symbol == symbol)
-        ]
+    def assess_market_regime(self, symbol: str) -> MarketRegime:
+        """Assess current market regime for a symbol.
 
-        return events
+        The result is reused until funding, open interest or liquidations
+        change, or until a counted liquidation ages out of the window, so its
+        timestamp is that of the assessment which produced it.
+        """
+        now_ms = _now_ms()
+        key = (self._funding_seq.get(symbol, 0), self._oi_seq.get(symbol, 0), self._liq_seq)
+        cached = self._regime_cache.get(symbol)
+        if cached is not None and cached[0] == key and now_ms <= cached[1]:
+            return cached[2]
 
-    def assess_market_regime(self, symbol: str) -> MarketRegime:
-        """Assess current market regime for a symbol."""
-        regime = MarketRegime(timestamp=datetime.utcnow())
+        regime = MarketRegime(ts_ms=now_ms)
+        expires_ms = math.inf
 
         # Funding analysis
         funding = self.funding_rates.get(symbol)
@@ -324,21 +605,21 @@ class ComplementaryDataProvider:
                 regime.oi_trend = "decreasing"
 
         # Liquidation analysis
-        recent_liqs = self.get_recent_liquidations(symbol, seconds=self.liquidation_window)
-        if recent_liqs:
-            total_notional = sum(e.notional for e in recent_liqs)
-            long_notional = sum(e.notional for e in recent_liqs if e.is_long_liquidation)
+        recent = self._liquidations.recent(symbol, self.liquidation_window)
+        if recent.any():
+            total_notional, long_notional = self._liquidations.notional_totals(recent)
+            expires_ms = self._liquidations.oldest_ms(recent) + self.liquidation_window * 1000
 
             # Cascade risk based on total liquidation volume
-            if total_notional > Decimal("10000000"):  # >$10M
+            if total_notional > 10_000_000:  # >$10M
                 regime.liquidation_cascade_risk = "high"
-            elif total_notional > Decimal("1000000"):  # >$1M
+            elif total_notional > 1_000_000:  # >$1M
                 regime.liquidation_cascade_risk = "medium"
 
             # Bias
-            if long_notional > total_notional * Decimal("0.7"):
+            if long_notional > total_notional * 0.7:
                 regime.recent_liquidation_bias = "long_heavy"
-            elif long_notional < total_notional * Decimal("0.3"):
+            elif long_notional < total_notional * 0.3:
                 regime.recent_liquidation_bias = "short_heavy"
 
         # Overall regime
@@ -349,6 +630,7 @@ class ComplementaryDataProvider:
         elif regime.oi_trend == "increasing" and regime.funding_sentiment != "neutral":
             regime.regime = "trending"
 
+        self._regime_cache[symbol] = (key, expires_ms, regime)
         return regime
 
     def get_funding_rate(self, symbol: str) -> Optional[FundingRateData]:
@@ -360,22 +642,35 @@ class ComplementaryDataProvider:
         return self.open_interest.get(symbol)
 
     def get_status(self) -> dict:
-        """Get data provider status."""
-        return {
-            "symbols": self.symbols,
-            "funding_rates": {
+        """Get data provider status.
+
+        The funding and open interest sections are rebuilt only after an
+        update and are shared between calls, so treat them as read-only.
+        """
+        key = (sum(self._funding_seq.values()), sum(self._oi_seq.values()))
+        if self._status_cache is None or self._status_cache[0] != key:
+            funding_rates = {
                 s: {
                     "rate_pct": fr.funding_rate_pct,
                     "is_extreme": fr.is_extreme,
                 }
                 for s, fr in self.funding_rates.items()
-            },
-            "open_interest": {
+            }
+            open_interest = {
                 s: {
                     "value": str(oi.open_interest),
                     "change_1h_pct": float(oi.change_1h * 100) if oi.change_1h else None,
                 }
                 for s, oi in self.open_interest.items()
-            },
-            "recent_liquidations_count": len(self.get_recent_liquidations(seconds=300)),
+            }
+            self._status_cache = (key, funding_rates, open_interest)
+
+        _, funding_rates, open_interest = self._status_cache
+        return {
+            "symbols": self.symbols,
+            "funding_rates": funding_rates,
+            "open_interest": open_interest,
+            "recent_liquidations_count": int(
+                np.count_nonzero(self._liquidations.recent(None, 300))
+            ),
         }
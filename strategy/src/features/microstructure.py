@@ -5,6 +5,7 @@ trading strategies, including order book imbalance, volatility, and
 volume profiles.
 """
 
+import math
 from collections import deque
 from dataclasses import dataclass, field
 from decimal import Decimal
@@ -12,8 +13,10 @@ from typing import Optional
 
 import numpy as np
 
+from ._feature_kernels import compute_features
 
-@dataclass
+
+@dataclass(slots=True)
 class FeatureSnapshot:
     """Snapshot of calculated features at a point in time."""
 
@@ -41,6 +44,112 @@ class FeatureSnapshot:
     volatility_z: Optional[float] = None
 
 
+def _none_if_nan(value: float) -> Optional[float]:
+    """Map the kernels' NaN "not enough history" marker to None."""
+    return None if math.isnan(value) else value
+
+
+@dataclass
+class FeatureBatch:
+    """Column-oriented features for several symbols at one tick.
+
+    Each column is a float64 array aligned with ``symbols``; NaN stands in
+    for a feature that is None in the corresponding FeatureSnapshot.
+    """
+
+    symbols: list[str]
+    mid_price: np.ndarray
+    spread_bps: np.ndarray
+    imbalance: np.ndarray
+    weighted_imbalance: np.ndarray
+    momentum: np.ndarray
+    imbalance_momentum: np.ndarray
+    volatility_z: np.ndarray
+
+    # Columns shared with FeatureSnapshot, in constructor order
+    _COLUMNS = (
+        "mid_price",
+        "spread_bps",
+        "imbalance",
+        "weighted_imbalance",
+        "momentum",
+        "imbalance_momentum",
+        "volatility_z",
+    )
+
+    @classmethod
+    def from_snapshots(cls, snapshots: list[FeatureSnapshot]) -> "FeatureBatch":
+        """Build a batch from per-symbol snapshots."""
+        nan = math.nan
+        columns = [
+            np.array(
+                [nan if (v := getattr(s, name)) is None else float(v) for s in snapshots],
+                dtype=np.float64,
+            )
+            for name in cls._COLUMNS
+        ]
+        return cls([s.symbol for s in snapshots], *columns)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def snapshot(self, i: int, timestamp: int = 0) -> FeatureSnapshot:
+        """Materialize row ``i`` as a FeatureSnapshot."""
+        (
+            mid_price,
+            spread_bps,
+            imbalance,
+            weighted_imbalance,
+            momentum,
+            imbalance_momentum,
+            volatility_z,
+        ) = (_none_if_nan(float(getattr(self, name)[i])) for name in self._COLUMNS)
+        return FeatureSnapshot(
+            timestamp=timestamp,
+            symbol=self.symbols[i],
+            mid_price=None if mid_price is None else Decimal(str(mid_price)),
+            spread_bps=None if spread_bps is None else Decimal(str(spread_bps)),
+            imbalance=imbalance,
+            weighted_imbalance=weighted_imbalance,
+            momentum=momentum,
+            imbalance_momentum=imbalance_momentum,
+            volatility_z=volatility_z,
+        )
+
+
+class _RingBuf:
+    """Fixed-capacity float64 ring buffer with zero-copy trailing windows.
+
+    Each value is written twice, at ``head`` and ``head + capacity``, so the
+    most recent ``n`` values are always one contiguous slice of the buffer.
+    """
+
+    __slots__ = ("capacity", "count", "_buf", "_head")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer holding at most ``capacity`` values."""
+        self.capacity = capacity
+        self.count = 0
+        self._buf = np.empty(2 * capacity, dtype=np.float64)
+        self._head = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, value: float) -> None:
+        """Append a value, overwriting the oldest one when full."""
+        self._buf[self._head] = value
+        self._buf[self._head + self.capacity] = value
+        self._head = (self._head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def window(self, n: int) -> np.ndarray:
+        """Return a view of the last ``n`` values, oldest first."""
+        end = self._head + self.capacity
+        return self._buf[end - min(n, self.count):end]
+
+
 class MicrostructureFeatures:
     """Calculator for microstructure features.
 
@@ -66,8 +175,8 @@ class MicrostructureFeatures:
         self.momentum_window = momentum_window
 
         # Rolling windows per symbol
-        self._mid_prices: dict[str, deque[float]] = {}
-        self._imbalances: dict[str, deque[float]] = {}
+        self._mid_prices: dict[str, _RingBuf] = {}
+        self._imbalances: dict[str, _RingBuf] = {}
         self._timestamps: dict[str, deque[int]] = {}
 
         # Statistics for normalization
@@ -79,8 +188,8 @@ class MicrostructureFeatures:
     def _ensure_symbol(self, symbol: str) -> None:
         """Ensure data structures exist for a symbol."""
         if symbol not in self._mid_prices:
-            self._mid_prices[symbol] = deque(maxlen=self.window_size)
-            self._imbalances[symbol] = deque(maxlen=self.window_size)
+            self._mid_prices[symbol] = _RingBuf(self.window_size)
+            self._imbalances[symbol] = _RingBuf(self.window_size)
             self._timestamps[symbol] = deque(maxlen=self.window_size)
             self._imbalance_mean[symbol] = 0.0
             self._imbalance_std[symbol] = 1.0
@@ -122,13 +231,31 @@ class MicrostructureFeatures:
             self._imbalances[symbol].append(float(imbalance))
         self._timestamps[symbol].append(timestamp)
 
-        # Calculate derived features
-        volatility = self._calculate_volatility(symbol)
-        momentum = self._calculate_momentum(symbol)
-        imbalance_momentum = self._calculate_imbalance_momentum(symbol)
+        # Calculate derived features in one compiled pass over the windows
+        prices = self._mid_prices[symbol]
+        imbalances = self._imbalances[symbol]
+        (
+            volatility,
+            return_std,
+            window_vol_std,
+            momentum,
+            imbalance_momentum,
+            imbalance_mean,
+            imbalance_std,
+        ) = compute_features(
+            prices.window(prices.count),
+            imbalances.window(imbalances.count),
+            self.volatility_window,
+            self.momentum_window,
+        )
+        volatility = _none_if_nan(volatility)
+        momentum = _none_if_nan(momentum)
+        imbalance_momentum = _none_if_nan(imbalance_momentum)
 
         # Update normalization statistics
-        self._update_statistics(symbol)
+        self._update_statistics(
+            symbol, return_std, window_vol_std, imbalance_mean, imbalance_std
+        )
 
         # Calculate normalized features
         imbalance_z = self._normalize_imbalance(symbol, float(imbalance) if imbalance else None)
@@ -156,73 +283,23 @@ class MicrostructureFeatures:
             volatility_z=volatility_z,
         )
 
-    def _calculate_volatility(self, symbol: str) -> Optional[float]:
-        """Calculate rolling volatility using log returns."""
-        prices = list(self._mid_prices[symbol])
-        if len(prices) < self.volatility_window:
-            return None
-
-        recent_prices = prices[-self.volatility_window:]
-        returns = np.diff(np.log(recent_prices))
-
-        if len(returns) == 0:
-            return None
-
-        return float(np.std(returns) * np.sqrt(252 * 24 * 60))  # Annualized
-
-    def _calculate_momentum(self, symbol: str) -> Optional[float]:
-        """Calculate price momentum."""
-        prices = list(self._mid_prices[symbol])
-        if len(prices) < self.momentum_window:
-            return None
-
-        recent_prices = prices[-self.momentum_window:]
-        if recent_prices[0] == 0:
-            return None
-
-        return (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
-
-    def _calculate_imbalance_momentum(self, symbol: str) -> Optional[float]:
-        """Calculate momentum of imbalance."""
-        imbalances = list(self._imbalances[symbol])
-        if len(imbalances) < self.momentum_window:
-            return None
+    def _update_statistics(
+        self,
+        symbol: str,
+        return_std: float,
+        window_vol_std: float,
+        imbalance_mean: float,
+        imbalance_std: float,
+    ) -> None:
+        """Update rolling statistics for normalization (NaN inputs are skipped)."""
+        if not math.isnan(imbalance_mean):
+            self._imbalance_mean[symbol] = imbalance_mean
+            self._imbalance_std[symbol] = max(imbalance_std, 0.001)
 
-        recent = imbalances[-self.momentum_window:]
-        # Simple linear regression slope
-        x = np.arange(len(recent))
-        y = np.array(recent)
-
-        if np.std(x) == 0 or np.std(y) == 0:
-            return 0.0
-
-        correlation = np.corrcoef(x, y)[0, 1]
-        slope = correlation * np.std(y) / np.std(x)
-
-        return float(slope)
-
-    def _update_statistics(self, symbol: str) -> None:
-        """Update rolling statistics for normalization."""
-        imbalances = list(self._imbalances[symbol])
-        if len(imbalances) >= 20:
-            self._imbalance_mean[symbol] = float(np.mean(imbalances))
-            self._imbalance_std[symbol] = max(float(np.std(imbalances)), 0.001)
-
-        prices = list(self._mid_prices[symbol])
-        if len(prices) >= self.volatility_window:
-            returns = np.diff(np.log(prices[-self.volatility_window:]))
-            if len(returns) > 0:
-                vol = float(np.std(returns))
-                if vol > 0:
-                    self._volatility_mean[symbol] = vol
-                    # Use a longer window for std of vol
-                    all_returns = np.diff(np.log(prices))
-                    if len(all_returns) >= self.volatility_window:
-                        window_vols = [
-                            np.std(all_returns[i:i+self.volatility_window])
-                            for i in range(len(all_returns) - self.volatility_window + 1)
-                        ]
-                        self._volatility_std[symbol] = max(float(np.std(window_vols)), 0.0001)
+        if return_std > 0:
+            self._volatility_mean[symbol] = return_std
+            if not math.isnan(window_vol_std):
+                self._volatility_std[symbol] = max(window_vol_std, 0.0001)
 
     def _normalize_imbalance(self, symbol: str, imbalance: Optional[float]) -> Optional[float]:
         """Normalize imbalance to z-score."""
@@ -242,19 +319,12 @@ class MicrostructureFeatures:
 
     def get_atr(self, symbol: str, period: int = 14) -> Optional[float]:
         """Calculate Average True Range (simplified using mid prices)."""
-        prices = list(self._mid_prices[symbol])
+        prices = self._mid_prices[symbol]
         if len(prices) < period + 1:
             return None
 
-        true_ranges = []
-        for i in range(1, len(prices)):
-            tr = abs(prices[i] - prices[i-1])
-            true_ranges.append(tr)
-
-        if len(true_ranges) < period:
-            return None
-
-        return float(np.mean(true_ranges[-period:]))
+        true_ranges = np.abs(np.diff(prices.window(period + 1)))
+        return float(np.mean(true_ranges))
 
     def reset(self, symbol: Optional[str] = None) -> None:
         """Reset feature state for a symbol or all symbols."""
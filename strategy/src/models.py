@@ -1,10 +1,12 @@
 """Data models for the strategy engine."""
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 
@@ -32,14 +34,19 @@ class OrderStatus(str, Enum):
     REJECTED = "rejected"
 
 
-class PriceLevel(BaseModel):
+# The order book models are built on every market data tick, so they are
+# plain slotted dataclasses rather than pydantic models: no per-field
+# validation, and callers are expected to pass Decimals.
+@dataclass(slots=True)
+class PriceLevel:
     """A price level in the order book."""
 
     price: Decimal
     quantity: Decimal
 
 
-class OrderBookState(BaseModel):
+@dataclass(slots=True)
+class OrderBookState:
     """Order book state from market data."""
 
     symbol: str
@@ -52,6 +59,62 @@ class OrderBookState(BaseModel):
     imbalance: Optional[Decimal] = None
     weighted_imbalance: Optional[Decimal] = None
 
+    # Parallel float64 views of each side plus their best price and total
+    # volume, built once per snapshot for the numeric consumers (execution
+    # simulation) instead of walking PriceLevels. Keyed on the list object so
+    # copies with replaced levels rebuild them.
+    _level_cache: dict[str, tuple] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @property
+    def bid_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Bid (prices, quantities) as float64 arrays."""
+        return self._side_cache("bids")[1]
+
+    @property
+    def ask_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Ask (prices, quantities) as float64 arrays."""
+        return self._side_cache("asks")[1]
+
+    @property
+    def best_bid_f(self) -> Optional[float]:
+        """Best bid price as a float, None when there are no bids."""
+        return self._side_cache("bids")[2]
+
+    @property
+    def best_ask_f(self) -> Optional[float]:
+        """Best ask price as a float, None when there are no asks."""
+        return self._side_cache("asks")[2]
+
+    @property
+    def total_bid_volume_f(self) -> float:
+        """Total visible bid quantity."""
+        return self._side_cache("bids")[3]
+
+    @property
+    def total_ask_volume_f(self) -> float:
+        """Total visible ask quantity."""
+        return self._side_cache("asks")[3]
+
+    def _side_cache(self, side: str) -> tuple:
+        levels = getattr(self, side)
+        cached = self._level_cache.get(side)
+        if cached is None or cached[0] is not levels:
+            prices, quantities = _level_arrays(levels)
+            best = float(prices[0]) if prices.size else None
+            cached = (levels, (prices, quantities), best, float(quantities.sum()))
+            self._level_cache[side] = cached
+        return cached
+
+
+def _level_arrays(levels: list[PriceLevel]) -> tuple[np.ndarray, np.ndarray]:
+    """Split price levels into parallel float64 price and quantity arrays."""
+    n = len(levels)
+    prices = np.fromiter((float(level.price) for level in levels), dtype=np.float64, count=n)
+    quantities = np.fromiter((float(level.quantity) for level in levels), dtype=np.float64, count=n)
+    return prices, quantities
+
 
 class Signal(BaseModel):
     """Trading signal from strategy."""
@@ -9,19 +9,84 @@ Records all system events in a structured format that allows:
 import gzip
 import json
 import os
+import threading
 import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Iterator, IO, Union
+from typing import Optional, Dict, Any, Deque, List, Iterator, IO, Literal, Set, Tuple, Union
 import asyncio
+from collections import deque
 
+import msgpack
 import structlog
+import zstandard
 
 logger = structlog.get_logger()
 
+# msgpack extension type codes for values msgpack has no native type for
+_EXT_DECIMAL = 1
+_EXT_DATETIME = 2
+
+
+def _encode_ext(value: Any) -> msgpack.ExtType:
+    """Encode Decimal and datetime values as msgpack extension types."""
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    raise TypeError(f"Cannot serialize {type(value).__name__} to replay log")
+
+
+def _decode_ext(code: int, payload: bytes) -> Any:
+    """Restore Decimal and datetime values from msgpack extension types."""
+    if code == _EXT_DECIMAL:
+        return Decimal(payload.decode())
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(payload.decode())
+    return msgpack.ExtType(code, payload)
+
+
+_packer = msgpack.Packer(default=_encode_ext)
+
+
+def _open_log(path: Path) -> Union[gzip.GzipFile, IO[bytes]]:
+    """Open a msgpack replay log for reading, decompressing by suffix."""
+    if path.suffix == ".zst":
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+# A batch buffer that grew past this is dropped after the write instead
+# of being kept around for reuse
+_WRITE_BUF_SOFT_MAX = 1024 * 1024
+
+# Most buffers one writev() call accepts
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") else 1024
+
+
+def _writev_all(fd: int, frames: List[Union[bytes, memoryview]]) -> None:
+    """Write every frame to ``fd`` with scatter-gather writes.
+
+    Each writev() call takes up to IOV_MAX frames; after a short write the
+    frames already written are dropped and writing resumes mid-frame.
+    """
+    pending: Deque[Union[bytes, memoryview]] = deque(frames)
+    while pending:
+        batch = [pending.popleft() for _ in range(min(len(pending), _IOV_MAX))]
+        written = os.writev(fd, batch)
+        for i, frame in enumerate(batch):
+            if written < len(frame):
+                # Requeue the unwritten part of this frame and everything after it
+                pending.extendleft(reversed(batch[i + 1:]))
+                pending.appendleft(memoryview(frame)[written:])
+                break
+            written -= len(frame)
+
 
 class EventType(Enum):
     """Types of events that can be recorded."""
@@ -55,9 +120,17 @@ class EventType(Enum):
     ERROR = "error"
 
 
-@dataclass
+# Wire value per event type, so record() skips the Enum descriptor lookup
+_EVENT_VALUES: Dict[EventType, str] = {e: e.value for e in EventType}
+
+
+@dataclass(slots=True)
 class ReplayEvent:
-    """A single event in the replay log."""
+    """A single event in the replay log.
+
+    Events are stored as msgpack arrays of ``[ts, type, seq, sid, data]``;
+    older ``.jsonl`` logs are read through ``from_dict``.
+    """
 
     timestamp: int  # Unix timestamp in microseconds
     event_type: str
@@ -67,41 +140,29 @@ class ReplayEvent:
     sequence_number: int = 0
     session_id: str = ""
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "ts": self.timestamp,
-            "type": self.event_type,
-            "seq": self.sequence_number,
-            "sid": self.session_id,
-            "data": self._serialize_data(self.data),
-        }
+    def as_record(self) -> tuple:
+        """Return the ``(ts, type, seq, sid, data)`` record to serialize."""
+        return (
+            self.timestamp,
+            self.event_type,
+            self.sequence_number,
+            self.session_id,
+            self.data,
+        )
 
-    @staticmethod
-    def _serialize_data(data: Dict[str, Any]) -> Dict[str, Any]:
-        """Serialize data, handling Decimal and datetime."""
-        result: Dict[str, Any] = {}
-        for key, value in data.items():
-            if isinstance(value, Decimal):
-                result[key] = {"__decimal__": str(value)}
-            elif isinstance(value, datetime):
-                result[key] = {"__datetime__": value.isoformat()}
-            elif isinstance(value, dict):
-                result[key] = ReplayEvent._serialize_data(value)
-            elif isinstance(value, list):
-                result[key] = [
-                    ReplayEvent._serialize_data(v) if isinstance(v, dict)
-                    else {"__decimal__": str(v)} if isinstance(v, Decimal)
-                    else v
-                    for v in value
-                ]
-            else:
-                result[key] = value
-        return result
+    def pack(self) -> bytes:
+        """Serialize to a msgpack record."""
+        return _packer.pack(self.as_record())
+
+    @classmethod
+    def from_record(cls, record: list) -> "ReplayEvent":
+        """Create from a decoded msgpack record."""
+        timestamp, event_type, sequence_number, session_id, data = record
+        return cls(timestamp, event_type, data, sequence_number, session_id)
 
     @classmethod
     def from_dict(cls, data: dict) -> "ReplayEvent":
-        """Create from dictionary."""
+        """Create from a legacy JSON log dictionary."""
         return cls(
             timestamp=data["ts"],
             event_type=data["type"],
@@ -143,30 +204,40 @@ class ReplayLogger:
         compress: bool = True,
         buffer_size: int = 1000,
         flush_interval_seconds: int = 5,
+        compresslevel: int = 1,
+        compressor: Literal["zstd", "gzip"] = "zstd",
     ):
         """Initialize replay logger.
 
         Args:
             log_dir: Directory to store replay logs
             max_file_size_mb: Max size before rotating
-            compress: Whether to gzip log files
+            compress: Whether to compress log files
             buffer_size: Events to buffer before writing
             flush_interval_seconds: How often to flush buffer
+            compresslevel: Compression level (1 = fastest)
+            compressor: Codec for compressed logs; zstd compresses faster
+                and smaller than gzip at level 1
         """
         self.log_dir = Path(log_dir)
         self.max_file_size = max_file_size_mb * 1024 * 1024
         self.compress = compress
+        self.compresslevel = compresslevel
+        self.compressor = compressor
         self.buffer_size = buffer_size
         self.flush_interval = flush_interval_seconds
 
         self.session_id = f"session_{int(time.time() * 1000)}"
         self._sequence = 0
-        self._buffer: List[ReplayEvent] = []
+        self._buffer: Deque[ReplayEvent] = deque()
         self._current_file: Optional[Path] = None
-        self._file_handle: Optional[IO[str]] = None
+        self._file_handle: Optional[Union[gzip.GzipFile, IO[bytes]]] = None  # compressor stream
+        self._fd: Optional[int] = None  # raw append-only fd when uncompressed
         self._running = False
-        self._flush_task: Optional[asyncio.Task] = None
-        self._lock = asyncio.Lock()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        # Owned by the writer thread; reset, not reallocated, between flushes
+        self._write_packer = msgpack.Packer(default=_encode_ext, autoreset=False)
 
         # Ensure directory exists
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -175,7 +246,10 @@ class ReplayLogger:
         """Start the replay logger."""
         self._running = True
         self._rotate_file()
-        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="replay-writer", daemon=True
+        )
+        self._writer_thread.start()
 
         # Record session start
         await self.record(
@@ -201,19 +275,12 @@ class ReplayLogger:
         )
 
         self._running = False
+        self._wake.set()
 
-        if self._flush_task:
-            self._flush_task.cancel()
-            try:
-                await self._flush_task
-            except asyncio.CancelledError:
-                pass
-
-        # Final flush
-        await self._flush()
-
-        if self._file_handle:
-            self._file_handle.close()
+        # The writer drains the buffer and closes the file on its way out
+        if self._writer_thread:
+            await asyncio.to_thread(self._writer_thread.join)
+            self._writer_thread = None
 
         logger.info("replay_logger_stopped")
 
@@ -224,6 +291,11 @@ class ReplayLogger:
     ) -> None:
         """Record an event.
 
+        Only buffers the event; the writer thread does all encoding and
+        disk I/O, so this never blocks the event loop. The writer packs
+        later, on another thread, so ``data`` is shallow-copied here: the
+        caller may keep mutating its dict.
+
         Args:
             event_type: Type of event
             data: Event data
@@ -231,74 +303,140 @@ class ReplayLogger:
         self._sequence += 1
 
         event = ReplayEvent(
-            timestamp=int(time.time() * 1_000_000),  # Microseconds
-            event_type=event_type.value,
-            data=data,
-            sequence_number=self._sequence,
-            session_id=self.session_id,
+            time.time_ns() // 1000,  # Microseconds
+            _EVENT_VALUES[event_type],
+            dict(data),
+            self._sequence,
+            self.session_id,
         )
 
-        async with self._lock:
-            self._buffer.append(event)
+        self._buffer.append(event)
 
-            if len(self._buffer) >= self.buffer_size:
-                await self._flush()
+        if len(self._buffer) >= self.buffer_size:
+            self._wake.set()
 
-    async def _flush_loop(self) -> None:
-        """Background loop to periodically flush buffer."""
+    def _writer_loop(self) -> None:
+        """Writer thread: flush every interval, or sooner once the buffer fills."""
         while self._running:
-            try:
-                await asyncio.sleep(self.flush_interval)
-                await self._flush()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error("replay_flush_error", error=str(e))
-
-    async def _flush(self) -> None:
-        """Flush buffer to disk."""
-        async with self._lock:
-            if not self._buffer:
-                return
-
-            events_to_write = self._buffer
-            self._buffer = []
-
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+
+        self._flush()
+        self._close_file()
+
+    def _flush(self) -> None:
+        """Flush buffer to disk. Runs on the writer thread."""
+        # popleft() is atomic, so record() can keep appending meanwhile
+        events_to_write: List[ReplayEvent] = []
+        while self._buffer:
+            events_to_write.append(self._buffer.popleft())
+        if not events_to_write:
+            return
+
+        packer = self._write_packer
+        oversized = False
         try:
             # Check file size and rotate if needed
             if self._current_file and self._current_file.exists():
                 if self._current_file.stat().st_size > self.max_file_size:
                     self._rotate_file()
 
-            # Write events
-            if self._file_handle is not None:
+            # Pack the whole batch into the writer's reusable buffer
+            try:
                 for event in events_to_write:
-                    line = json.dumps(event.to_dict()) + "\n"
-                    self._file_handle.write(line)
-
-                self._file_handle.flush()
+                    packer.pack(event.as_record())
+            except (TypeError, ValueError, OverflowError):
+                # An unencodable event would fail every retry, so repack
+                # without it rather than re-queueing the batch
+                packer.reset()
+                events_to_write = self._pack_encodable(packer, events_to_write)
+
+            with packer.getbuffer() as batch:
+                oversized = len(batch) > _WRITE_BUF_SOFT_MAX
+                if self._fd is not None:
+                    _writev_all(self._fd, [batch])
+                elif self._file_handle is not None:
+                    self._file_handle.write(batch)
+                    self._file_handle.flush()
 
         except Exception as e:
             logger.error("replay_write_error", error=str(e))
-            # Re-add events to buffer on error
-            async with self._lock:
-                self._buffer = events_to_write + self._buffer
+            # Re-add events to the front of the buffer on error
+            self._buffer.extendleft(reversed(events_to_write))
 
-    def _rotate_file(self) -> None:
-        """Rotate to a new log file."""
+        # Discard the packed batch, keeping its allocation unless it ballooned
+        if oversized:
+            self._write_packer = msgpack.Packer(default=_encode_ext, autoreset=False)
+        else:
+            packer.reset()
+
+    @staticmethod
+    def _pack_encodable(
+        packer: msgpack.Packer, events: List[ReplayEvent]
+    ) -> List[ReplayEvent]:
+        """Pack the events msgpack can encode into ``packer``, dropping the rest.
+
+        Returns:
+            The events that were packed
+        """
+        # A failed pack may leave partial bytes behind, so each event is
+        # trial-packed on a scratch packer first
+        scratch = msgpack.Packer(default=_encode_ext)
+        packed = []
+        for event in events:
+            record = event.as_record()
+            try:
+                scratch.pack(record)
+            except (TypeError, ValueError, OverflowError) as e:
+                logger.error(
+                    "replay_event_dropped",
+                    event_type=event.event_type,
+                    sequence=event.sequence_number,
+                    error=str(e),
+                )
+                continue
+            packer.pack(record)
+            packed.append(event)
+        return packed
+
+    def _close_file(self) -> None:
+        """Close the current log file, if any."""
         if self._file_handle:
             self._file_handle.close()
+            self._file_handle = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _rotate_file(self) -> None:
+        """Rotate to a new log file."""
+        self._close_file()
 
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"replay_{self.session_id}_{timestamp}.jsonl"
+        filename = f"replay_{self.session_id}_{timestamp}.msgpack"
 
-        if self.compress:
+        if self.compress and self.compressor == "zstd":
+            filename += ".zst"
+            self._current_file = self.log_dir / filename
+            # flush() on the stream writer ends a zstd block, so everything
+            # flushed so far stays readable while the file is still open
+            self._file_handle = zstandard.ZstdCompressor(
+                level=self.compresslevel
+            ).stream_writer(open(self._current_file, "wb"))
+        elif self.compress:
             filename += ".gz"
             self._current_file = self.log_dir / filename
-            self._file_handle = gzip.open(self._current_file, "wt", encoding="utf-8")
+            self._file_handle = gzip.open(
+                self._current_file, "wb", compresslevel=self.compresslevel
+            )
         else:
             self._current_file = self.log_dir / filename
-            self._file_handle = open(self._current_file, "w", encoding="utf-8")
+            self._fd = os.open(
+                self._current_file,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC,
+                0o644,
+            )
 
         logger.debug("replay_file_rotated", path=str(self._current_file))
 
@@ -314,15 +452,15 @@ class ReplayReader:
         """List available replay sessions."""
         sessions = []
 
-        for path in self.log_dir.glob("replay_session_*.jsonl*"):
-            parts = path.stem.replace(".jsonl", "").split("_")
+        for path in self.log_dir.glob("replay_session_*"):
+            parts = path.name.split(".", 1)[0].split("_")
             if len(parts) >= 3:
                 sessions.append({
                     "session_id": f"session_{parts[1]}",
                     "timestamp": parts[2] if len(parts) > 2 else None,
                     "path": str(path),
                     "size_mb": path.stat().st_size / (1024 * 1024),
-                    "compressed": path.suffix == ".gz",
+                    "compressed": path.suffix in (".gz", ".zst"),
                 })
 
         return sorted(sessions, key=lambda x: x["timestamp"] or "", reverse=True)
@@ -350,30 +488,104 @@ class ReplayReader:
         end_ts = int(end_time.timestamp() * 1_000_000) if end_time else None
 
         # Find all files for this session
-        pattern = f"replay_{session_id}_*.jsonl*"
+        pattern = f"replay_{session_id}_*"
         files = sorted(self.log_dir.glob(pattern))
 
         for file_path in files:
-            opener = gzip.open if file_path.suffix == ".gz" else open
+            yield from self._read_file(file_path, type_filter, start_ts, end_ts)
 
-            with opener(file_path, "rt", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        data = json.loads(line)
-                        event = ReplayEvent.from_dict(data)
+    def _read_file(
+        self,
+        file_path: Path,
+        type_filter: Optional[Set[str]] = None,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+    ) -> Iterator[ReplayEvent]:
+        """Read the events in one log file that pass the filters.
 
-                        # Apply filters
-                        if type_filter and event.event_type not in type_filter:
-                            continue
-                        if start_ts and event.timestamp < start_ts:
-                            continue
-                        if end_ts and event.timestamp > end_ts:
-                            continue
+        The timestamp and type are checked before the rest of the record
+        is decoded, so filtered-out events never have their data parsed.
+        """
 
-                        yield event
+        def wanted(timestamp: int, event_type: str) -> bool:
+            if type_filter and event_type not in type_filter:
+                return False
+            if start_ts and timestamp < start_ts:
+                return False
+            if end_ts and timestamp > end_ts:
+                return False
+            return True
 
+        if ".jsonl" in file_path.suffixes:
+            opener = gzip.open if file_path.suffix == ".gz" else open
+            with opener(file_path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
                     except json.JSONDecodeError:
                         continue
+                    if wanted(record["ts"], record["type"]):
+                        yield ReplayEvent.from_dict(record)
+            return
+
+        with _open_log(file_path) as stream:
+            unpacker = msgpack.Unpacker(stream, ext_hook=_decode_ext, strict_map_key=False)
+            try:
+                while True:
+                    try:
+                        n_fields = unpacker.read_array_header()
+                    except msgpack.OutOfData:
+                        break
+                    timestamp = unpacker.unpack()
+                    event_type = unpacker.unpack()
+                    if not wanted(timestamp, event_type):
+                        for _ in range(n_fields - 2):
+                            unpacker.skip()
+                        continue
+
+                    sequence_number = unpacker.unpack()
+                    session_id = unpacker.unpack()
+                    data = unpacker.unpack()
+                    for _ in range(n_fields - 5):
+                        unpacker.skip()
+                    yield ReplayEvent(timestamp, event_type, data, sequence_number, session_id)
+            except (msgpack.UnpackException, ValueError) as e:
+                # A corrupt record desynchronizes the stream; keep what was read
+                logger.warning("replay_file_corrupt", path=str(file_path), error=str(e))
+
+    def _iter_header_only(self, session_id: str) -> Iterator[Tuple[int, str]]:
+        """Yield ``(timestamp, event_type)`` for every event in a session.
+
+        The remaining record fields, including the data payload, are
+        skipped without being decoded.
+        """
+        for file_path in sorted(self.log_dir.glob(f"replay_{session_id}_*")):
+            if ".jsonl" in file_path.suffixes:
+                opener = gzip.open if file_path.suffix == ".gz" else open
+                with opener(file_path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        yield record["ts"], record["type"]
+                continue
+
+            with _open_log(file_path) as f:
+                unpacker = msgpack.Unpacker(f, strict_map_key=False)
+                try:
+                    while True:
+                        try:
+                            n_fields = unpacker.read_array_header()
+                        except msgpack.OutOfData:
+                            break
+                        timestamp = unpacker.unpack()
+                        event_type = unpacker.unpack()
+                        for _ in range(n_fields - 2):
+                            unpacker.skip()
+                        yield timestamp, event_type
+                except (msgpack.UnpackException, ValueError) as e:
+                    logger.warning("replay_file_corrupt", path=str(file_path), error=str(e))
 
     def get_session_summary(self, session_id: str) -> dict:
         """Get summary statistics for a session."""
@@ -382,14 +594,14 @@ class ReplayReader:
         last_event: Optional[int] = None
         total_events = 0
 
-        for event in self.read_session(session_id):
+        for timestamp, event_type in self._iter_header_only(session_id):
             total_events += 1
-            event_counts[event.event_type] = event_counts.get(event.event_type, 0) + 1
+            event_counts[event_type] = event_counts.get(event_type, 0) + 1
 
-            if first_event is None or event.timestamp < first_event:
-                first_event = event.timestamp
-            if last_event is None or event.timestamp > last_event:
-                last_event = event.timestamp
+            if first_event is None or timestamp < first_event:
+                first_event = timestamp
+            if last_event is None or timestamp > last_event:
+                last_event = timestamp
 
         duration_seconds = (last_event - first_event) / 1_000_000 if first_event and last_event else 0
 
@@ -33,6 +33,14 @@ class SafetyViolation(Enum):
     CIRCUIT_BREAKER = "circuit_breaker"
 
 
+# Float checks against a limit within this relative distance fall back to
+# Decimal; far wider than any float rounding error in the inputs
+_FLOAT_LIMIT_GUARD = 1 - 1e-9
+
+# Log value per violation, so _record_violation skips the Enum descriptor lookup
+_VIOLATION_VALUES: dict[SafetyViolation, str] = {v: v.value for v in SafetyViolation}
+
+
 @dataclass
 class SafetyConfig:
     """Configuration for safety mechanisms."""
@@ -64,6 +72,23 @@ class SafetyConfig:
     # Valid symbols
     valid_symbols: Set[str] = field(default_factory=lambda: {"BTCUSDT", "ETHUSDT"})
 
+    # Float copies of the value limits for the per-order pre-filter
+    _min_price_f: float = field(init=False, repr=False)
+    _max_price_f: float = field(init=False, repr=False)
+    _min_quantity_f: float = field(init=False, repr=False)
+    _max_quantity_f: float = field(init=False, repr=False)
+    _max_notional_f: float = field(init=False, repr=False)
+    _max_position_value_f: float = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Precompute float bounds."""
+        self._min_price_f = float(self.min_price)
+        self._max_price_f = float(self.max_price)
+        self._min_quantity_f = float(self.min_quantity)
+        self._max_quantity_f = float(self.max_quantity)
+        self._max_notional_f = float(self.max_notional_per_order)
+        self._max_position_value_f = float(self.max_position_value)
+
 
 @dataclass
 class SafetyState:
@@ -84,7 +109,12 @@ class SafetyState:
 
 
 class RateLimiter:
-    """Token bucket rate limiter with multiple time windows."""
+    """Sliding-window rate limiter over several time windows.
+
+    Each window keeps its own deque of action timestamps, so expired entries
+    are popped from the front and the in-window count is just the deque's
+    length, instead of rescanning the full history on every check.
+    """
 
     def __init__(
         self,
@@ -98,23 +128,26 @@ class RateLimiter:
             "minute": (per_minute, 60),
             "hour": (per_hour, 3600),
         }
-        self.timestamps: deque = deque(maxlen=per_hour)
+        # (name, limit, window seconds, timestamps inside the window)
+        self._windows: list[tuple[str, int, int, deque]] = [
+            (name, limit, window, deque(maxlen=limit))
+            for name, (limit, window) in self.limits.items()
+        ]
 
-    def check(self) -> bool:
+    def check(self) -> tuple[bool, float]:
         """Check if action is allowed under rate limits.
 
         Returns:
-            True if allowed, False if rate limited
+            Tuple of (allowed, now); pass ``now`` to record() so an admitted
+            action does not read the clock twice
         """
         now = time.time()
 
-        # Clean old timestamps
-        while self.timestamps and now - self.timestamps[0] > 3600:
-            self.timestamps.popleft()
+        for name, limit, window, timestamps in self._windows:
+            while timestamps and now - timestamps[0] > window:
+                timestamps.popleft()
 
-        # Check each window
-        for name, (limit, window) in self.limits.items():
-            count = sum(1 for ts in self.timestamps if now - ts <= window)
+            count = len(timestamps)
             if count >= limit:
                 logger.warning(
                     "rate_limit_exceeded",
@@ -122,13 +155,20 @@ class RateLimiter:
                     limit=limit,
                     current=count,
                 )
-                return False
+                return False, now
 
-        return True
+        return True, now
 
-    def record(self) -> None:
-        """Record an action."""
-        self.timestamps.append(time.time())
+    def record(self, ts: Optional[float] = None) -> None:
+        """Record an action.
+
+        Args:
+            ts: Time of the action, usually the one returned by check()
+        """
+        if ts is None:
+            ts = time.time()
+        for _, _, _, timestamps in self._windows:
+            timestamps.append(ts)
 
 
 class SafetyGuard:
@@ -144,8 +184,30 @@ class SafetyGuard:
             per_hour=self.config.max_orders_per_hour,
         )
 
+        # Snapshot of the limits validate_order reads on every order
+        config = self.config
+        self._valid_symbols = frozenset(config.valid_symbols)
+        self._min_price_f = config._min_price_f
+        self._max_price_f = config._max_price_f
+        self._min_quantity_f = config._min_quantity_f
+        self._max_quantity_f = config._max_quantity_f
+        # Products and sums are rounded in float, so anything within this
+        # factor of a limit is rechecked in Decimal
+        self._max_notional_f = config._max_notional_f * _FLOAT_LIMIT_GUARD
+        self._max_position_value_f = config._max_position_value_f * _FLOAT_LIMIT_GUARD
+        self._price_change_threshold_pct = config.price_change_threshold_pct
+
         # Last known prices for anomaly detection
         self._last_prices: dict[str, Decimal] = {}
+        # Float copies so the per-order anomaly check avoids Decimal math
+        self._last_prices_float: dict[str, float] = {}
+
+        # Time of the last rate-limit check that admitted an order, reused
+        # by record_order
+        self._admitted_at: Optional[float] = None
+
+        # Set while an automatic kill switch activation is scheduled
+        self._kill_switch_pending = False
 
         # Callbacks for kill switch
         self._kill_switch_callbacks: list[Callable[[], Awaitable[None]]] = []
@@ -174,11 +236,14 @@ class SafetyGuard:
         )
 
         # Call all registered callbacks
-        for callback in self._kill_switch_callbacks:
-            try:
-                await callback()
-            except Exception as e:
-                logger.error("kill_switch_callback_failed", error=str(e))
+        try:
+            for callback in self._kill_switch_callbacks:
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.error("kill_switch_callback_failed", error=str(e))
+        finally:
+            self._kill_switch_pending = False
 
     def deactivate_kill_switch(self) -> None:
         """Deactivate the kill switch."""
@@ -205,8 +270,10 @@ class SafetyGuard:
         if self.state.circuit_breaker_active:
             return False, SafetyViolation.CIRCUIT_BREAKER, self.state.circuit_breaker_reason
 
-        if not self.rate_limiter.check():
+        allowed, now = self.rate_limiter.check()
+        if not allowed:
             return False, SafetyViolation.RATE_LIMIT, "Rate limit exceeded"
+        self._admitted_at = now
 
         return True, None, None
 
@@ -234,62 +301,74 @@ class SafetyGuard:
             return False, violation, reason
 
         # Validate symbol
-        if symbol not in self.config.valid_symbols:
+        if symbol not in self._valid_symbols:
             self._record_violation(SafetyViolation.INVALID_SYMBOL)
             return False, SafetyViolation.INVALID_SYMBOL, f"Invalid symbol: {symbol}"
 
+        # All checks run in float first. Float conversion is monotonic, so a
+        # value strictly inside the float bounds is inside the Decimal bounds
+        # too; only values at or past a bound take the exact Decimal path.
+        price_f = float(price)
+        quantity_f = float(quantity)
+        notional_f = price_f * quantity_f
+
         # Validate price
-        if price < self.config.min_price:
-            self._record_violation(SafetyViolation.INVALID_PRICE)
-            return False, SafetyViolation.INVALID_PRICE, f"Price too low: {price}"
+        if not self._min_price_f < price_f < self._max_price_f:
+            if price < self.config.min_price:
+                self._record_violation(SafetyViolation.INVALID_PRICE)
+                return False, SafetyViolation.INVALID_PRICE, f"Price too low: {price}"
 
-        if price > self.config.max_price:
-            self._record_violation(SafetyViolation.INVALID_PRICE)
-            return False, SafetyViolation.INVALID_PRICE, f"Price too high: {price}"
+            if price > self.config.max_price:
+                self._record_violation(SafetyViolation.INVALID_PRICE)
+                return False, SafetyViolation.INVALID_PRICE, f"Price too high: {price}"
 
         # Check for price anomaly
-        if symbol in self._last_prices:
-            last_price = self._last_prices[symbol]
-            if last_price > 0:
-                change_pct = abs(float((price - last_price) / last_price * 100))
-                if change_pct > self.config.price_change_threshold_pct:
-                    logger.warning(
-                        "price_anomaly_detected",
-                        symbol=symbol,
-                        last_price=str(last_price),
-                        current_price=str(price),
-                        change_pct=change_pct,
-                    )
-                    self._record_violation(SafetyViolation.ANOMALY_DETECTED)
-                    return False, SafetyViolation.ANOMALY_DETECTED, f"Price change too large: {change_pct:.1f}%"
+        last_price_f = self._last_prices_float.get(symbol)
+        if last_price_f is not None and last_price_f > 0:
+            change_pct = abs((price_f - last_price_f) / last_price_f) * 100.0
+            if change_pct > self._price_change_threshold_pct:
+                logger.warning(
+                    "price_anomaly_detected",
+                    symbol=symbol,
+                    last_price=str(self._last_prices[symbol]),
+                    current_price=str(price),
+                    change_pct=change_pct,
+                )
+                self._record_violation(SafetyViolation.ANOMALY_DETECTED)
+                return False, SafetyViolation.ANOMALY_DETECTED, f"Price change too large: {change_pct:.1f}%"
 
         # Validate quantity
-        if quantity < self.config.min_quantity:
-            self._record_violation(SafetyViolation.INVALID_QUANTITY)
-            return False, SafetyViolation.INVALID_QUANTITY, f"Quantity too small: {quantity}"
+        if not self._min_quantity_f < quantity_f < self._max_quantity_f:
+            if quantity < self.config.min_quantity:
+                self._record_violation(SafetyViolation.INVALID_QUANTITY)
+                return False, SafetyViolation.INVALID_QUANTITY, f"Quantity too small: {quantity}"
 
-        if quantity > self.config.max_quantity:
-            self._record_violation(SafetyViolation.INVALID_QUANTITY)
-            return False, SafetyViolation.INVALID_QUANTITY, f"Quantity too large: {quantity}"
+            if quantity > self.config.max_quantity:
+                self._record_violation(SafetyViolation.INVALID_QUANTITY)
+                return False, SafetyViolation.INVALID_QUANTITY, f"Quantity too large: {quantity}"
 
         # Validate notional
-        notional = price * quantity
-        if notional > self.config.max_notional_per_order:
-            self._record_violation(SafetyViolation.INVALID_QUANTITY)
-            return False, SafetyViolation.INVALID_QUANTITY, f"Notional too large: {notional}"
+        if notional_f >= self._max_notional_f:
+            notional = price * quantity
+            if notional > self.config.max_notional_per_order:
+                self._record_violation(SafetyViolation.INVALID_QUANTITY)
+                return False, SafetyViolation.INVALID_QUANTITY, f"Notional too large: {notional}"
 
         # Validate position limits
-        new_position_value = current_position_value + notional
-        if new_position_value > self.config.max_position_value:
-            self._record_violation(SafetyViolation.POSITION_LIMIT)
-            return False, SafetyViolation.POSITION_LIMIT, f"Position limit exceeded: {new_position_value}"
+        if float(current_position_value) + notional_f >= self._max_position_value_f:
+            new_position_value = current_position_value + price * quantity
+            if new_position_value > self.config.max_position_value:
+                self._record_violation(SafetyViolation.POSITION_LIMIT)
+                return False, SafetyViolation.POSITION_LIMIT, f"Position limit exceeded: {new_position_value}"
 
         return True, None, None
 
     def record_order(self, symbol: str, price: Decimal) -> None:
         """Record a successful order for rate limiting and price tracking."""
-        self.rate_limiter.record()
+        self.rate_limiter.record(self._admitted_at)
+        self._admitted_at = None
         self._last_prices[symbol] = price
+        self._last_prices_float[symbol] = float(price)
 
     def record_trade_result(self, pnl: Decimal) -> None:
         """Record a trade result for circuit breaker logic."""
@@ -332,12 +411,17 @@ class SafetyGuard:
 
         logger.warning(
             "safety_violation",
-            type=violation.value,
+            type=_VIOLATION_VALUES[violation],
             violations_today=self.state.violations_today,
         )
 
-        # Auto kill switch after too many violations
-        if self.state.violations_today >= 100:
+        # Auto kill switch after too many violations; schedule it only once
+        if (
+            self.state.violations_today >= 100
+            and not self._kill_switch_pending
+            and not self.state.kill_switch_active
+        ):
+            self._kill_switch_pending = True
             asyncio.create_task(
                 self.activate_kill_switch("Too many safety violations")
             )
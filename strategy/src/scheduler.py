@@ -4,16 +4,46 @@ Calculates sunset times and manages trading pauses from
 Friday sunset to Saturday sunset.
 """
 
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Optional
+from zoneinfo import ZoneInfo
 
-import pytz
-from astral import LocationInfo
+from astral import LocationInfo, Observer
 from astral.sun import sun
 import structlog
 
 logger = structlog.get_logger()
 
+# Dates whose (pause, resume) bounds a scheduler keeps
+_BOUNDS_CACHE_SIZE = 8
+
+# How long get_schedule_info() serves a cached result for "now"
+SCHEDULE_INFO_TTL_SECONDS = 1.0
+
+
+@lru_cache(maxsize=32)
+def _sun_cached(
+    observer: tuple[float, float, float],
+    day: date,
+    tz_key: str,
+) -> dict:
+    """Compute sun times for one day, memoized.
+
+    Keyed on plain values rather than the Observer object, which hashes
+    by identity.
+
+    Args:
+        observer: (latitude, longitude, elevation)
+        day: Date to compute
+        tz_key: Timezone name
+
+    Returns:
+        astral sun times dict; shared between callers, so treat as read-only
+    """
+    return sun(Observer(*observer), date=day, tzinfo=ZoneInfo(tz_key))
+
 
 class ShabbatScheduler:
     """Scheduler for Shabbat trading pause.
@@ -44,7 +74,19 @@ class ShabbatScheduler:
             latitude=latitude,
             longitude=longitude,
         )
-        self.tz = pytz.timezone(timezone)
+        self.tz = ZoneInfo(timezone)
+        self._observer_key = (
+            self.location.observer.latitude,
+            self.location.observer.longitude,
+            self.location.observer.elevation,
+        )
+        self._tz_key = timezone
+        # (minute, tzinfo, result) of the last is_shabbat evaluation
+        self._is_shabbat_cache: Optional[tuple[datetime, object, bool]] = None
+        # Per-date (friday_sunset, saturday_sunset), oldest first
+        self._bounds: dict[date, tuple[datetime, datetime]] = {}
+        # (monotonic time, info) of the last get_schedule_info() for "now"
+        self._schedule_info_cache: Optional[tuple[float, dict]] = None
         self.buffer = timedelta(minutes=buffer_minutes)
 
         logger.info(
@@ -56,12 +98,10 @@ class ShabbatScheduler:
 
     def _get_sun_times(self, date: datetime) -> dict:
         """Get sun times for a specific date."""
-        return sun(self.location.observer, date=date.date(), tzinfo=self.tz)
+        return dict(_sun_cached(self._observer_key, date.date(), self._tz_key))
 
-    def _get_friday_sunset(self, reference: Optional[datetime] = None) -> datetime:
+    def _get_friday_sunset(self, now: datetime) -> datetime:
         """Get the sunset time for the current or next Friday."""
-        now = reference or datetime.now(self.tz)
-
         # Find the current or next Friday
         days_until_friday = (4 - now.weekday()) % 7
         if days_until_friday == 0 and now.hour >= 12:
@@ -70,20 +110,32 @@ class ShabbatScheduler:
         else:
             friday = now.date() + timedelta(days=days_until_friday)
 
-        sun_times = sun(self.location.observer, date=friday, tzinfo=self.tz)
+        sun_times = _sun_cached(self._observer_key, friday, self._tz_key)
         return sun_times["sunset"] - self.buffer
 
-    def _get_saturday_sunset(self, reference: Optional[datetime] = None) -> datetime:
+    def _get_saturday_sunset(self, now: datetime) -> datetime:
         """Get the sunset time for the current or next Saturday."""
-        now = reference or datetime.now(self.tz)
-
         # Find the current or next Saturday
         days_until_saturday = (5 - now.weekday()) % 7
         saturday = now.date() + timedelta(days=days_until_saturday)
 
-        sun_times = sun(self.location.observer, date=saturday, tzinfo=self.tz)
+        sun_times = _sun_cached(self._observer_key, saturday, self._tz_key)
         return sun_times["sunset"]
 
+    def _bounds_for(self, now: datetime) -> tuple[datetime, datetime]:
+        """Get (pause start, resume) for the Friday and Saturday at or after ``now``.
+
+        Both depend only on the date, so they are computed once per date.
+        """
+        day = now.date()
+        bounds = self._bounds.get(day)
+        if bounds is None:
+            bounds = (self._get_friday_sunset(now), self._get_saturday_sunset(now))
+            if len(self._bounds) >= _BOUNDS_CACHE_SIZE:
+                del self._bounds[next(iter(self._bounds))]
+            self._bounds[day] = bounds
+        return bounds
+
     def is_shabbat(self, reference: Optional[datetime] = None) -> bool:
         """Check if we are currently in the Shabbat pause period.
 
@@ -95,29 +147,41 @@ class ShabbatScheduler:
         """
         now = reference or datetime.now(self.tz)
 
-        # Get this week's Friday and Saturday sunsets
-        friday_sunset = self._get_friday_sunset(now)
-        saturday_sunset = self._get_saturday_sunset(now)
+        # The answer only flips at a sunset, so reuse it for the rest of the
+        # minute unless a sunset falls inside that minute
+        minute = now.replace(second=0, microsecond=0)
+        cached = self._is_shabbat_cache
+        if cached is not None and cached[0] == minute and cached[1] is now.tzinfo:
+            return cached[2]
 
         # Handle week transition
         if now.weekday() == 6:  # Sunday
             # Check if we're still in last week's Shabbat
             last_saturday = now - timedelta(days=1)
-            last_saturday_sunset = self._get_saturday_sunset(last_saturday - timedelta(days=6))
-            if now < last_saturday_sunset:
-                return True
-            return False
-
-        # Check if we're in the Shabbat window
-        is_in_shabbat = friday_sunset <= now <= saturday_sunset
-
-        if is_in_shabbat:
-            logger.debug(
-                "currently_in_shabbat",
-                now=now.isoformat(),
-                friday_sunset=friday_sunset.isoformat(),
-                saturday_sunset=saturday_sunset.isoformat(),
-            )
+            last_saturday_sunset = self._bounds_for(last_saturday - timedelta(days=6))[1]
+            is_in_shabbat = now < last_saturday_sunset
+            boundaries: tuple[datetime, ...] = (last_saturday_sunset,)
+        else:
+            # Get this week's Friday and Saturday sunsets
+            friday_sunset, saturday_sunset = self._bounds_for(now)
+
+            # Check if we're in the Shabbat window
+            is_in_shabbat = friday_sunset <= now <= saturday_sunset
+            boundaries = (friday_sunset, saturday_sunset)
+
+            if is_in_shabbat:
+                logger.debug(
+                    "currently_in_shabbat",
+                    now=now.isoformat(),
+                    friday_sunset=friday_sunset.isoformat(),
+                    saturday_sunset=saturday_sunset.isoformat(),
+                )
+
+        next_minute = minute + timedelta(minutes=1)
+        if any(minute <= boundary < next_minute for boundary in boundaries):
+            self._is_shabbat_cache = None
+        else:
+            self._is_shabbat_cache = (minute, now.tzinfo, is_in_shabbat)
 
         return is_in_shabbat
 
@@ -131,12 +195,12 @@ class ShabbatScheduler:
             Datetime of next pause start
         """
         now = reference or datetime.now(self.tz)
-        friday_sunset = self._get_friday_sunset(now)
+        friday_sunset = self._bounds_for(now)[0]
 
         if now >= friday_sunset:
             # Already past this Friday's sunset, get next Friday
             next_friday = now + timedelta(days=(7 - now.weekday() + 4) % 7 + 1)
-            return self._get_friday_sunset(next_friday)
+            return self._bounds_for(next_friday)[0]
 
         return friday_sunset
 
@@ -150,12 +214,12 @@ class ShabbatScheduler:
             Datetime of next resume time
         """
         now = reference or datetime.now(self.tz)
-        saturday_sunset = self._get_saturday_sunset(now)
+        saturday_sunset = self._bounds_for(now)[1]
 
         if now >= saturday_sunset:
             # Already past this Saturday's sunset, get next Saturday
             next_saturday = now + timedelta(days=(7 - now.weekday() + 5) % 7 + 1)
-            return self._get_saturday_sunset(next_saturday)
+            return self._bounds_for(next_saturday)[1]
 
         return saturday_sunset
 
@@ -190,19 +254,40 @@ class ShabbatScheduler:
     def get_schedule_info(self, reference: Optional[datetime] = None) -> dict:
         """Get detailed schedule information.
 
+        Without a reference the result is reused for up to
+        SCHEDULE_INFO_TTL_SECONDS, so status polling stays cheap.
+
         Args:
             reference: Reference time (defaults to now)
 
         Returns:
             Dictionary with schedule details
         """
+        if reference is None:
+            cached = self._schedule_info_cache
+            mono = time.monotonic()
+            if cached is not None and mono - cached[0] < SCHEDULE_INFO_TTL_SECONDS:
+                return dict(cached[1])
+
         now = reference or datetime.now(self.tz)
 
-        return {
+        # Resolve each piece once and derive next_event from them, rather
+        # than letting next_event/time_until_next_event recompute them
+        is_shabbat = self.is_shabbat(now)
+        next_pause = self.next_pause_time(now)
+        next_resume = self.next_resume_time(now)
+        next_event = next_resume if is_shabbat else next_pause
+
+        info = {
             "current_time": now.isoformat(),
-            "is_shabbat": self.is_shabbat(now),
-            "next_pause": self.next_pause_time(now).isoformat(),
-            "next_resume": self.next_resume_time(now).isoformat(),
-            "next_event": self.next_event(now).isoformat(),
-            "time_until_next_event": str(self.time_until_next_event(now)),
+            "is_shabbat": is_shabbat,
+            "next_pause": next_pause.isoformat(),
+            "next_resume": next_resume.isoformat(),
+            "next_event": next_event.isoformat(),
+            "time_until_next_event": str(next_event - now),
         }
+
+        if reference is None:
+            self._schedule_info_cache = (mono, info)
+            return dict(info)
+        return info
@@ -10,6 +10,7 @@ Ensures clean shutdown on SIGTERM/SIGINT:
 import asyncio
 import signal
 import sys
+import time
 from datetime import datetime
 from typing import Optional, Callable, Awaitable, List
 from dataclasses import dataclass, field
@@ -19,14 +20,20 @@ import structlog
 logger = structlog.get_logger()
 
 
-@dataclass
+@dataclass(slots=True)
 class ShutdownState:
     """State of the shutdown process."""
     shutdown_requested: bool = False
     shutdown_started_at: Optional[datetime] = None
-    pending_operations: int = 0
+    started_operations: int = 0
+    finished_operations: int = 0
     phase: str = "running"  # running, stopping, cleanup, terminated
 
+    @property
+    def pending_operations(self) -> int:
+        """Operations started but not yet finished."""
+        return self.started_operations - self.finished_operations
+
 
 class GracefulShutdown:
     """Manages graceful shutdown of the application."""
@@ -54,6 +61,13 @@ class GracefulShutdown:
         # Event for waiting on shutdown
         self._shutdown_event = asyncio.Event()
 
+        # Set whenever no operations are pending, so the drain can await it
+        self._pending_zero = asyncio.Event()
+        self._pending_zero.set()
+
+        # Monotonic start of shutdown, for durations immune to clock steps
+        self._started_monotonic: Optional[float] = None
+
     def register_pre_shutdown(self, callback: Callable[[], Awaitable[None]]) -> None:
         """Register a callback to run before shutdown starts.
 
@@ -105,6 +119,7 @@ class GracefulShutdown:
 
         self.state.shutdown_requested = True
         self.state.shutdown_started_at = datetime.utcnow()
+        self._started_monotonic = time.monotonic()
         self.state.phase = "stopping"
 
         logger.info(
@@ -131,7 +146,7 @@ class GracefulShutdown:
             self.state.phase = "terminated"
             logger.info(
                 "shutdown_complete",
-                duration_seconds=(datetime.utcnow() - self.state.shutdown_started_at).total_seconds(),
+                duration_seconds=time.monotonic() - self._started_monotonic,
             )
 
         except Exception as e:
@@ -146,25 +161,30 @@ class GracefulShutdown:
         phase_name: str,
         callbacks: List[Callable[[], Awaitable[None]]],
     ) -> None:
-        """Run callbacks for a shutdown phase."""
+        """Run callbacks for a shutdown phase.
+
+        Callbacks within a phase are independent, so they run concurrently
+        and the phase takes at most one timeout however many there are.
+        """
         logger.debug(f"shutdown_phase_{phase_name}_start", callbacks=len(callbacks))
 
-        for i, callback in enumerate(callbacks):
-            try:
-                await asyncio.wait_for(
-                    callback(),
-                    timeout=self.shutdown_timeout / 3,  # Give each phase 1/3 of total time
-                )
-            except asyncio.TimeoutError:
+        timeout = self.shutdown_timeout / 3  # Give each phase 1/3 of total time
+        results = await asyncio.gather(
+            *(asyncio.wait_for(callback(), timeout=timeout) for callback in callbacks),
+            return_exceptions=True,
+        )
+
+        for i, result in enumerate(results):
+            if isinstance(result, asyncio.TimeoutError):
                 logger.warning(
                     f"shutdown_{phase_name}_callback_timeout",
                     callback_index=i,
                 )
-            except Exception as e:
+            elif isinstance(result, Exception):
                 logger.error(
                     f"shutdown_{phase_name}_callback_error",
                     callback_index=i,
-                    error=str(e),
+                    error=str(result),
                 )
 
         logger.debug(f"shutdown_phase_{phase_name}_complete")
@@ -176,27 +196,28 @@ class GracefulShutdown:
             count=self.state.pending_operations,
         )
 
-        start = datetime.utcnow()
-        while self.state.pending_operations > 0:
-            elapsed = (datetime.utcnow() - start).total_seconds()
-            if elapsed > self.drain_timeout:
-                logger.warning(
-                    "drain_timeout_exceeded",
-                    remaining_operations=self.state.pending_operations,
-                )
-                break
-
-            await asyncio.sleep(0.1)
+        try:
+            await asyncio.wait_for(self._pending_zero.wait(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "drain_timeout_exceeded",
+                remaining_operations=self.state.pending_operations,
+            )
 
         logger.debug("drain_complete")
 
     def increment_pending(self) -> None:
         """Increment pending operations counter."""
-        self.state.pending_operations += 1
+        self.state.started_operations += 1
+        self._pending_zero.clear()
 
     def decrement_pending(self) -> None:
         """Decrement pending operations counter."""
-        self.state.pending_operations = max(0, self.state.pending_operations - 1)
+        state = self.state
+        if state.finished_operations < state.started_operations:
+            state.finished_operations += 1
+        if state.finished_operations == state.started_operations:
+            self._pending_zero.set()
 
     def is_shutting_down(self) -> bool:
         """Check if shutdown has been requested."""
@@ -223,6 +244,8 @@ class GracefulShutdown:
 class ShutdownContext:
     """Context manager for tracking pending operations."""
 
+    __slots__ = ("shutdown_manager",)
+
     def __init__(self, shutdown_manager: GracefulShutdown):
         self.shutdown_manager = shutdown_manager
 
@@ -0,0 +1,161 @@
+"""Compiled kernels for the imbalance strategy's numeric core.
+
+Everything after the per-symbol streak bookkeeping is plain float math:
+the threshold and persistence filters, confidence, the momentum checks
+and position sizing. The kernels take primitives (NaN for a missing
+feature) and report which filter, if any, rejected the tick, so the
+Python side only builds the Signal and the debug logs. No fastmath:
+results must match the interpreted arithmetic bit for bit.
+"""
+
+import numpy as np
+from numba import njit
+
+# Outcome codes returned by evaluate_core
+PASSED = 0
+BELOW_THRESHOLD = 1
+NOT_PERSISTENT = 2
+CONFIDENCE_TOO_LOW = 3
+MOMENTUM_NOT_CONFIRMED = 4
+IMBALANCE_MOMENTUM_DIVERGING = 5
+ZERO_SIZE = 6
+
+
+@njit(cache=True)
+def evaluate_core(
+    imbalance: float,
+    weighted_imbalance: float,
+    streak: int,
+    volatility_z: float,
+    momentum: float,
+    imbalance_momentum: float,
+    mid_price: float,
+    balance: float,
+    position_sign: int,
+    params: tuple,
+) -> tuple:
+    """Run the filters, confidence and sizing for one tick.
+
+    Args:
+        imbalance: Order book imbalance (must not be NaN)
+        weighted_imbalance: Depth-weighted imbalance, NaN if unknown
+        streak: Persistence streak including this tick
+        volatility_z: Volatility z-score, NaN if unknown
+        momentum: Price momentum, NaN if unknown
+        imbalance_momentum: Imbalance slope, NaN if unknown
+        mid_price: Mid price, NaN if unknown
+        balance: Account balance
+        position_sign: Sign of the current position (0 for none)
+        params: Tuple of (imbalance_threshold, persistence_required,
+            min_confidence, require_momentum_confirm, momentum_threshold,
+            vol_threshold_low, vol_threshold_high, low_vol_multiplier,
+            high_vol_multiplier, base_position_pct)
+
+    Returns:
+        Tuple of (outcome code, confidence, unrounded quantity)
+    """
+    (
+        imbalance_threshold,
+        persistence_required,
+        min_confidence,
+        require_momentum_confirm,
+        momentum_threshold,
+        vol_low,
+        vol_high,
+        low_vol_multiplier,
+        high_vol_multiplier,
+        base_position_pct,
+    ) = params
+
+    sign = 1 if imbalance > 0 else -1
+
+    if abs(imbalance) < imbalance_threshold:
+        return BELOW_THRESHOLD, 0.0, 0.0
+    if streak < persistence_required:
+        return NOT_PERSISTENT, 0.0, 0.0
+
+    # Confidence, term by term in the same order as the Python version
+    confidence = 0.0
+    strength = abs(imbalance)
+    confidence += 0.4 * (strength if strength < 1.0 else 1.0)
+    if weighted_imbalance == weighted_imbalance:
+        strength = abs(weighted_imbalance)
+        confidence += 0.2 * (strength if strength < 1.0 else 1.0)
+    persistence = streak / 10.0
+    confidence += 0.2 * (persistence if persistence < 1.0 else 1.0)
+    if volatility_z < vol_low:
+        confidence += 0.1
+    elif volatility_z > vol_high:
+        confidence -= 0.1
+    if imbalance_momentum * sign > 0:
+        confidence += 0.1
+    # NaN maps to 1.0, like max(0, min(1, x))
+    if not confidence <= 1.0:
+        confidence = 1.0
+    elif confidence < 0.0:
+        confidence = 0.0
+
+    if confidence < min_confidence:
+        return CONFIDENCE_TOO_LOW, confidence, 0.0
+    if require_momentum_confirm and momentum * sign < momentum_threshold:
+        return MOMENTUM_NOT_CONFIRMED, confidence, 0.0
+    if imbalance_momentum * sign < 0:
+        return IMBALANCE_MOMENTUM_DIVERGING, confidence, 0.0
+
+    # Position sizing
+    base_size = balance * base_position_pct
+    if volatility_z < vol_low:
+        base_size *= low_vol_multiplier
+    elif volatility_z > vol_high:
+        base_size *= high_vol_multiplier
+    if not mid_price == mid_price or mid_price == 0:
+        return ZERO_SIZE, confidence, 0.0
+    quantity = base_size / mid_price
+    if position_sign == sign:
+        quantity *= 0.5
+
+    return PASSED, confidence, quantity
+
+
+@njit(cache=True)
+def evaluate_batch_kernel(
+    imbalance: np.ndarray,
+    weighted_imbalance: np.ndarray,
+    streak: np.ndarray,
+    volatility_z: np.ndarray,
+    momentum: np.ndarray,
+    imbalance_momentum: np.ndarray,
+    mid_price: np.ndarray,
+    balance: float,
+    position_sign: np.ndarray,
+    eligible: np.ndarray,
+    params: tuple,
+) -> tuple:
+    """Run evaluate_core over every eligible row.
+
+    Returns:
+        Tuple of (outcome code, confidence, unrounded quantity) arrays;
+        ineligible rows get code -1
+    """
+    n = imbalance.shape[0]
+    codes = np.full(n, -1, dtype=np.int64)
+    confidence = np.zeros(n)
+    quantity = np.zeros(n)
+
+    for i in range(n):
+        if not eligible[i]:
+            continue
+        codes[i], confidence[i], quantity[i] = evaluate_core(
+            imbalance[i],
+            weighted_imbalance[i],
+            streak[i],
+            volatility_z[i],
+            momentum[i],
+            imbalance_momentum[i],
+            mid_price[i],
+            balance,
+            position_sign[i],
+            params,
+        )
+
+    return codes, confidence, quantity
@@ -4,21 +4,24 @@ This strategy generates trading signals based on order book imbalance,
 with filtering based on volatility and momentum confirmation.
 """
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Sequence
 
+import numpy as np
 import structlog
 
 from ..config import get_settings
-from ..features.microstructure import FeatureSnapshot
+from ..features.microstructure import FeatureBatch, FeatureSnapshot
 from ..models import Signal, Side
+from ._signal_kernels import PASSED, evaluate_batch_kernel
 
 logger = structlog.get_logger()
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyConfig:
     """Configuration for the imbalance strategy."""
 
@@ -47,6 +50,29 @@ class StrategyConfig:
     max_spread_bps: float = 10.0  # Maximum spread to trade
 
 
+def _kernel_params(cfg: StrategyConfig) -> tuple:
+    """Pack the config into the fixed-type tuple the kernels take."""
+    return (
+        float(cfg.imbalance_threshold),
+        int(cfg.persistence_required),
+        float(cfg.min_confidence),
+        bool(cfg.require_momentum_confirm),
+        float(cfg.momentum_threshold),
+        float(cfg.vol_threshold_low),
+        float(cfg.vol_threshold_high),
+        float(cfg.low_vol_multiplier),
+        float(cfg.high_vol_multiplier),
+        float(cfg.base_position_pct),
+    )
+
+
+def _position_sign(position: Optional[Decimal]) -> int:
+    """Sign of a position, 0 for none."""
+    if position is None or position == 0:
+        return 0
+    return 1 if position > 0 else -1
+
+
 class ImbalanceStrategy:
     """Order flow imbalance trading strategy.
 
@@ -69,6 +95,9 @@ class ImbalanceStrategy:
         self._imbalance_streak: dict[str, int] = {}
         self._last_imbalance_sign: dict[str, int] = {}
 
+        # Rejection events fire on most ticks; skip building them when filtered
+        self._debug = logger.is_enabled_for(logging.DEBUG)
+
         logger.info(
             "strategy_initialized",
             imbalance_threshold=self.config.imbalance_threshold,
@@ -91,83 +120,103 @@ class ImbalanceStrategy:
         Returns:
             Signal if conditions are met, None otherwise
         """
+        cfg = self.config
         symbol = features.symbol
+        imbalance = features.imbalance
+        mid_price = features.mid_price
+        spread_bps = features.spread_bps
 
         # Check basic conditions
-        if features.imbalance is None or features.mid_price is None:
+        if imbalance is None or mid_price is None:
             return None
 
-        # Spread filter
-        if features.spread_bps is not None:
-            if float(features.spread_bps) > self.config.max_spread_bps:
-                logger.debug("spread_too_wide", symbol=symbol, spread=float(features.spread_bps))
+        # Spread filter. Runs before the streak update: a tick rejected for
+        # a wide spread does not count towards persistence.
+        if spread_bps is not None:
+            spread = float(spread_bps)
+            if spread > cfg.max_spread_bps:
+                if self._debug:
+                    logger.debug("spread_too_wide", symbol=symbol, spread=spread)
                 return None
 
-        # Update persistence tracking
-        imbalance = features.imbalance
+        # Update persistence tracking. Sub-threshold ticks still count, so
+        # this has to happen before the threshold check.
         imbalance_sign = 1 if imbalance > 0 else -1
 
-        if symbol not in self._last_imbalance_sign:
-            self._last_imbalance_sign[symbol] = imbalance_sign
-            self._imbalance_streak[symbol] = 1
-        elif self._last_imbalance_sign[symbol] == imbalance_sign:
-            self._imbalance_streak[symbol] += 1
+        last_signs = self._last_imbalance_sign
+        streaks = self._imbalance_streak
+        if last_signs.get(symbol) == imbalance_sign:
+            streak = streaks[symbol] + 1
         else:
-            self._last_imbalance_sign[symbol] = imbalance_sign
-            self._imbalance_streak[symbol] = 1
+            streak = 1
+            last_signs[symbol] = imbalance_sign
+        streaks[symbol] = streak
 
         # Check if imbalance is significant
-        if abs(imbalance) < self.config.imbalance_threshold:
+        if abs(imbalance) < cfg.imbalance_threshold:
             return None
 
         # Check persistence
-        if self._imbalance_streak[symbol] < self.config.persistence_required:
-            logger.debug(
-                "imbalance_not_persistent",
-                symbol=symbol,
-                streak=self._imbalance_streak[symbol],
-                required=self.config.persistence_required,
-            )
+        if streak < cfg.persistence_required:
+            if self._debug:
+                logger.debug(
+                    "imbalance_not_persistent",
+                    symbol=symbol,
+                    streak=streak,
+                    required=cfg.persistence_required,
+                )
             return None
 
+        # Past the cheap filters: read the rest of the features once
+        weighted_imbalance, momentum, imbalance_momentum, volatility_z = (
+            features.weighted_imbalance,
+            features.momentum,
+            features.imbalance_momentum,
+            features.volatility_z,
+        )
+
         # Calculate confidence
-        confidence = self._calculate_confidence(features)
+        confidence = self._calculate_confidence(
+            imbalance, weighted_imbalance, streak, volatility_z, imbalance_momentum, imbalance_sign
+        )
 
-        if confidence < self.config.min_confidence:
-            logger.debug(
-                "confidence_too_low",
-                symbol=symbol,
-                confidence=confidence,
-                min_required=self.config.min_confidence,
-            )
+        if confidence < cfg.min_confidence:
+            if self._debug:
+                logger.debug(
+                    "confidence_too_low",
+                    symbol=symbol,
+                    confidence=confidence,
+                    min_required=cfg.min_confidence,
+                )
             return None
 
         # Momentum confirmation
-        if self.config.require_momentum_confirm:
-            if features.momentum is not None:
-                expected_momentum_sign = 1 if imbalance > 0 else -1
-                if (features.momentum * expected_momentum_sign) < self.config.momentum_threshold:
-                    logger.debug(
-                        "momentum_not_confirmed",
-                        symbol=symbol,
-                        momentum=features.momentum,
-                        expected_sign=expected_momentum_sign,
-                    )
+        if cfg.require_momentum_confirm:
+            if momentum is not None:
+                if (momentum * imbalance_sign) < cfg.momentum_threshold:
+                    if self._debug:
+                        logger.debug(
+                            "momentum_not_confirmed",
+                            symbol=symbol,
+                            momentum=momentum,
+                            expected_sign=imbalance_sign,
+                        )
                     return None
 
         # Imbalance momentum should be in same direction
-        if features.imbalance_momentum is not None:
-            if features.imbalance_momentum * imbalance_sign < 0:
-                logger.debug(
-                    "imbalance_momentum_diverging",
-                    symbol=symbol,
-                    imbalance_momentum=features.imbalance_momentum,
-                )
+        if imbalance_momentum is not None:
+            if imbalance_momentum * imbalance_sign < 0:
+                if self._debug:
+                    logger.debug(
+                        "imbalance_momentum_diverging",
+                        symbol=symbol,
+                        imbalance_momentum=imbalance_momentum,
+                    )
                 return None
 
         # Calculate position size
         size = self._calculate_position_size(
-            features, account_balance, current_position
+            volatility_z, mid_price, float(account_balance), current_position, imbalance_sign
         )
 
         if size <= 0:
@@ -175,7 +224,7 @@ class ImbalanceStrategy:
 
         # Generate signal
         side = Side.BUY if imbalance > 0 else Side.SELL
-        reason = self._generate_reason(features)
+        reason = self._generate_reason(imbalance, streak, volatility_z)
 
         signal = Signal(
             symbol=symbol,
@@ -197,93 +246,218 @@ class ImbalanceStrategy:
 
         return signal
 
-    def _calculate_confidence(self, features: FeatureSnapshot) -> float:
-        """Calculate signal confidence based on features."""
+    def evaluate_batch(
+        self,
+        batch: FeatureBatch,
+        account_balance: Decimal,
+        positions: Optional[Sequence[Optional[Decimal]]] = None,
+    ) -> tuple[np.ndarray, list[Optional[Signal]]]:
+        """Evaluate many symbols at once.
+
+        Equivalent to calling evaluate() on each row in order, but the
+        filters, confidence and sizing run in one compiled pass; only the
+        per-symbol streak bookkeeping and the (rare) signal construction
+        run in Python.
+
+        Args:
+            batch: Features for each symbol
+            account_balance: Current account balance for position sizing
+            positions: Current position per row (None = no position)
+
+        Returns:
+            Tuple of (mask of rows that produced a signal, signal per row)
+        """
+        cfg = self.config
+        n = len(batch)
+        imbalance = batch.imbalance
+        signals: list[Optional[Signal]] = [None] * n
+
+        # Basic conditions and spread filter (NaN spread skips the filter)
+        eligible = ~np.isnan(imbalance) & ~np.isnan(batch.mid_price)
+        eligible &= ~(batch.spread_bps > cfg.max_spread_bps)
+
+        # Persistence tracking, in row order so repeated symbols behave as
+        # they would through evaluate()
+        streak = np.zeros(n, dtype=np.int64)
+        sign = np.where(imbalance > 0, 1.0, -1.0)
+        last_signs = self._last_imbalance_sign
+        streaks = self._imbalance_streak
+        for i in np.flatnonzero(eligible):
+            symbol = batch.symbols[i]
+            s = int(sign[i])
+            if last_signs.get(symbol) == s:
+                streaks[symbol] += 1
+            else:
+                last_signs[symbol] = s
+                streaks[symbol] = 1
+            streak[i] = streaks[symbol]
+
+        if positions is None:
+            position_sign = np.zeros(n, dtype=np.int64)
+        else:
+            position_sign = np.array([_position_sign(p) for p in positions], dtype=np.int64)
+
+        codes, confidence, quantity = evaluate_batch_kernel(
+            imbalance,
+            batch.weighted_imbalance,
+            streak,
+            batch.volatility_z,
+            batch.momentum,
+            batch.imbalance_momentum,
+            batch.mid_price,
+            float(account_balance),
+            position_sign,
+            eligible,
+            _kernel_params(cfg),
+        )
+        mask = codes == PASSED
+
+        for i in np.flatnonzero(mask):
+            size = round(float(quantity[i]), 6)
+            if size <= 0:
+                mask[i] = False
+                continue
+
+            symbol = batch.symbols[i]
+            side = Side.BUY if imbalance[i] > 0 else Side.SELL
+            signals[i] = Signal(
+                symbol=symbol,
+                side=side,
+                confidence=float(confidence[i]),
+                suggested_size=Decimal(str(size)),
+                reason=self._generate_reason(
+                    float(imbalance[i]), int(streak[i]), float(batch.volatility_z[i])
+                ),
+                timestamp=datetime.utcnow(),
+            )
+
+            logger.info(
+                "signal_generated",
+                symbol=symbol,
+                side=side.value,
+                confidence=float(confidence[i]),
+                size=size,
+                imbalance=float(imbalance[i]),
+            )
+
+        return mask, signals
+
+    def _calculate_confidence(
+        self,
+        imbalance: float,
+        weighted_imbalance: Optional[float],
+        streak: int,
+        volatility_z: Optional[float],
+        imbalance_momentum: Optional[float],
+        imbalance_sign: int,
+    ) -> float:
+        """Calculate signal confidence from the tick's features.
+
+        Args:
+            imbalance: Order book imbalance
+            weighted_imbalance: Depth-weighted imbalance, if known
+            streak: Persistence streak including this tick
+            volatility_z: Volatility z-score, if known
+            imbalance_momentum: Imbalance slope, if known
+            imbalance_sign: 1 for bid-side imbalance, -1 otherwise
+        """
         confidence = 0.0
+        cfg = self.config
 
         # Base confidence from imbalance strength
-        if features.imbalance is not None:
-            imbalance_strength = min(abs(features.imbalance), 1.0)
-            confidence += 0.4 * imbalance_strength
+        imbalance_strength = min(abs(imbalance), 1.0)
+        confidence += 0.4 * imbalance_strength
 
         # Weighted imbalance contribution
-        if features.weighted_imbalance is not None:
-            weighted_strength = min(abs(features.weighted_imbalance), 1.0)
+        if weighted_imbalance is not None:
+            weighted_strength = min(abs(weighted_imbalance), 1.0)
             confidence += 0.2 * weighted_strength
 
         # Persistence bonus
-        symbol = features.symbol
-        streak = self._imbalance_streak.get(symbol, 0)
         persistence_score = min(streak / 10.0, 1.0)  # Max out at 10 ticks
         confidence += 0.2 * persistence_score
 
         # Volatility adjustment (lower vol = higher confidence)
-        if features.volatility_z is not None:
-            if features.volatility_z < self.config.vol_threshold_low:
+        if volatility_z is not None:
+            if volatility_z < cfg.vol_threshold_low:
                 confidence += 0.1  # Low volatility bonus
-            elif features.volatility_z > self.config.vol_threshold_high:
+            elif volatility_z > cfg.vol_threshold_high:
                 confidence -= 0.1  # High volatility penalty
 
         # Imbalance momentum bonus
-        if features.imbalance_momentum is not None and features.imbalance is not None:
-            imbalance_sign = 1 if features.imbalance > 0 else -1
-            if features.imbalance_momentum * imbalance_sign > 0:
+        if imbalance_momentum is not None:
+            if imbalance_momentum * imbalance_sign > 0:
                 confidence += 0.1
 
-        return max(0.0, min(1.0, confidence))
+        # Clamp to [0, 1]; written so NaN still maps to 1.0 like max(0, min(1, x))
+        if not confidence <= 1.0:
+            return 1.0
+        return 0.0 if confidence < 0.0 else confidence
 
     def _calculate_position_size(
         self,
-        features: FeatureSnapshot,
-        account_balance: Decimal,
+        volatility_z: Optional[float],
+        mid_price: Optional[Decimal],
+        account_balance: float,
         current_position: Optional[Decimal],
+        imbalance_sign: int,
     ) -> float:
-        """Calculate position size based on confidence and volatility."""
-        base_size = float(account_balance) * self.config.base_position_pct
+        """Calculate position size based on confidence and volatility.
+
+        Sizing runs in float; the caller converts the result to Decimal
+        only when it builds the Signal.
+        """
+        cfg = self.config
+        base_size = account_balance * cfg.base_position_pct
 
         # Adjust for volatility
-        if features.volatility_z is not None:
-            if features.volatility_z < self.config.vol_threshold_low:
-                base_size *= self.config.low_vol_multiplier
-            elif features.volatility_z > self.config.vol_threshold_high:
-                base_size *= self.config.high_vol_multiplier
+        if volatility_z is not None:
+            if volatility_z < cfg.vol_threshold_low:
+                base_size *= cfg.low_vol_multiplier
+            elif volatility_z > cfg.vol_threshold_high:
+                base_size *= cfg.high_vol_multiplier
 
         # Convert to quantity based on mid price
-        if features.mid_price is None or features.mid_price == 0:
+        if mid_price is None:
+            return 0.0
+        mid = float(mid_price)
+        if mid == 0:
             return 0.0
 
-        quantity = base_size / float(features.mid_price)
+        quantity = base_size / mid
 
-        # Adjust if we already have a position
-        if current_position is not None and current_position != 0:
-            # Reduce size if adding to position
-            if features.imbalance is not None:
-                imbalance_sign = 1 if features.imbalance > 0 else -1
-                position_sign = 1 if current_position > 0 else -1
-                if imbalance_sign == position_sign:
-                    quantity *= 0.5  # Halve size when adding to position
+        # Halve size when adding to an existing position
+        if _position_sign(current_position) == imbalance_sign:
+            quantity *= 0.5
 
         return round(quantity, 6)
 
-    def _generate_reason(self, features: FeatureSnapshot) -> str:
-        """Generate human-readable reason for the signal."""
-        parts = []
+    def _generate_reason(
+        self, imbalance: float, streak: int, volatility_z: Optional[float]
+    ) -> str:
+        """Generate human-readable reason for the signal.
 
-        if features.imbalance is not None:
-            direction = "bid" if features.imbalance > 0 else "ask"
-            parts.append(f"Order book {direction} imbalance: {features.imbalance:.3f}")
+        Only called once a signal fires, from values the caller already holds.
+
+        Args:
+            imbalance: Order book imbalance at that tick
+            streak: Persistence streak at that tick
+            volatility_z: Volatility z-score (None or NaN if unknown)
+        """
+        cfg = self.config
+        direction = "bid" if imbalance > 0 else "ask"
+        parts = [f"Order book {direction} imbalance: {imbalance:.3f}"]
 
-        streak = self._imbalance_streak.get(features.symbol, 0)
-        if streak >= self.config.persistence_required:
+        if streak >= cfg.persistence_required:
             parts.append(f"Persistent for {streak} ticks")
 
-        if features.volatility_z is not None:
-            if features.volatility_z < self.config.vol_threshold_low:
+        if volatility_z is not None:
+            if volatility_z < cfg.vol_threshold_low:
                 parts.append("Low volatility environment")
-            elif features.volatility_z > self.config.vol_threshold_high:
+            elif volatility_z > cfg.vol_threshold_high:
                 parts.append("High volatility (reduced size)")
 
-        return "; ".join(parts) if parts else "Imbalance signal"
+        return "; ".join(parts)
 
     def reset(self, symbol: Optional[str] = None) -> None:
         """Reset strategy state."""
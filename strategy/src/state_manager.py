@@ -4,42 +4,67 @@ Provides periodic checkpointing of system state and recovery on startup.
 Ensures no data loss on crashes or deploys.
 """
 
-import json
 import os
 import time
-from dataclasses import dataclass, field, asdict
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 from typing import Optional, Any
 import asyncio
 
+import orjson
 import structlog
-
-from .models import Account, Position, Side
+import zstandard
 
 logger = structlog.get_logger()
 
+# Checkpoints are zstd-compressed JSON; plain .json files from before
+# compression are still read
+_CHECKPOINT_SUFFIX = ".json.zst"
+_LEGACY_SUFFIX = ".json"
+_ZSTD_LEVEL = 3
+
 
-def decimal_serializer(obj: Any) -> Any:
-    """JSON serializer for Decimal and datetime."""
+def _json_default(obj: Any) -> Any:
+    """orjson hook for the types it does not encode natively."""
     if isinstance(obj, Decimal):
-        return {"__decimal__": str(obj)}
-    if isinstance(obj, datetime):
-        return {"__datetime__": obj.isoformat()}
+        return str(obj)
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
-def decimal_deserializer(obj: dict) -> Any:
-    """JSON deserializer for Decimal and datetime."""
-    if "__decimal__" in obj:
-        return Decimal(obj["__decimal__"])
-    if "__datetime__" in obj:
-        return datetime.fromisoformat(obj["__datetime__"])
-    return obj
+def _encode_checkpoint(checkpoint: "SystemCheckpoint") -> bytes:
+    """Encode a checkpoint as indented JSON, in the layout from_dict reads."""
+    # orjson encodes the dataclasses and datetimes natively
+    return orjson.dumps(checkpoint, default=_json_default, option=orjson.OPT_INDENT_2)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers see the old file or the new one.
+
+    The bytes go to a temporary sibling, are fsynced, and are renamed over
+    ``path``; the directory is fsynced so the rename itself survives a crash.
+    """
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreakerState:
     """State of the circuit breaker."""
     active: bool = False
@@ -48,7 +73,7 @@ class CircuitBreakerState:
     cooldown_until: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WarmupState:
     """State of the warmup period."""
     is_warming_up: bool = True
@@ -58,7 +83,7 @@ class WarmupState:
     warmup_duration_seconds: int = 300  # 5 minutes minimum warmup
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemCheckpoint:
     """Complete system state checkpoint."""
 
@@ -94,49 +119,6 @@ class SystemCheckpoint:
     max_drawdown: Decimal = Decimal("0")
     peak_equity: Decimal = Decimal("10000")
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for serialization."""
-        return {
-            "checkpoint_id": self.checkpoint_id,
-            "created_at": self.created_at.isoformat(),
-            "version": self.version,
-            "balance": str(self.balance),
-            "equity": str(self.equity),
-            "initial_balance": str(self.initial_balance),
-            "total_pnl": str(self.total_pnl),
-            "total_trades": self.total_trades,
-            "winning_trades": self.winning_trades,
-            "positions": {
-                k: {
-                    "symbol": v["symbol"],
-                    "quantity": str(v["quantity"]),
-                    "entry_price": str(v["entry_price"]),
-                    "unrealized_pnl": str(v["unrealized_pnl"]),
-                    "realized_pnl": str(v["realized_pnl"]),
-                }
-                for k, v in self.positions.items()
-            },
-            "circuit_breaker": {
-                "active": self.circuit_breaker.active,
-                "reason": self.circuit_breaker.reason,
-                "triggered_at": self.circuit_breaker.triggered_at.isoformat() if self.circuit_breaker.triggered_at else None,
-                "cooldown_until": self.circuit_breaker.cooldown_until.isoformat() if self.circuit_breaker.cooldown_until else None,
-            },
-            "daily_trade_count": self.daily_trade_count,
-            "last_trade_date": self.last_trade_date,
-            "imbalance_streaks": self.imbalance_streaks,
-            "last_imbalance_signs": self.last_imbalance_signs,
-            "warmup": {
-                "is_warming_up": self.warmup.is_warming_up,
-                "started_at": self.warmup.started_at.isoformat() if self.warmup.started_at else None,
-                "data_points_collected": self.warmup.data_points_collected,
-                "required_data_points": self.warmup.required_data_points,
-                "warmup_duration_seconds": self.warmup.warmup_duration_seconds,
-            },
-            "max_drawdown": str(self.max_drawdown),
-            "peak_equity": str(self.peak_equity),
-        }
-
     @classmethod
     def from_dict(cls, data: dict) -> "SystemCheckpoint":
         """Create from dictionary."""
@@ -217,10 +199,25 @@ class StateManager:
         self.current_state = SystemCheckpoint()
         self._checkpoint_task: Optional[asyncio.Task] = None
         self._running = False
+        # Serializes saves: the periodic loop and stop() can overlap
+        self._save_lock = asyncio.Lock()
+        # Exact bytes of the last checkpoint written, to skip unchanged saves
+        self._last_payload: Optional[bytes] = None
 
         # Ensure directory exists
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
 
+        # Checkpoint files, oldest first. Scanned once here and then kept in
+        # step with saves and cleanup, so neither touches the directory.
+        with os.scandir(self.checkpoint_dir) as it:
+            entries = [
+                e
+                for e in it
+                if e.name.startswith("ckpt_") and e.name.endswith((_CHECKPOINT_SUFFIX, _LEGACY_SUFFIX))
+            ]
+        entries.sort(key=lambda e: e.stat().st_mtime_ns)
+        self._checkpoints: deque[Path] = deque(Path(e.path) for e in entries)
+
     async def start(self) -> None:
         """Start the checkpoint background task."""
         self._running = True
@@ -246,61 +243,92 @@ class StateManager:
         while self._running:
             try:
                 await asyncio.sleep(self.checkpoint_interval)
-                await self.save_checkpoint()
+                await self.save_checkpoint(skip_unchanged=True)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("checkpoint_failed", error=str(e))
 
-    async def save_checkpoint(self) -> None:
-        """Save current state to disk."""
-        self.current_state.checkpoint_id = f"ckpt_{int(time.time() * 1000)}"
-        self.current_state.created_at = datetime.utcnow()
+    async def save_checkpoint(self, skip_unchanged: bool = False) -> None:
+        """Save current state to disk.
 
-        filename = f"{self.current_state.checkpoint_id}.json"
-        filepath = self.checkpoint_dir / filename
+        The state is encoded on the event loop, so the snapshot is
+        consistent; the blocking write and fsync run in a worker thread.
 
-        try:
-            data = self.current_state.to_dict()
-            with open(filepath, "w") as f:
-                json.dump(data, f, indent=2)
+        Args:
+            skip_unchanged: Don't write anything if the state is exactly
+                what the last checkpoint holds
+        """
+        async with self._save_lock:
+            # Until a new id is assigned the state still carries the last
+            # checkpoint's metadata, so an unchanged state encodes to the
+            # very bytes last written
+            if (
+                skip_unchanged
+                and self._last_payload is not None
+                and _encode_checkpoint(self.current_state) == self._last_payload
+            ):
+                logger.debug("checkpoint_unchanged", checkpoint_id=self.current_state.checkpoint_id)
+                return
+
+            self.current_state.checkpoint_id = f"ckpt_{int(time.time() * 1000)}"
+            self.current_state.created_at = datetime.utcnow()
+
+            filename = f"{self.current_state.checkpoint_id}{_CHECKPOINT_SUFFIX}"
+            filepath = self.checkpoint_dir / filename
+
+            try:
+                data = _encode_checkpoint(self.current_state)
+                store = asyncio.ensure_future(self._store_checkpoint(filepath, data))
+                try:
+                    await asyncio.shield(store)
+                except asyncio.CancelledError:
+                    # The worker thread writes the file regardless, so a save
+                    # cancelled by stop() finishes under the lock: the file
+                    # is tracked and pruned like any other
+                    await store
+                    raise
+
+            except Exception as e:
+                logger.error("checkpoint_save_failed", error=str(e))
+                raise
 
-            logger.debug("checkpoint_saved", path=str(filepath))
+    async def _store_checkpoint(self, filepath: Path, data: bytes) -> None:
+        """Write an encoded checkpoint, track it and prune old ones."""
+        await asyncio.to_thread(self._write_checkpoint, filepath, data)
+        self._last_payload = data
+        if not self._checkpoints or self._checkpoints[-1] != filepath:
+            self._checkpoints.append(filepath)
 
-            # Cleanup old checkpoints
-            await self._cleanup_old_checkpoints()
+        logger.debug("checkpoint_saved", path=str(filepath))
 
-        except Exception as e:
-            logger.error("checkpoint_save_failed", error=str(e))
-            raise
+        # Cleanup old checkpoints
+        await self._cleanup_old_checkpoints()
+
+    def _write_checkpoint(self, filepath: Path, data: bytes) -> None:
+        """Compress and atomically write an encoded checkpoint (worker thread)."""
+        compressed = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+        _write_atomic(filepath, compressed)
 
     async def _cleanup_old_checkpoints(self) -> None:
         """Remove old checkpoints, keeping only the most recent."""
-        checkpoints = sorted(
-            self.checkpoint_dir.glob("ckpt_*.json"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
-
-        for old_checkpoint in checkpoints[self.max_checkpoints:]:
+        while len(self._checkpoints) > self.max_checkpoints:
+            old_checkpoint = self._checkpoints.popleft()
             try:
-                old_checkpoint.unlink()
+                await asyncio.to_thread(old_checkpoint.unlink)
                 logger.debug("old_checkpoint_removed", path=str(old_checkpoint))
             except Exception as e:
                 logger.warning("checkpoint_cleanup_failed", path=str(old_checkpoint), error=str(e))
 
     def load_latest_checkpoint(self) -> Optional[SystemCheckpoint]:
         """Load the most recent valid checkpoint."""
-        checkpoints = sorted(
-            self.checkpoint_dir.glob("ckpt_*.json"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
-
-        for checkpoint_path in checkpoints:
+        for checkpoint_path in reversed(self._checkpoints):
             try:
-                with open(checkpoint_path) as f:
-                    data = json.load(f)
+                with open(checkpoint_path, "rb") as f:
+                    raw = f.read()
+                if checkpoint_path.name.endswith(_CHECKPOINT_SUFFIX):
+                    raw = zstandard.ZstdDecompressor().decompress(raw)
+                data = orjson.loads(raw)
 
                 checkpoint = SystemCheckpoint.from_dict(data)
                 logger.info(
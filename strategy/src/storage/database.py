@@ -1,24 +1,133 @@
 """SQLite database for trade persistence."""
 
-import json
-from datetime import datetime
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from typing import Optional
 
 import aiosqlite
 import structlog
+from pydantic import TypeAdapter
 
 from ..models import Account, Order, Position, Side, Trade
 
 logger = structlog.get_logger()
 
 
-def decimal_encoder(obj: object) -> str:
-    """JSON encoder for Decimal."""
-    if isinstance(obj, Decimal):
-        return str(obj)
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+# Schema shared by Database.connect() and init_database()
+_SCHEMA_SQL = """
+-- Persistent: readers (the report generator) never block on the writer
+PRAGMA journal_mode=WAL;
+
+CREATE TABLE IF NOT EXISTS trades (
+    id TEXT PRIMARY KEY,
+    order_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    price TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    fee TEXT NOT NULL,
+    fee_asset TEXT NOT NULL,
+    -- Exact decimal text; numeric queries CAST it to REAL
+    pnl TEXT,
+    timestamp DATETIME NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    order_type TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    price TEXT,
+    status TEXT NOT NULL,
+    filled_quantity TEXT NOT NULL,
+    avg_fill_price TEXT,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS positions (
+    symbol TEXT PRIMARY KEY,
+    quantity TEXT NOT NULL,
+    entry_price TEXT NOT NULL,
+    unrealized_pnl TEXT NOT NULL,
+    realized_pnl TEXT NOT NULL,
+    updated_at DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS account_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    balance TEXT NOT NULL,
+    equity TEXT NOT NULL,
+    total_pnl TEXT NOT NULL,
+    win_rate REAL NOT NULL,
+    total_trades INTEGER NOT NULL,
+    positions_json TEXT NOT NULL,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    date DATE PRIMARY KEY,
+    starting_balance TEXT NOT NULL,
+    ending_balance TEXT NOT NULL,
+    pnl TEXT NOT NULL,
+    trades_count INTEGER NOT NULL,
+    winning_trades INTEGER NOT NULL,
+    losing_trades INTEGER NOT NULL,
+    max_drawdown TEXT NOT NULL,
+    sharpe_ratio REAL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- (symbol, timestamp DESC) serves symbol filters and the newest-first LIMIT
+DROP INDEX IF EXISTS idx_trades_symbol;
+CREATE INDEX IF NOT EXISTS idx_trades_symbol_ts ON trades(symbol, timestamp DESC);
+-- Lets the report generator's ORDER BY timestamp scan walk the index
+CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp);
+CREATE INDEX IF NOT EXISTS idx_orders_symbol ON orders(symbol);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+"""
+
+# Statement text is kept byte-identical across calls so sqlite3's
+# per-connection statement cache reuses the prepared statement
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades (id, order_id, symbol, side, price, quantity, fee, fee_asset, pnl, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_ORDER_SQL = """
+    INSERT OR REPLACE INTO orders
+    (id, symbol, side, order_type, quantity, price, status, filled_quantity, avg_fill_price, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_POSITION_SQL = """
+    INSERT OR REPLACE INTO positions
+    (symbol, quantity, entry_price, unrealized_pnl, realized_pnl, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_SNAPSHOT_SQL = """
+    INSERT INTO account_snapshots
+    (balance, equity, total_pnl, win_rate, total_trades, positions_json)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+# Serializes snapshot positions in pydantic's core: Decimals as strings,
+# datetimes as ISO 8601
+_POSITIONS_JSON = TypeAdapter(list[Position])
+
+
+def _utc_date(ts: datetime) -> str:
+    """ISO date of ``ts`` in UTC, as SQLite's DATE() computes it."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.date().isoformat()
 
 
 class Database:
@@ -28,18 +137,39 @@ class Database:
         """Initialize database."""
         self.db_path = db_path
         self._conn: Optional[aiosqlite.Connection] = None
+        # Writes per commit; raised inside deferred_commits() for backtests
+        self._commit_every = 1
+        self._pending_writes = 0
+        # Trades dated today (UTC), counted in-process once loaded for that day
+        self._today: Optional[str] = None
+        self._today_count = 0
 
     async def connect(self) -> None:
         """Connect to the database."""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._conn = await aiosqlite.connect(self.db_path)
         self._conn.row_factory = aiosqlite.Row
+        # NORMAL sync under the schema's WAL: commits append to the log
+        # without an fsync each. A power loss can drop the last commits but
+        # never corrupts the file. Temp tables in memory, reads through a
+        # 256 MiB mmap, 64 MiB page cache.
+        await self._conn.executescript(
+            """
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+            """
+        )
         await self._create_tables()
         logger.info("database_connected", path=self.db_path)
 
     async def close(self) -> None:
         """Close the database connection."""
         if self._conn:
+            if self._pending_writes:
+                await self._conn.commit()
+                self._pending_writes = 0
             await self._conn.close()
             self._conn = None
 
@@ -47,84 +177,56 @@ class Database:
         """Create database tables if they don't exist."""
         assert self._conn is not None
 
-        await self._conn.executescript("""
-            CREATE TABLE IF NOT EXISTS trades (
-                id TEXT PRIMARY KEY,
-                order_id TEXT NOT NULL,
-                symbol TEXT NOT NULL,
-                side TEXT NOT NULL,
-                price TEXT NOT NULL,
-                quantity TEXT NOT NULL,
-                fee TEXT NOT NULL,
-                fee_asset TEXT NOT NULL,
-                pnl TEXT,
-                timestamp DATETIME NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS orders (
-                id TEXT PRIMARY KEY,
-                symbol TEXT NOT NULL,
-                side TEXT NOT NULL,
-                order_type TEXT NOT NULL,
-                quantity TEXT NOT NULL,
-                price TEXT,
-                status TEXT NOT NULL,
-                filled_quantity TEXT NOT NULL,
-                avg_fill_price TEXT,
-                created_at DATETIME NOT NULL,
-                updated_at DATETIME NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS positions (
-                symbol TEXT PRIMARY KEY,
-                quantity TEXT NOT NULL,
-                entry_price TEXT NOT NULL,
-                unrealized_pnl TEXT NOT NULL,
-                realized_pnl TEXT NOT NULL,
-                updated_at DATETIME NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS account_snapshots (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                balance TEXT NOT NULL,
-                equity TEXT NOT NULL,
-                total_pnl TEXT NOT NULL,
-                win_rate REAL NOT NULL,
-                total_trades INTEGER NOT NULL,
-                positions_json TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS daily_stats (
-                date DATE PRIMARY KEY,
-                starting_balance TEXT NOT NULL,
-                ending_balance TEXT NOT NULL,
-                pnl TEXT NOT NULL,
-                trades_count INTEGER NOT NULL,
-                winning_trades INTEGER NOT NULL,
-                losing_trades INTEGER NOT NULL,
-                max_drawdown TEXT NOT NULL,
-                sharpe_ratio REAL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol);
-            CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp);
-            CREATE INDEX IF NOT EXISTS idx_orders_symbol ON orders(symbol);
-            CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
-        """)
+        await self._conn.executescript(_SCHEMA_SQL)
         await self._conn.commit()
 
+    async def _wrote(self) -> None:
+        """Commit, or count the write while commits are deferred."""
+        assert self._conn is not None
+
+        self._pending_writes += 1
+        if self._pending_writes >= self._commit_every:
+            await self._conn.commit()
+            self._pending_writes = 0
+
+    @asynccontextmanager
+    async def deferred_commits(self, every: int = 10_000) -> AsyncIterator[None]:
+        """Commit once per `every` writes instead of once per write.
+
+        For backtests, where fills arrive far faster than per-row commits;
+        anything still pending is committed on exit.
+        """
+        assert self._conn is not None
+
+        self._commit_every = every
+        try:
+            yield
+        finally:
+            self._commit_every = 1
+            if self._pending_writes:
+                await self._conn.commit()
+                self._pending_writes = 0
+
+    async def save_trade_bundle(self, trade: Trade, order: Order, position: Position) -> None:
+        """Save a fill's trade, order and position in a single transaction."""
+        await self._insert_trade(trade)
+        await self._insert_order(order)
+        await self._insert_position(position)
+        await self._wrote()
+        logger.info("trade_saved", trade_id=trade.id, symbol=trade.symbol)
+
     async def save_trade(self, trade: Trade) -> None:
         """Save a trade to the database."""
+        await self._insert_trade(trade)
+        await self._wrote()
+        logger.info("trade_saved", trade_id=trade.id, symbol=trade.symbol)
+
+    async def _insert_trade(self, trade: Trade) -> None:
+        """Insert a trade row without committing."""
         assert self._conn is not None
 
         await self._conn.execute(
-            """
-            INSERT INTO trades (id, order_id, symbol, side, price, quantity, fee, fee_asset, pnl, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_TRADE_SQL,
             (
                 trade.id,
                 trade.order_id,
@@ -138,19 +240,21 @@ class Database:
                 trade.timestamp.isoformat(),
             ),
         )
-        await self._conn.commit()
-        logger.info("trade_saved", trade_id=trade.id, symbol=trade.symbol)
+
+        if self._today is not None and _utc_date(trade.timestamp) == self._today:
+            self._today_count += 1
 
     async def save_order(self, order: Order) -> None:
         """Save or update an order."""
+        await self._insert_order(order)
+        await self._wrote()
+
+    async def _insert_order(self, order: Order) -> None:
+        """Insert or replace an order row without committing."""
         assert self._conn is not None
 
         await self._conn.execute(
-            """
-            INSERT OR REPLACE INTO orders
-            (id, symbol, side, order_type, quantity, price, status, filled_quantity, avg_fill_price, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _UPSERT_ORDER_SQL,
             (
                 order.id,
                 order.symbol,
@@ -165,18 +269,18 @@ class Database:
                 order.updated_at.isoformat(),
             ),
         )
-        await self._conn.commit()
 
     async def save_position(self, position: Position) -> None:
         """Save or update a position."""
+        await self._insert_position(position)
+        await self._wrote()
+
+    async def _insert_position(self, position: Position) -> None:
+        """Insert or replace a position row without committing."""
         assert self._conn is not None
 
         await self._conn.execute(
-            """
-            INSERT OR REPLACE INTO positions
-            (symbol, quantity, entry_price, unrealized_pnl, realized_pnl, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+            _UPSERT_POSITION_SQL,
             (
                 position.symbol,
                 str(position.quantity),
@@ -186,7 +290,6 @@ class Database:
                 position.updated_at.isoformat(),
             ),
         )
-        await self._conn.commit()
 
     async def get_position(self, symbol: str) -> Optional[Position]:
         """Get position for a symbol."""
@@ -230,16 +333,10 @@ class Database:
         """Save an account snapshot."""
         assert self._conn is not None
 
-        positions_json = json.dumps(
-            [p.model_dump() for p in account.positions], default=decimal_encoder
-        )
+        positions_json = _POSITIONS_JSON.dump_json(account.positions).decode()
 
         await self._conn.execute(
-            """
-            INSERT INTO account_snapshots
-            (balance, equity, total_pnl, win_rate, total_trades, positions_json)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_SNAPSHOT_SQL,
             (
                 str(account.balance),
                 str(account.equity),
@@ -249,7 +346,7 @@ class Database:
                 positions_json,
             ),
         )
-        await self._conn.commit()
+        await self._wrote()
 
     async def get_trades(
         self,
@@ -274,7 +371,9 @@ class Database:
             query += " AND timestamp <= ?"
             params.append(end_date.isoformat())
 
-        query += f" ORDER BY timestamp DESC LIMIT {limit}"
+        # Bound rather than interpolated, so every limit shares one cached statement
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
 
         trades = []
         async with self._conn.execute(query, params) as cursor:
@@ -289,22 +388,70 @@ class Database:
                         quantity=Decimal(row["quantity"]),
                         fee=Decimal(row["fee"]),
                         fee_asset=row["fee_asset"],
-                        pnl=Decimal(row["pnl"]) if row["pnl"] else None,
+                        # str() also covers REAL values from databases created
+                        # while the column was declared REAL
+                        pnl=Decimal(str(row["pnl"])) if row["pnl"] else None,
                         timestamp=datetime.fromisoformat(row["timestamp"]),
                     )
                 )
         return trades
 
-    async def get_trade_count_today(self) -> int:
-        """Get number of trades today."""
+    async def get_metrics_aggregates(self, limit: int = 1000) -> dict:
+        """Aggregate P&L statistics over the most recent trades in one query.
+
+        Trades without P&L count as zero-return trades, matching the
+        `/metrics` endpoint semantics.
+        """
         assert self._conn is not None
 
-        today = datetime.utcnow().date().isoformat()
         async with self._conn.execute(
-            "SELECT COUNT(*) FROM trades WHERE DATE(timestamp) = ?", (today,)
+            """
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(pnl), 0.0),
+                COALESCE(SUM(pnl * pnl), 0.0),
+                COALESCE(MAX(NULLIF(pnl, 0)), 0.0),
+                COALESCE(MIN(NULLIF(pnl, 0)), 0.0)
+            FROM (
+                SELECT CAST(pnl AS REAL) AS pnl
+                FROM trades
+                ORDER BY timestamp DESC
+                LIMIT ?
+            )
+            """,
+            (limit,),
         ) as cursor:
             row = await cursor.fetchone()
-            return row[0] if row else 0
+
+        assert row is not None  # An aggregate query always returns one row
+        count, winning, pnl_sum, pnl_sq_sum, largest_win, largest_loss = row
+        return {
+            "count": count,
+            "winning": winning,
+            "pnl_sum": pnl_sum,
+            "pnl_sq_sum": pnl_sq_sum,
+            "largest_win": largest_win,
+            "largest_loss": largest_loss,
+        }
+
+    async def get_trade_count_today(self) -> int:
+        """Get number of trades today.
+
+        Counted from the database once per UTC day; trades saved after
+        that are added in-process, so the common case is a field read.
+        """
+        assert self._conn is not None
+
+        today = datetime.utcnow().date().isoformat()
+        if today != self._today:
+            async with self._conn.execute(
+                "SELECT COUNT(*) FROM trades WHERE DATE(timestamp) = ?", (today,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            self._today = today
+            self._today_count = row[0] if row else 0
+        return self._today_count
 
 
 def init_database(db_path: str) -> None:
@@ -315,71 +462,7 @@ def init_database(db_path: str) -> None:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
 
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS trades (
-            id TEXT PRIMARY KEY,
-            order_id TEXT NOT NULL,
-            symbol TEXT NOT NULL,
-            side TEXT NOT NULL,
-            price TEXT NOT NULL,
-            quantity TEXT NOT NULL,
-            fee TEXT NOT NULL,
-            fee_asset TEXT NOT NULL,
-            pnl TEXT,
-            timestamp DATETIME NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS orders (
-            id TEXT PRIMARY KEY,
-            symbol TEXT NOT NULL,
-            side TEXT NOT NULL,
-            order_type TEXT NOT NULL,
-            quantity TEXT NOT NULL,
-            price TEXT,
-            status TEXT NOT NULL,
-            filled_quantity TEXT NOT NULL,
-            avg_fill_price TEXT,
-            created_at DATETIME NOT NULL,
-            updated_at DATETIME NOT NULL
-        );
-
-        CREATE TABLE IF NOT EXISTS positions (
-            symbol TEXT PRIMARY KEY,
-            quantity TEXT NOT NULL,
-            entry_price TEXT NOT NULL,
-            unrealized_pnl TEXT NOT NULL,
-            realized_pnl TEXT NOT NULL,
-            updated_at DATETIME NOT NULL
-        );
-
-        CREATE TABLE IF NOT EXISTS account_snapshots (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            balance TEXT NOT NULL,
-            equity TEXT NOT NULL,
-            total_pnl TEXT NOT NULL,
-            win_rate REAL NOT NULL,
-            total_trades INTEGER NOT NULL,
-            positions_json TEXT NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS daily_stats (
-            date DATE PRIMARY KEY,
-            starting_balance TEXT NOT NULL,
-            ending_balance TEXT NOT NULL,
-            pnl TEXT NOT NULL,
-            trades_count INTEGER NOT NULL,
-            winning_trades INTEGER NOT NULL,
-            losing_trades INTEGER NOT NULL,
-            max_drawdown TEXT NOT NULL,
-            sharpe_ratio REAL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol);
-        CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp);
-    """)
+    conn.executescript(_SCHEMA_SQL)
 
     conn.commit()
     conn.close()
@@ -8,18 +8,87 @@ Tracks:
 """
 
 import hashlib
-import json
-from dataclasses import dataclass, field, asdict
+import time
+from functools import lru_cache
+from operator import itemgetter
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Mapping, Sequence
 from enum import Enum
+from types import MappingProxyType
 
+import msgpack
+import numpy as np
+import orjson
 import structlog
 
 logger = structlog.get_logger()
 
 
+# (UTC day number, its YYYYMMDD string) for the version id prefix
+_utc_day: tuple[int, str] = (-1, "")
+
+
+def _utc_date_str() -> str:
+    """Today's UTC date as YYYYMMDD, formatted once per day."""
+    global _utc_day
+    day = int(time.time() // 86400)
+    if day != _utc_day[0]:
+        _utc_day = (day, time.strftime("%Y%m%d", time.gmtime(day * 86400)))
+    return _utc_day[1]
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _parameter_hash(
+    imbalance_threshold: float,
+    min_confidence: float,
+    persistence_required: int,
+    position_size_pct: float,
+    flags: tuple,
+) -> str:
+    """Hash a version's identifying parameters.
+
+    Cached with typed=True because values that compare equal across types
+    (1 and 1.0) serialize, and so hash, differently.
+
+    Args:
+        imbalance_threshold: Version's imbalance threshold
+        min_confidence: Version's minimum confidence
+        persistence_required: Version's persistence requirement
+        position_size_pct: Version's position size
+        flags: Sorted (name, type, value) feature flag triples; typed=True
+            only covers top-level arguments, so flag types are part of the
+            triple
+
+    Returns:
+        8 hex char BLAKE2s digest of the parameters
+    """
+    params = {
+        "imbalance_threshold": imbalance_threshold,
+        "min_confidence": min_confidence,
+        "persistence_required": persistence_required,
+        "position_size_pct": position_size_pct,
+        "feature_flags": [(name, value) for name, _, value in flags],
+    }
+    param_bytes = orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2s(param_bytes, digest_size=4).hexdigest()
+
+
+# Decimal places batch totals are rounded to before entering the Decimal
+# accumulators, enough for satoshi-scale amounts
+_BATCH_TOTAL_DECIMALS = 8
+
+
+def _batch_total(values: np.ndarray) -> Decimal:
+    """Sum float amounts into a Decimal without binary float noise.
+
+    Rounding first turns e.g. 0.1 + 0.1 + 0.1 into Decimal("0.3") rather
+    than Decimal("0.30000000000000004").
+    """
+    return Decimal(str(round(float(values.sum()), _BATCH_TOTAL_DECIMALS)))
+
+
 class FeatureFlag(Enum):
     """Available feature flags for experimentation."""
 
@@ -37,8 +106,12 @@ class FeatureFlag(Enum):
     AGGRESSIVE_STOPS = "aggressive_stops"
     TRAILING_STOPS = "trailing_stops"
 
+    def __init__(self, value: str):
+        # One bit per member, in definition order
+        self.bit = 1 << len(self.__class__.__members__)
+
 
-@dataclass
+@dataclass(slots=True)
 class StrategyVersion:
     """Represents a specific version of the strategy."""
 
@@ -55,33 +128,44 @@ class StrategyVersion:
     stop_loss_atr_mult: float = 2.0
     take_profit_atr_mult: float = 3.0
 
-    # Feature flags
-    feature_flags: Dict[str, bool] = field(default_factory=dict)
+    # Feature flags, read-only after construction so _flag_mask stays in sync
+    feature_flags: Mapping[str, bool] = field(default_factory=dict)
 
     # Metadata
     description: str = ""
     parent_version: Optional[str] = None
 
+    # Bits of the enabled FeatureFlags, derived from feature_flags
+    _flag_mask: int = field(default=0, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         if not self.version_id:
             self.version_id = self._generate_version_id()
 
+        self.feature_flags = MappingProxyType(dict(self.feature_flags))
+        mask = 0
+        for flag in FeatureFlag:
+            if self.feature_flags.get(flag.value, False):
+                mask |= flag.bit
+        self._flag_mask = mask
+
     def _generate_version_id(self) -> str:
         """Generate a unique version ID based on parameters."""
-        params = {
-            "imbalance_threshold": self.imbalance_threshold,
-            "min_confidence": self.min_confidence,
-            "persistence_required": self.persistence_required,
-            "position_size_pct": self.position_size_pct,
-            "feature_flags": sorted(self.feature_flags.items()),
-        }
-        param_str = json.dumps(params, sort_keys=True)
-        hash_val = hashlib.sha256(param_str.encode()).hexdigest()[:8]
-        return f"v{datetime.utcnow().strftime('%Y%m%d')}_{hash_val}"
+        hash_val = _parameter_hash(
+            self.imbalance_threshold,
+            self.min_confidence,
+            self.persistence_required,
+            self.position_size_pct,
+            tuple(
+                (name, type(value), value)
+                for name, value in sorted(self.feature_flags.items())
+            ),
+        )
+        return f"v{_utc_date_str()}_{hash_val}"
 
     def is_flag_enabled(self, flag: FeatureFlag) -> bool:
         """Check if a feature flag is enabled."""
-        return self.feature_flags.get(flag.value, False)
+        return self._flag_mask & flag.bit != 0
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -97,7 +181,7 @@ class StrategyVersion:
                 "stop_loss_atr_mult": self.stop_loss_atr_mult,
                 "take_profit_atr_mult": self.take_profit_atr_mult,
             },
-            "feature_flags": self.feature_flags,
+            "feature_flags": dict(self.feature_flags),
             "description": self.description,
             "parent_version": self.parent_version,
         }
@@ -121,25 +205,56 @@ class StrategyVersion:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeVersionMetadata:
     """Version metadata attached to each trade."""
 
     version_id: str
-    parameters_snapshot: dict
-    feature_flags: Dict[str, bool]
+    parameters_snapshot: Mapping[str, Any]
+    feature_flags: Mapping[str, bool]
     signal_details: dict = field(default_factory=dict)
+    # Pre-packed msgpack for everything but signal_details, see to_msgpack
+    packed_prefix: bytes = field(default=b"", repr=False, compare=False)
 
     def to_dict(self) -> dict:
         return {
             "version_id": self.version_id,
-            "parameters_snapshot": self.parameters_snapshot,
-            "feature_flags": self.feature_flags,
+            "parameters_snapshot": dict(self.parameters_snapshot),
+            "feature_flags": dict(self.feature_flags),
             "signal_details": self.signal_details,
         }
 
-
-@dataclass
+    def to_msgpack(self) -> bytes:
+        """Serialize to msgpack, byte-identical to packing to_dict()."""
+        if not self.packed_prefix:
+            return msgpack.packb(self.to_dict())
+        return self.packed_prefix + msgpack.packb(self.signal_details)
+
+
+def _pack_metadata_prefix(
+    version_id: str,
+    parameters_snapshot: Mapping[str, Any],
+    feature_flags: Mapping[str, bool],
+) -> bytes:
+    """Pack a TradeVersionMetadata map up to the signal_details value.
+
+    The map header already counts signal_details, so appending its packed
+    value completes a valid 4-entry map.
+    """
+    packer = msgpack.Packer()
+    return b"".join((
+        packer.pack_map_header(4),
+        packer.pack("version_id"),
+        packer.pack(version_id),
+        packer.pack("parameters_snapshot"),
+        packer.pack(dict(parameters_snapshot)),
+        packer.pack("feature_flags"),
+        packer.pack(dict(feature_flags)),
+        packer.pack("signal_details"),
+    ))
+
+
+@dataclass(slots=True)
 class VersionPerformance:
     """Performance metrics for a strategy version."""
 
@@ -174,11 +289,34 @@ class VersionManager:
         self._versions: Dict[str, StrategyVersion] = {}
         self._performance: Dict[str, VersionPerformance] = {}
         self._active_version: Optional[str] = None
-        self._shadow_versions: List[str] = []  # Versions running in shadow mode
+        # Versions running in shadow mode; a dict keeps insertion order
+        # with O(1) membership
+        self._shadow_versions: Dict[str, None] = {}
+        # Read-only (parameters_snapshot, feature_flags, packed prefix)
+        # shared by every trade's metadata, built once per version at
+        # registration
+        self._trade_snapshots: Dict[
+            str, tuple[Mapping[str, Any], Mapping[str, bool], bytes]
+        ] = {}
+        # Serialized versions for get_status, rebuilt after registration
+        self._status_versions: Optional[List[dict]] = None
 
     def register_version(self, version: StrategyVersion) -> None:
         """Register a new strategy version."""
         self._versions[version.version_id] = version
+        parameters_snapshot = MappingProxyType({
+            "imbalance_threshold": version.imbalance_threshold,
+            "min_confidence": version.min_confidence,
+            "persistence_required": version.persistence_required,
+            "position_size_pct": version.position_size_pct,
+        })
+        feature_flags = version.feature_flags
+        self._trade_snapshots[version.version_id] = (
+            parameters_snapshot,
+            feature_flags,
+            _pack_metadata_prefix(version.version_id, parameters_snapshot, feature_flags),
+        )
+        self._status_versions = None
         self._performance[version.version_id] = VersionPerformance(
             version_id=version.version_id
         )
@@ -209,14 +347,14 @@ class VersionManager:
             raise ValueError(f"Version {version_id} not registered")
 
         if version_id not in self._shadow_versions:
-            self._shadow_versions.append(version_id)
+            self._shadow_versions[version_id] = None
 
             logger.info("shadow_version_added", version_id=version_id)
 
     def remove_shadow_version(self, version_id: str) -> None:
         """Remove a version from shadow mode."""
         if version_id in self._shadow_versions:
-            self._shadow_versions.remove(version_id)
+            del self._shadow_versions[version_id]
             logger.info("shadow_version_removed", version_id=version_id)
 
     def get_active_version(self) -> Optional[StrategyVersion]:
@@ -246,16 +384,15 @@ class VersionManager:
         if not version:
             raise ValueError("No active version set")
 
+        parameters_snapshot, feature_flags, packed_prefix = self._trade_snapshots[
+            version.version_id
+        ]
         return TradeVersionMetadata(
             version_id=version.version_id,
-            parameters_snapshot={
-                "imbalance_threshold": version.imbalance_threshold,
-                "min_confidence": version.min_confidence,
-                "persistence_required": version.persistence_required,
-                "position_size_pct": version.position_size_pct,
-            },
-            feature_flags=version.feature_flags.copy(),
+            parameters_snapshot=parameters_snapshot,
+            feature_flags=feature_flags,
             signal_details=signal_details or {},
+            packed_prefix=packed_prefix,
         )
 
     def record_trade(
@@ -275,9 +412,7 @@ class VersionManager:
         perf.total_trades += 1
         perf.total_pnl += pnl
         perf.total_fees += fee
-
-        if pnl > 0:
-            perf.winning_trades += 1
+        perf.winning_trades += pnl > 0
 
         if perf.first_trade is None:
             perf.first_trade = timestamp
@@ -290,6 +425,52 @@ class VersionManager:
             total_trades=perf.total_trades,
         )
 
+    def record_trades_batch(
+        self,
+        version_id: str,
+        pnls: np.ndarray,
+        fees: np.ndarray,
+        timestamps: Sequence[datetime],
+    ) -> None:
+        """Record many trade results for a version in one update.
+
+        The P&L and fee totals are rounded to 8 decimal places before they
+        are added to the Decimal accumulators.
+
+        Args:
+            version_id: Version the trades belong to
+            pnls: P&L per trade
+            fees: Fee per trade
+            timestamps: Trade times, oldest first
+        """
+        n = len(pnls)
+        if n == 0:
+            return
+
+        if version_id not in self._performance:
+            self._performance[version_id] = VersionPerformance(
+                version_id=version_id
+            )
+
+        perf = self._performance[version_id]
+        total_pnl = _batch_total(pnls)
+        perf.total_trades += n
+        perf.total_pnl += total_pnl
+        perf.total_fees += _batch_total(fees)
+        perf.winning_trades += int(np.count_nonzero(pnls > 0))
+
+        if perf.first_trade is None:
+            perf.first_trade = timestamps[0]
+        perf.last_trade = timestamps[-1]
+
+        logger.debug(
+            "trades_recorded_for_version",
+            version_id=version_id,
+            count=n,
+            pnl=str(total_pnl),
+            total_trades=perf.total_trades,
+        )
+
     def get_performance(self, version_id: str) -> Optional[VersionPerformance]:
         """Get performance metrics for a version."""
         return self._performance.get(version_id)
@@ -308,7 +489,7 @@ class VersionManager:
             perf = self._performance.get(vid)
 
             if version and perf:
-                comparisons.append({
+                comparisons.append((perf.total_pnl, {
                     "version_id": vid,
                     "name": version.name,
                     "is_active": vid == self._active_version,
@@ -318,20 +499,23 @@ class VersionManager:
                     "total_pnl": str(perf.total_pnl),
                     "avg_pnl": str(perf.avg_pnl_per_trade),
                     "created_at": version.created_at.isoformat(),
-                })
+                }))
 
-        # Sort by total P&L
-        comparisons.sort(key=lambda x: Decimal(str(x["total_pnl"])), reverse=True)
+        # Sort by total P&L, on the Decimal itself rather than its string
+        comparisons.sort(key=itemgetter(0), reverse=True)
 
-        return comparisons
+        return [comparison for _, comparison in comparisons]
 
     def get_status(self) -> dict:
         """Get version manager status."""
+        if self._status_versions is None:
+            self._status_versions = [v.to_dict() for v in self._versions.values()]
+
         return {
             "active_version": self._active_version,
-            "shadow_versions": self._shadow_versions,
+            "shadow_versions": list(self._shadow_versions),
             "total_versions": len(self._versions),
-            "versions": [v.to_dict() for v in self._versions.values()],
+            "versions": self._status_versions,
         }
 
 
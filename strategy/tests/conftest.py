@@ -0,0 +1,12 @@
+"""Shared test configuration."""
+
+import numpy as np
+import pytest
+
+from src.features._feature_kernels import compute_features
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_jit():
+    """Load the compiled feature kernel once, outside any test's timing."""
+    compute_features(np.ones(21), np.zeros(20), 20, 10)
@@ -0,0 +1,109 @@
+"""Tests for the complementary data provider."""
+
+import asyncio
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.features import complementary_data
+from src.features.complementary_data import (
+    ComplementaryDataProvider,
+    LiquidationEvent,
+    TokenBucket,
+)
+
+
+async def test_token_bucket_bursts_then_throttles():
+    """Test that the bucket serves its capacity at once, then at the refill rate."""
+    bucket = TokenBucket(rate=50, capacity=2)
+
+    start = time.monotonic()
+    await bucket.acquire()
+    await bucket.acquire()
+    assert time.monotonic() - start < 0.01
+
+    # Two more tokens need 2 / 50 s of refill
+    await asyncio.gather(bucket.acquire(), bucket.acquire())
+    assert 0.03 <= time.monotonic() - start < 0.5
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping through them."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(complementary_data.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def _provider(statuses, retry_after=None) -> ComplementaryDataProvider:
+    """Provider whose requests get ``statuses`` in turn, then 200s."""
+    responses = iter(statuses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(responses, 200)
+        headers = {"Retry-After": retry_after} if status != 200 and retry_after else {}
+        return httpx.Response(status, headers=headers, json={"openInterest": "123.4"})
+
+    provider = ComplementaryDataProvider(symbols=["BTCUSDT"])
+    provider._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://binance"
+    )
+    return provider
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "base_delay"),
+    [
+        ("2", 2.0),
+        (None, 1.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 1.0),  # HTTP-date form
+        ("-5", 1.0),
+    ],
+)
+async def test_rate_limit_backs_off_exponentially(sleeps, retry_after, base_delay):
+    """Test that 429/418 responses are retried after Retry-After, doubling each time."""
+    provider = _provider([429, 418, 429], retry_after)
+
+    response = await provider._get("/fapi/v1/openInterest", {}, provider._oi_sem)
+
+    assert response.status_code == 200
+    assert sleeps == [base_delay, base_delay * 2, base_delay * 4]
+    await provider._client.aclose()
+
+
+async def test_rate_limit_gives_up_after_max_retries(sleeps):
+    """Test that the last rate-limited response is raised once retries run out."""
+    provider = _provider([429] * (complementary_data.MAX_RETRIES + 1), "1")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await provider._get("/fapi/v1/openInterest", {}, provider._oi_sem)
+
+    assert len(sleeps) == complementary_data.MAX_RETRIES
+    await provider._client.aclose()
+
+
+def test_liquidations_keep_exact_values():
+    """Test that retained liquidations come back as recorded, not via float."""
+    provider = ComplementaryDataProvider(symbols=["BTCUSDT", "ETHUSDT"])
+    now = datetime.utcnow()
+    recorded = [
+        LiquidationEvent("BTCUSDT", "sell", Decimal("0.1"), Decimal("1.23456789012"), now),
+        LiquidationEvent("ETHUSDT", "buy", Decimal("3000.10"), Decimal("2"), now),
+        LiquidationEvent("BTCUSDT", "buy", Decimal("50000.00000001"), Decimal("0.3"), now),
+    ]
+    for event in recorded:
+        provider.record_liquidation(event)
+
+    assert provider.liquidations == recorded
+    btc = provider.get_recent_liquidations("BTCUSDT")
+    assert btc == [recorded[0], recorded[2]]
+    # Trailing zeros and sub-millisecond timestamps are kept too
+    assert str(provider.get_recent_liquidations("ETHUSDT")[0].price) == "3000.10"
+    assert btc[0].timestamp == now
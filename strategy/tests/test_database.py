@@ -0,0 +1,104 @@
+"""Tests for trade persistence."""
+
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.models import Side, Trade
+from src.storage import Database
+
+PNLS = [None, "10", "9", "-434.99", "123.00260000", "-17.69135862"]
+
+
+def _trades() -> list[Trade]:
+    start = datetime(2024, 1, 1)
+    return [
+        Trade(
+            id=f"t{i}",
+            order_id=f"o{i}",
+            symbol="BTCUSDT",
+            side=Side.BUY,
+            price=Decimal("50000"),
+            quantity=Decimal("0.1"),
+            fee=Decimal("5"),
+            timestamp=start + timedelta(minutes=i),
+            pnl=Decimal(pnl) if pnl else None,
+        )
+        for i, pnl in enumerate(PNLS)
+    ]
+
+
+async def _saved_db(path: str) -> Database:
+    db = Database(path)
+    await db.connect()
+    for trade in _trades():
+        await db.save_trade(trade)
+    return db
+
+
+def _expected_aggregates() -> dict:
+    pnls = [float(p) for p in PNLS if p]
+    return {
+        "count": len(PNLS),
+        "winning": 3,
+        "pnl_sum": pytest.approx(sum(pnls)),
+        "pnl_sq_sum": pytest.approx(sum(p * p for p in pnls)),
+        "largest_win": 123.0026,
+        "largest_loss": -434.99,
+    }
+
+
+async def test_trade_pnl_round_trips_exactly(tmp_path):
+    """Test that P&L comes back as the exact Decimal that was saved."""
+    db = await _saved_db(str(tmp_path / "trades.db"))
+    try:
+        trades = await db.get_trades()
+        assert [str(t.pnl) if t.pnl is not None else None for t in reversed(trades)] == PNLS
+        # Numeric aggregates cast the text column rather than comparing strings
+        assert await db.get_metrics_aggregates() == _expected_aggregates()
+    finally:
+        await db.close()
+
+
+async def test_reads_pnl_from_real_column(tmp_path):
+    """Test a database created while trades.pnl was declared REAL."""
+    path = str(tmp_path / "trades.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE trades (
+            id TEXT PRIMARY KEY, order_id TEXT NOT NULL, symbol TEXT NOT NULL,
+            side TEXT NOT NULL, price TEXT NOT NULL, quantity TEXT NOT NULL,
+            fee TEXT NOT NULL, fee_asset TEXT NOT NULL, pnl REAL,
+            timestamp DATETIME NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.close()
+
+    db = await _saved_db(path)
+    try:
+        trades = await db.get_trades()
+        assert trades[0].pnl == Decimal("-17.69135862")
+        assert trades[1].pnl == Decimal("123.0026")
+        assert await db.get_metrics_aggregates() == _expected_aggregates()
+    finally:
+        await db.close()
+
+
+async def test_schema_sets_wal_and_timestamp_index(tmp_path):
+    """Test the schema sets what read-only consumers like the report rely on."""
+    path = str(tmp_path / "trades.db")
+    db = Database(path)
+    await db.connect()
+    await db.close()
+
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM trades ORDER BY timestamp").fetchall()
+        assert "idx_trades_timestamp" in plan[0][-1]
+    finally:
+        conn.close()
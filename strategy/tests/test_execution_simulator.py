@@ -0,0 +1,129 @@
+"""Tests for the execution simulator's batch and vectorised paths."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.broker.execution_simulator import ExecutionConfig, ExecutionSimulator
+from src.models import OrderBookState, PriceLevel, Side
+
+
+class _ScriptedRng:
+    """Generator stand-in that replays fixed level draws.
+
+    Whole-matrix requests (the batch path) get every row; per-order requests
+    (the scalar path) get row ``self.row`` trimmed to that book's depth.
+    """
+
+    def __init__(self, rnd: np.ndarray, ratios: np.ndarray):
+        self._rnd = rnd
+        self._ratios = ratios
+        self.row = 0
+
+    def random(self, size):
+        if isinstance(size, tuple):
+            return self._rnd
+        return self._rnd[self.row, :size]
+
+    def uniform(self, low, high, size):
+        if isinstance(size, tuple):
+            return self._ratios
+        return self._ratios[self.row, :size]
+
+    def normal(self, loc, scale, size):
+        return np.full(size, loc)
+
+
+def _book(bids, asks) -> OrderBookState:
+    bid_levels = [PriceLevel(Decimal(p), Decimal(q)) for p, q in bids]
+    ask_levels = [PriceLevel(Decimal(p), Decimal(q)) for p, q in asks]
+    mid = (
+        (bid_levels[0].price + ask_levels[0].price) / 2 if bid_levels and ask_levels else None
+    )
+    return OrderBookState(
+        symbol="BTCUSDT",
+        timestamp=0,
+        last_update_id=0,
+        bids=bid_levels,
+        asks=ask_levels,
+        mid_price=mid,
+    )
+
+
+ORDERS = [
+    (Side.BUY, "0.5", _book([("99.5", "1")], [("100", "0.3"), ("100.5", "0.4"), ("101", "2")])),
+    (Side.SELL, "1.2", _book([("99.5", "0.6"), ("99", "0.8"), ("98", "5")], [("100", "1")])),
+    (Side.BUY, "10", _book([("99.5", "1")], [("100", "0.2"), ("101", "0.1")])),
+    (Side.SELL, "0.1", _book([], [("100", "1")])),
+    (Side.BUY, "0.05", _book([("99.5", "1")], [("100", "1")])),
+]
+
+
+def test_batch_matches_scalar_market_orders():
+    """Test that the batch path fills each order exactly like the scalar path."""
+    rng = np.random.default_rng(7)
+    depth = 3
+    # Some draws above level_fill_probability, so levels get skipped too
+    rnd = rng.random((len(ORDERS), depth))
+    ratios = rng.uniform(0.5, 1.0, (len(ORDERS), depth))
+
+    sides = [side for side, _, _ in ORDERS]
+    quantities = [float(qty) for _, qty, _ in ORDERS]
+    books = [book for _, _, book in ORDERS]
+
+    batch_sim = ExecutionSimulator()
+    batch_sim._rng = _ScriptedRng(rnd, ratios)
+    batch = batch_sim.simulate_market_orders_batch(sides, quantities, books)
+
+    scalar_sim = ExecutionSimulator()
+    scalar_sim._rng = _ScriptedRng(rnd, ratios)
+    assert any(rnd.ravel() > scalar_sim.config.level_fill_probability)
+
+    for j, (side, qty, book) in enumerate(ORDERS):
+        scalar_sim._rng.row = j
+        result = scalar_sim.simulate_market_order(side, Decimal(qty), book)
+        assert result.filled == bool(batch.filled[j])
+        assert len(result.partial_fills) == batch.num_levels[j]
+        if not result.filled:
+            continue
+        assert float(result.fill_quantity) == pytest.approx(batch.fill_quantity[j])
+        assert float(result.fill_price) == pytest.approx(batch.fill_price[j], abs=1e-8)
+        assert float(result.slippage_bps) == pytest.approx(batch.slippage_bps[j], abs=1e-4)
+        assert float(result.market_impact_bps) == pytest.approx(batch.market_impact_bps[j])
+
+
+def test_market_order_prices_are_quantized():
+    """Test that float fill price and slippage come back rounded to 1e-8."""
+    sim = ExecutionSimulator()
+    # Fill 0.7 @ 100 and 1/3 @ 101.3: the float average is 100.4193548387097
+    sim._rng = _ScriptedRng(np.zeros((1, 2)), np.array([[0.7, 1 / 3]]))
+    book = _book([("100", "1")], [("100", "1"), ("101.3", "1")])
+
+    result = sim.simulate_market_order(Side.BUY, Decimal("2"), book)
+
+    assert result.fill_price == Decimal("100.41935484")
+    assert result.slippage_bps == Decimal("41.93548387")
+
+
+@pytest.mark.parametrize("side", [Side.BUY, Side.SELL])
+@pytest.mark.parametrize(
+    "config",
+    [ExecutionConfig(), ExecutionConfig(base_fill_probability=0.6, queue_position_decay=0.4)],
+)
+def test_fill_probability_vec_matches_scalar(side, config):
+    """Test the vectorised fill probability element by element against the scalar one."""
+    sim = ExecutionSimulator(config)
+    book = _book([("99.5", "1"), ("99", "2")], [("100", "1"), ("100.5", "2")])
+    best = book.best_bid_f if side == Side.BUY else book.best_ask_f
+
+    # Prices either side of the best, far enough out to hit both clamps
+    prices = np.array([80, 95, 99, 99.5, 99.75, 100, 100.25, 101, 105, 120])
+    queue_positions = np.linspace(0.0, 1.0, prices.size)
+
+    vec = sim._calculate_fill_probability_vec(side, prices, best, queue_positions)
+    scalar = [
+        sim._calculate_fill_probability(side, Decimal(str(price)), book, queue)
+        for price, queue in zip(prices, queue_positions, strict=True)
+    ]
+    np.testing.assert_allclose(vec, scalar, rtol=0, atol=1e-12)
@@ -0,0 +1,129 @@
+"""Tests for the paper broker's fixed-point fill accounting.
+
+Expected values are what the original all-Decimal broker produced for the
+same fills (5 bps slippage, 0.1% taker fee).
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.broker.paper_broker import PaperBroker
+from src.models import Order, OrderType, Side
+from src.storage import Database
+
+
+@pytest.fixture
+async def broker(tmp_path):
+    """Create a broker backed by a throwaway database."""
+    db = Database(str(tmp_path / "trades.db"))
+    await db.connect()
+    yield PaperBroker(db)
+    await db.close()
+
+
+async def _fill(broker: PaperBroker, symbol: str, side: Side, quantity: str, price: str):
+    order = Order(
+        id=broker._generate_order_id(),
+        symbol=symbol,
+        side=side,
+        order_type=OrderType.MARKET,
+        quantity=Decimal(quantity),
+    )
+    return await broker.execute_market_order(order, Decimal(price))
+
+
+async def test_position_open_add_partial_and_full_close(broker):
+    """Test position quantity, entry price and realized P&L through a round trip."""
+    # Open: fills at 50025 after slippage
+    await _fill(broker, "BTCUSDT", Side.BUY, "0.1", "50000")
+    position = broker.get_position("BTCUSDT")
+    assert (position.quantity, position.entry_price) == (Decimal("0.1"), Decimal("50025"))
+
+    # Add: entry is the size-weighted average of 50025 and 51025.5
+    await _fill(broker, "BTCUSDT", Side.BUY, "0.2", "51000")
+    position = broker.get_position("BTCUSDT")
+    assert (position.quantity, position.entry_price) == (Decimal("0.3"), Decimal("50692"))
+
+    # Partial close: the entry price is re-averaged with the closing fill
+    await _fill(broker, "BTCUSDT", Side.SELL, "0.1", "52000")
+    position = broker.get_position("BTCUSDT")
+    assert (position.quantity, position.entry_price) == (Decimal("0.2"), Decimal("102025"))
+    assert position.realized_pnl == 0
+
+    # Full close books the closing trade's P&L
+    await _fill(broker, "BTCUSDT", Side.SELL, "0.2", "100000")
+    position = broker.get_position("BTCUSDT")
+    assert position.quantity == 0
+    assert position.realized_pnl == Decimal("-434.99")
+
+
+async def test_position_flip(broker):
+    """Test that selling through a long flips to a short at the fill price."""
+    await _fill(broker, "ETHUSDT", Side.BUY, "0.1", "3000")
+    await _fill(broker, "ETHUSDT", Side.SELL, "0.3", "2900")
+
+    position = broker.get_position("ETHUSDT")
+    assert position.quantity == Decimal("-0.2")
+    assert position.entry_price == Decimal("2898.55")
+    assert position.realized_pnl == Decimal("-11.164565")
+
+
+async def test_fixed_point_rounds_half_even(broker):
+    """Test that inexact results round to the nearest 1e-8, not towards -inf."""
+    await _fill(broker, "SOLUSDT", Side.BUY, "0.1", "10000")
+    await _fill(broker, "SOLUSDT", Side.BUY, "0.2", "10000.05")
+    position = broker.get_position("SOLUSDT")
+    # Decimal: 10005.033350 exactly; the rounded 2nd fill is 10005.05002500
+    assert position.entry_price == Decimal("10005.03335")
+
+    trade = await _fill(broker, "SOLUSDT", Side.SELL, "0.12345678", "9876.54321")
+    # Decimal: -17.69135861639427696810
+    assert trade.pnl == Decimal("-17.69135862")
+    position = broker.get_position("SOLUSDT")
+    # Decimal: 23904.77846799409837489086242
+    assert position.entry_price == Decimal("23904.77846800")
+
+
+async def test_balance_fees_and_realized_pnl(broker):
+    """Test cash, fees and trade P&L against the Decimal broker's values."""
+    start = broker.account.balance
+    fills = [
+        # side, qty, price, fee, pnl, balance change
+        (Side.BUY, "0.1", "50000", "5.0025", None, "-5007.5025"),
+        (Side.BUY, "0.2", "51000", "10.2051", None, "-10215.3051"),
+        (Side.SELL, "0.1", "52000", "5.1974", "123.0026", "5192.2026"),
+        (Side.SELL, "0.2", "100000", "19.99", "-434.99", "19970.01"),
+    ]
+
+    balance = start
+    for side, qty, price, fee, pnl, change in fills:
+        trade = await _fill(broker, "BTCUSDT", side, qty, price)
+        balance += Decimal(change)
+        assert trade.fee == Decimal(fee)
+        assert trade.pnl == (Decimal(pnl) if pnl else None)
+        assert broker.account.balance == balance
+
+    assert broker.account.total_pnl == Decimal("-311.9874")
+    assert broker.account.total_trades == 2
+
+
+async def test_fee_rates_come_from_class_attributes(tmp_path):
+    """Test that overriding the Decimal fee rates changes the fixed-point fees."""
+
+    class ZeroTakerBroker(PaperBroker):
+        TAKER_FEE = Decimal("0")
+
+    db = Database(str(tmp_path / "trades.db"))
+    await db.connect()
+    try:
+        default = PaperBroker(db)
+        assert default._calculate_fee(Decimal("50025"), Decimal("0.3")) == Decimal("15.0075")
+        assert default._calculate_fee(
+            Decimal("50025"), Decimal("0.3"), is_maker=True
+        ) == Decimal("15.0075")
+
+        trade = await _fill(ZeroTakerBroker(db), "BTCUSDT", Side.BUY, "0.1", "50000")
+        assert trade.fee == 0
+    finally:
+        await db.close()
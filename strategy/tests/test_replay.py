@@ -0,0 +1,54 @@
+"""Tests for replay log recording and reading."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.replay import EventType, ReplayLogger, ReplayReader
+
+
+@pytest.mark.parametrize(
+    ("compress", "compressor", "suffix"),
+    [(False, "zstd", ".msgpack"), (True, "gzip", ".gz"), (True, "zstd", ".zst")],
+)
+async def test_record_and_read_back(tmp_path, compress, compressor, suffix):
+    """Test that recorded events read back unchanged, minus unencodable ones."""
+    replay = ReplayLogger(
+        log_dir=str(tmp_path),
+        compress=compress,
+        compressor=compressor,
+        buffer_size=4,  # Several writer flushes before stop() drains the rest
+        flush_interval_seconds=60,
+    )
+    await replay.start()
+
+    recorded = []
+    for i in range(10):
+        data = {
+            "i": i,
+            "price": Decimal("50000.12345678") + i,
+            "at": datetime(2024, 1, 1, 0, 0, i),
+            "levels": [[1.5, 2], [3.25, 4]],
+            "meta": {"symbol": "BTCUSDT", "qty": Decimal("0.001")},
+        }
+        await replay.record(EventType.ORDER_SUBMITTED, data)
+        recorded.append(data)
+        data["i"] = -1  # Mutating after record() must not reach the log
+        if i == 4:
+            await replay.record(EventType.ERROR, {"error": object()})
+    await replay.stop()
+
+    (log_file,) = tmp_path.iterdir()
+    assert log_file.suffix == suffix
+
+    events = list(ReplayReader(str(tmp_path)).read_session(replay.session_id))
+    assert [e.event_type for e in events] == (
+        ["system_start"] + ["order_submitted"] * 10 + ["system_stop"]
+    )
+    for i, (event, data) in enumerate(zip(events[1:-1], recorded, strict=True)):
+        assert event.data == {**data, "i": i}
+        assert event.session_id == replay.session_id
+
+    # The dropped event keeps its sequence number; nothing else is renumbered
+    assert [e.sequence_number for e in events] == [1, 2, 3, 4, 5, 6, *range(8, 14)]
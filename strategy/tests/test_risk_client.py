@@ -0,0 +1,68 @@
+"""Tests for the batched risk gateway client."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.broker.risk_client import RiskClient
+
+
+def _http_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://risk")
+
+
+async def test_concurrent_checks_share_one_request():
+    """Test that checks queued together go out as one batch, answered in order."""
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        orders = json.loads(request.content)["orders"]
+        batches.append(orders)
+        return httpx.Response(200, json={"results": [
+            {"error": "rejected"} if o["symbol"] == "BAD" else {"approved": True, "symbol": o["symbol"]}
+            for o in orders
+        ]})
+
+    async with _http_client(handler) as http:
+        client = RiskClient(http)
+        client.start()
+
+        results = await asyncio.gather(
+            client.check_order("BTCUSDT", "buy", 1.0),
+            client.check_order("BAD", "sell", 2.0),
+            client.check_order("ETHUSDT", "sell", 3.0),
+            return_exceptions=True,
+        )
+        await client.close()
+
+    assert [len(b) for b in batches] == [3]
+    assert results[0] == {"approved": True, "symbol": "BTCUSDT"}
+    assert isinstance(results[1], ValueError)
+    assert results[2] == {"approved": True, "symbol": "ETHUSDT"}
+
+
+async def test_close_fails_in_flight_checks():
+    """Test that closing mid-request fails the waiting checks instead of hanging."""
+    entered = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        entered.set()
+        await asyncio.Event().wait()  # Never answers
+        raise AssertionError("unreachable")
+
+    async with _http_client(handler) as http:
+        client = RiskClient(http)
+        client.start()
+
+        pending = asyncio.create_task(client.check_order("BTCUSDT", "buy", 1.0))
+        await asyncio.wait_for(entered.wait(), timeout=1)
+        await client.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            await asyncio.wait_for(pending, timeout=1)
+
+        # Checks after close fail immediately rather than queueing forever
+        with pytest.raises(RuntimeError, match="closed"):
+            await asyncio.wait_for(client.check_order("BTCUSDT", "buy", 1.0), timeout=1)
@@ -0,0 +1,112 @@
+"""Tests for checkpoint saving, loading and pruning."""
+
+import asyncio
+import threading
+import time
+from decimal import Decimal
+
+import orjson
+
+from src.state_manager import StateManager, SystemCheckpoint, _encode_checkpoint
+
+
+def _state_with_position() -> SystemCheckpoint:
+    state = SystemCheckpoint(balance=Decimal("9876.54321"), total_trades=3)
+    state.positions["BTCUSDT"] = {
+        "symbol": "BTCUSDT",
+        "quantity": Decimal("0.1"),
+        "entry_price": Decimal("50025"),
+        "unrealized_pnl": Decimal("0"),
+        "realized_pnl": Decimal("-1.5"),
+    }
+    state.imbalance_streaks = {"BTCUSDT": 2}
+    return state
+
+
+async def test_save_and_load_round_trip(tmp_path):
+    """Test that a saved checkpoint loads back equal, in a fresh manager too."""
+    manager = StateManager(str(tmp_path))
+    manager.current_state = _state_with_position()
+    await manager.save_checkpoint()
+
+    (path,) = tmp_path.iterdir()
+    assert path.name.endswith(".json.zst")
+    assert manager.load_latest_checkpoint() == manager.current_state
+    assert StateManager(str(tmp_path)).load_latest_checkpoint() == manager.current_state
+
+
+def test_loads_legacy_json_checkpoint(tmp_path):
+    """Test that uncompressed checkpoints from before zstd still load."""
+    state = _state_with_position()
+    state.checkpoint_id = "ckpt_1"
+    (tmp_path / "ckpt_1.json").write_bytes(_encode_checkpoint(state))
+
+    assert StateManager(str(tmp_path)).load_latest_checkpoint() == state
+
+
+async def test_skip_unchanged(tmp_path):
+    """Test that an unchanged state is not written again, a changed one is."""
+    manager = StateManager(str(tmp_path))
+    await manager.save_checkpoint()
+    first_id = manager.current_state.checkpoint_id
+
+    await asyncio.sleep(0.002)  # Checkpoint ids have millisecond resolution
+    await manager.save_checkpoint(skip_unchanged=True)
+    assert manager.current_state.checkpoint_id == first_id
+    assert len(list(tmp_path.iterdir())) == 1
+
+    manager.current_state.total_trades += 1
+    await manager.save_checkpoint(skip_unchanged=True)
+    assert manager.current_state.checkpoint_id != first_id
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+async def test_prunes_to_max_checkpoints(tmp_path):
+    """Test that only the newest max_checkpoints files are kept, legacy ones included."""
+    (tmp_path / "ckpt_1.json").write_bytes(orjson.dumps({"total_trades": 0}))
+    manager = StateManager(str(tmp_path), max_checkpoints=3)
+
+    for trades in range(1, 6):
+        manager.current_state.total_trades = trades
+        await manager.save_checkpoint()
+        await asyncio.sleep(0.002)
+
+    files = sorted(tmp_path.iterdir())
+    assert files == sorted(manager._checkpoints)
+    assert len(files) == 3
+    assert manager.load_latest_checkpoint().total_trades == 5
+
+
+async def test_cancelled_save_is_tracked(tmp_path, monkeypatch):
+    """Test that a save cancelled mid-write still tracks and prunes its file."""
+    manager = StateManager(str(tmp_path), max_checkpoints=1)
+    await manager.save_checkpoint()
+    first = manager._checkpoints[-1]
+    time.sleep(0.002)
+
+    entered = threading.Event()
+    release = threading.Event()
+    write = manager._write_checkpoint
+
+    def slow_write(filepath, data):
+        entered.set()
+        release.wait(timeout=5)
+        write(filepath, data)
+
+    monkeypatch.setattr(manager, "_write_checkpoint", slow_write)
+    manager.current_state.total_trades = 7
+    save = asyncio.create_task(manager.save_checkpoint())
+    await asyncio.to_thread(entered.wait, 5)
+
+    save.cancel()
+    release.set()
+    try:
+        await save
+    except asyncio.CancelledError:
+        pass
+    assert save.cancelled()
+
+    (path,) = tmp_path.iterdir()
+    assert list(manager._checkpoints) == [path]
+    assert path != first
+    assert manager.load_latest_checkpoint().total_trades == 7
@@ -1,16 +1,23 @@
 """Tests for the imbalance strategy."""
 
+import random
 from decimal import Decimal
 
 import pytest
 
-from src.features.microstructure import FeatureSnapshot, MicrostructureFeatures
+from src.features.microstructure import FeatureBatch, FeatureSnapshot, MicrostructureFeatures
 from src.signals.imbalance_strategy import ImbalanceStrategy, StrategyConfig
 
+# Shared inputs; Decimal is immutable, so tests can reuse them
+MID_PRICE = Decimal("50000")
+SPREAD_BPS = Decimal("5")
+WIDE_SPREAD_BPS = Decimal("15")
+BALANCE = Decimal("10000")
+FEATURE_IMBALANCE = Decimal("0.1")
+DEPTH = Decimal("10")
 
-@pytest.fixture
-def strategy():
-    """Create a strategy instance for testing."""
+
+def _make_strategy() -> ImbalanceStrategy:
     config = StrategyConfig(
         imbalance_threshold=0.3,
         min_confidence=0.3,  # Lower threshold for testing (confidence ~0.34 at streak=2)
@@ -24,6 +31,12 @@ def strategy():
     return strategy
 
 
+@pytest.fixture
+def strategy():
+    """Create a strategy instance for testing."""
+    return _make_strategy()
+
+
 @pytest.fixture
 def features_calc():
     """Create a features calculator for testing."""
@@ -31,34 +44,26 @@ def features_calc():
     return MicrostructureFeatures(window_size=50, volatility_window=20, momentum_window=10)
 
 
-def test_no_signal_below_threshold(strategy):
-    """Test that no signal is generated when imbalance is below threshold."""
-    features = FeatureSnapshot(
-        timestamp=1000,
-        symbol="BTCUSDT",
-        mid_price=Decimal("50000"),
-        spread_bps=Decimal("5"),
-        imbalance=0.1,  # Below 0.3 threshold
-        weighted_imbalance=0.1,
-    )
-
-    signal = strategy.evaluate(features, Decimal("10000"))
-    assert signal is None
-
-
-def test_no_signal_without_persistence(strategy):
-    """Test that no signal is generated without persistence."""
+@pytest.mark.parametrize(
+    "imbalance,spread_bps",
+    [
+        pytest.param(0.1, SPREAD_BPS, id="below_threshold"),  # Below 0.3 threshold
+        pytest.param(0.5, SPREAD_BPS, id="without_persistence"),  # First tick, need 2 for persistence
+        pytest.param(0.6, WIDE_SPREAD_BPS, id="wide_spread"),  # Above 10 bps limit
+    ],
+)
+def test_no_signal_on_single_tick(strategy, imbalance, spread_bps):
+    """Test that a single tick is rejected by the threshold, persistence and spread filters."""
     features = FeatureSnapshot(
         timestamp=1000,
         symbol="BTCUSDT",
-        mid_price=Decimal("50000"),
-        spread_bps=Decimal("5"),
-        imbalance=0.5,  # Above threshold
-        weighted_imbalance=0.5,
+        mid_price=MID_PRICE,
+        spread_bps=spread_bps,
+        imbalance=imbalance,
+        weighted_imbalance=imbalance,
     )
 
-    # First tick - no signal (need 2 for persistence)
-    signal = strategy.evaluate(features, Decimal("10000"))
+    signal = strategy.evaluate(features, BALANCE)
     assert signal is None
 
 
@@ -67,19 +72,19 @@ def test_signal_with_persistence(strategy):
     features = FeatureSnapshot(
         timestamp=1000,
         symbol="BTCUSDT",
-        mid_price=Decimal("50000"),
-        spread_bps=Decimal("5"),
+        mid_price=MID_PRICE,
+        spread_bps=SPREAD_BPS,
         imbalance=0.5,
         weighted_imbalance=0.5,
         momentum=0.001,  # Positive momentum
     )
 
     # First tick
-    strategy.evaluate(features, Decimal("10000"))
+    strategy.evaluate(features, BALANCE)
 
     # Second tick (should meet persistence requirement)
     features.timestamp = 1001
-    signal = strategy.evaluate(features, Decimal("10000"))
+    signal = strategy.evaluate(features, BALANCE)
 
     # Should generate signal now
     assert signal is not None
@@ -90,16 +95,17 @@ def test_signal_with_persistence(strategy):
 def test_buy_signal_on_positive_imbalance(strategy):
     """Test that positive imbalance generates buy signal."""
     # Warm up persistence
+    features = FeatureSnapshot(
+        timestamp=1000,
+        symbol="BTCUSDT",
+        mid_price=MID_PRICE,
+        spread_bps=SPREAD_BPS,
+        imbalance=0.6,  # Strong positive imbalance
+        weighted_imbalance=0.6,
+    )
     for i in range(3):
-        features = FeatureSnapshot(
-            timestamp=1000 + i,
-            symbol="BTCUSDT",
-            mid_price=Decimal("50000"),
-            spread_bps=Decimal("5"),
-            imbalance=0.6,  # Strong positive imbalance
-            weighted_imbalance=0.6,
-        )
-        signal = strategy.evaluate(features, Decimal("10000"))
+        features.timestamp = 1000 + i
+        signal = strategy.evaluate(features, BALANCE)
 
     assert signal is not None
     assert signal.side.value == "buy"
@@ -108,34 +114,69 @@ def test_buy_signal_on_positive_imbalance(strategy):
 def test_sell_signal_on_negative_imbalance(strategy):
     """Test that negative imbalance generates sell signal."""
     # Warm up persistence
+    features = FeatureSnapshot(
+        timestamp=1000,
+        symbol="BTCUSDT",
+        mid_price=MID_PRICE,
+        spread_bps=SPREAD_BPS,
+        imbalance=-0.6,  # Strong negative imbalance
+        weighted_imbalance=-0.6,
+    )
     for i in range(3):
-        features = FeatureSnapshot(
-            timestamp=1000 + i,
-            symbol="BTCUSDT",
-            mid_price=Decimal("50000"),
-            spread_bps=Decimal("5"),
-            imbalance=-0.6,  # Strong negative imbalance
-            weighted_imbalance=-0.6,
-        )
-        signal = strategy.evaluate(features, Decimal("10000"))
+        features.timestamp = 1000 + i
+        signal = strategy.evaluate(features, BALANCE)
 
     assert signal is not None
     assert signal.side.value == "sell"
 
 
-def test_spread_filter(strategy):
-    """Test that wide spreads prevent signals."""
-    features = FeatureSnapshot(
-        timestamp=1000,
-        symbol="BTCUSDT",
-        mid_price=Decimal("50000"),
-        spread_bps=Decimal("15"),  # Above 10 bps limit
-        imbalance=0.6,
-        weighted_imbalance=0.6,
-    )
+def test_evaluate_batch_matches_sequential_evaluate():
+    """Test that evaluate_batch agrees with evaluate() called row by row."""
+    rng = random.Random(7)
+    sequential = _make_strategy()
+    batched = _make_strategy()
+    for s in (sequential, batched):
+        s.config.require_momentum_confirm = True
+
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    n_signals = 0
+    for tick in range(50):
+        # Few symbols per many rows, so symbols repeat within a batch
+        snapshots = [
+            FeatureSnapshot(
+                timestamp=tick,
+                symbol=rng.choice(["BTCUSDT", "ETHUSDT", "SOLUSDT"]),
+                mid_price=maybe(Decimal(str(rng.uniform(100, 50000)))),
+                spread_bps=maybe(rng.choice([SPREAD_BPS, WIDE_SPREAD_BPS])),
+                imbalance=maybe(rng.uniform(-0.9, 0.9)),
+                weighted_imbalance=maybe(rng.uniform(-1, 1)),
+                momentum=maybe(rng.uniform(-0.002, 0.002)),
+                imbalance_momentum=maybe(rng.uniform(-0.05, 0.05)),
+                volatility_z=maybe(rng.uniform(-3, 3)),
+            )
+            for _ in range(6)
+        ]
+        positions = [rng.choice([None, Decimal("0.5"), Decimal("-0.5")]) for _ in snapshots]
+
+        expected = [
+            sequential.evaluate(s, BALANCE, p) for s, p in zip(snapshots, positions, strict=True)
+        ]
+        mask, signals = batched.evaluate_batch(
+            FeatureBatch.from_snapshots(snapshots), BALANCE, positions
+        )
 
-    signal = strategy.evaluate(features, Decimal("10000"))
-    assert signal is None
+        assert list(mask) == [e is not None for e in expected]
+        for want, got in zip(expected, signals, strict=True):
+            if want is None:
+                assert got is None
+                continue
+            n_signals += 1
+            assert got is not None
+            assert want.model_dump(exclude={"timestamp"}) == got.model_dump(exclude={"timestamp"})
+
+    assert n_signals > 0
 
 
 def test_features_volatility_calculation(features_calc):
@@ -147,11 +188,11 @@ def test_features_volatility_calculation(features_calc):
             symbol="BTCUSDT",
             timestamp=1000 + i * 1000,
             mid_price=price,
-            imbalance=Decimal("0.1"),
-            weighted_imbalance=Decimal("0.1"),
-            spread_bps=Decimal("5"),
-            bid_depth=Decimal("10"),
-            ask_depth=Decimal("10"),
+            imbalance=FEATURE_IMBALANCE,
+            weighted_imbalance=FEATURE_IMBALANCE,
+            spread_bps=SPREAD_BPS,
+            bid_depth=DEPTH,
+            ask_depth=DEPTH,
         )
 
     # Get latest features
@@ -159,11 +200,11 @@ def test_features_volatility_calculation(features_calc):
         symbol="BTCUSDT",
         timestamp=31000,
         mid_price=Decimal("50300"),
-        imbalance=Decimal("0.1"),
-        weighted_imbalance=Decimal("0.1"),
-        spread_bps=Decimal("5"),
-        bid_depth=Decimal("10"),
-        ask_depth=Decimal("10"),
+        imbalance=FEATURE_IMBALANCE,
+        weighted_imbalance=FEATURE_IMBALANCE,
+        spread_bps=SPREAD_BPS,
+        bid_depth=DEPTH,
+        ask_depth=DEPTH,
     )
 
     assert snapshot.volatility is not None
@@ -179,22 +220,22 @@ def test_features_momentum_calculation(features_calc):
             symbol="BTCUSDT",
             timestamp=1000 + i * 1000,
             mid_price=price,
-            imbalance=Decimal("0.1"),
-            weighted_imbalance=Decimal("0.1"),
-            spread_bps=Decimal("5"),
-            bid_depth=Decimal("10"),
-            ask_depth=Decimal("10"),
+            imbalance=FEATURE_IMBALANCE,
+            weighted_imbalance=FEATURE_IMBALANCE,
+            spread_bps=SPREAD_BPS,
+            bid_depth=DEPTH,
+            ask_depth=DEPTH,
         )
 
     snapshot = features_calc.update(
         symbol="BTCUSDT",
         timestamp=16000,
         mid_price=Decimal("51500"),
-        imbalance=Decimal("0.1"),
-        weighted_imbalance=Decimal("0.1"),
-        spread_bps=Decimal("5"),
-        bid_depth=Decimal("10"),
-        ask_depth=Decimal("10"),
+        imbalance=FEATURE_IMBALANCE,
+        weighted_imbalance=FEATURE_IMBALANCE,
+        spread_bps=SPREAD_BPS,
+        bid_depth=DEPTH,
+        ask_depth=DEPTH,
     )
 
     assert snapshot.momentum is not None
@@ -206,18 +247,18 @@ def test_strategy_reset(strategy):
     features = FeatureSnapshot(
         timestamp=1000,
         symbol="BTCUSDT",
-        mid_price=Decimal("50000"),
-        spread_bps=Decimal("5"),
+        mid_price=MID_PRICE,
+        spread_bps=SPREAD_BPS,
         imbalance=0.5,
         weighted_imbalance=0.5,
     )
 
     # Build up persistence
-    strategy.evaluate(features, Decimal("10000"))
+    strategy.evaluate(features, BALANCE)
 
     # Reset
     strategy.reset()
 
     # Should require persistence again
-    signal = strategy.evaluate(features, Decimal("10000"))
+    signal = strategy.evaluate(features, BALANCE)
     assert signal is None  # No signal on first tick after reset
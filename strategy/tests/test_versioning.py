@@ -0,0 +1,72 @@
+"""Tests for strategy versioning and per-version performance tracking."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import orjson
+import pytest
+
+from src.versioning import FeatureFlag, StrategyVersion, VersionManager
+
+START = datetime(2024, 1, 1)
+
+
+def _record_each(manager: VersionManager, version_id: str, pnls, fees, timestamps) -> None:
+    for pnl, fee, timestamp in zip(pnls, fees, timestamps, strict=True):
+        manager.record_trade(version_id, Decimal(str(pnl)), Decimal(str(fee)), timestamp)
+
+
+def test_batch_recording_matches_per_trade():
+    """Test that record_trades_batch accumulates exactly like record_trade."""
+    batches = [
+        ([0.1, 0.1, 0.1, -0.25], [0.01, 0.02, 0.03, 0.04]),
+        ([], []),
+        ([12.5, -3.75, 0.0], [0.5, 0.25, 0.125]),
+    ]
+
+    per_trade = VersionManager()
+    batched = VersionManager()
+    offset = 0
+    for pnls, fees in batches:
+        timestamps = [START + timedelta(minutes=offset + i) for i in range(len(pnls))]
+        offset += len(pnls)
+
+        _record_each(per_trade, "v1", pnls, fees, timestamps)
+        batched.record_trades_batch("v1", np.array(pnls), np.array(fees), timestamps)
+        assert batched.get_performance("v1") == per_trade.get_performance("v1")
+
+    perf = batched.get_performance("v1")
+    assert perf.total_trades == 7
+    assert perf.winning_trades == 4
+    assert perf.total_pnl == Decimal("8.8")
+    assert perf.total_fees == Decimal("0.975")
+    # The first batch sets first_trade; later batches only move last_trade
+    assert perf.first_trade == START
+    assert perf.last_trade == START + timedelta(minutes=6)
+
+
+def test_empty_batch_creates_no_performance():
+    """Test that an empty batch leaves an unseen version untracked."""
+    manager = VersionManager()
+    manager.record_trades_batch("v1", np.array([]), np.array([]), [])
+    assert manager.get_performance("v1") is None
+
+
+def test_feature_flags_are_read_only():
+    """Test that flags cannot change behind the cached flag mask."""
+    flags = {FeatureFlag.TRAILING_STOPS.value: True}
+    version = StrategyVersion(version_id="v1", name="test", feature_flags=flags)
+
+    # The caller's dict is copied, and the version's own view rejects writes
+    flags[FeatureFlag.AGGRESSIVE_STOPS.value] = True
+    with pytest.raises(TypeError):
+        version.feature_flags[FeatureFlag.AGGRESSIVE_STOPS.value] = True
+    assert not version.is_flag_enabled(FeatureFlag.AGGRESSIVE_STOPS)
+    assert version.is_flag_enabled(FeatureFlag.TRAILING_STOPS)
+
+    # Serialization still sees a plain dict
+    data = orjson.loads(orjson.dumps(version.to_dict()))
+    restored = StrategyVersion.from_dict(data)
+    assert restored == version
+    assert restored.is_flag_enabled(FeatureFlag.TRAILING_STOPS)